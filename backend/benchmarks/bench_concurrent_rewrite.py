@@ -0,0 +1,113 @@
+"""
+Resume Reactor - Concurrent Rewrite Benchmark
+Fires N concurrent /api/rewrite requests against a fake NIM upstream with a
+fixed latency. With a non-blocking client the batch should finish in roughly
+one upstream latency; a blocking client takes about N of them.
+
+Usage (from backend/):
+    python -m benchmarks.bench_concurrent_rewrite --requests 20 --latency 0.5
+"""
+import argparse
+import asyncio
+import os
+import socket
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_fake_nim(port: int, latency: float):
+    """Serve an OpenAI-compatible /v1/chat/completions that sleeps `latency` seconds"""
+    import uvicorn
+    from fastapi import FastAPI
+
+    fake = FastAPI()
+
+    @fake.post("/v1/chat/completions")
+    async def completions():
+        await asyncio.sleep(latency)
+        return {
+            "id": "bench",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": "bench",
+            "choices": [{
+                "index": 0,
+                "finish_reason": "stop",
+                "message": {
+                    "role": "assistant",
+                    "content": "REWRITTEN:\nLed a team of 5 engineers\n\nIMPROVEMENTS:\n- Action verb\n\nKEYWORDS_ADDED:\nleadership"
+                }
+            }],
+            "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2}
+        }
+
+    server = uvicorn.Server(uvicorn.Config(fake, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+    return server
+
+
+async def run(n_requests: int, latency: float):
+    import httpx
+    from main import app
+    from services.nvidia_client import init_nvidia_client, close_nvidia_client
+
+    init_nvidia_client()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def one(i: int):
+            response = await client.post("/api/rewrite", json={
+                "resume_id": "bench",
+                "section": "experience",
+                "original_text": f"Worked with a team on project {i}"
+            })
+            response.raise_for_status()
+
+        # Warm the connection pool so the measurement excludes connect time
+        await one(-1)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(n_requests)))
+        elapsed = time.perf_counter() - start
+    await close_nvidia_client()
+
+    print(f"requests:          {n_requests}")
+    print(f"upstream latency:  {latency:.3f}s")
+    print(f"wall time:         {elapsed:.3f}s")
+    print(f"serial estimate:   {n_requests * latency:.3f}s")
+    print(f"latencies elapsed: {elapsed / latency:.2f}x upstream latency")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.5)
+    args = parser.parse_args()
+
+    port = _free_port()
+    # Must be set before config is imported
+    os.environ["NVIDIA_BASE_URL"] = f"http://127.0.0.1:{port}/v1"
+    os.environ.setdefault("NVIDIA_API_KEY", "bench")
+    # Every run must reach the fake upstream, not last run's cached completions
+    os.environ["LLM_CACHE_ENABLED"] = "false"
+
+    server = start_fake_nim(port, args.latency)
+    try:
+        asyncio.run(run(args.requests, args.latency))
+    finally:
+        server.should_exit = True
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Resume Reactor - Keyword Extraction Benchmark
+Times the offline spaCy extractor per job description, one at a time and
+batched through nlp.pipe. The target is well under 50 ms per posting.
+
+Usage (from backend/):
+    python -m benchmarks.bench_keyword_extraction --postings 200
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.spacy_keywords import get_spacy_extractor  # noqa: E402
+
+TEMPLATE = """{title}
+
+We are looking for a {title} to join our platform team. You will design and
+build services in {lang} and {lang2}, deploy them on {cloud} with {ops}, and
+work closely with product managers and data scientists.
+
+Requirements:
+- {years}+ years of experience with {lang} and {db}
+- Experience with {ops}, CI/CD pipelines and infrastructure as code
+- Familiarity with {extra} is a plus
+- Strong communication skills and a track record of mentoring engineers
+"""
+
+CHOICES = {
+    "title": ["Senior Backend Engineer", "Data Engineer", "ML Engineer", "Platform Engineer"],
+    "lang": ["Python", "Go", "Java", "TypeScript", "Rust"],
+    "lang2": ["SQL", "Scala", "Kotlin", "Bash"],
+    "cloud": ["AWS", "GCP", "Azure"],
+    "ops": ["Docker and Kubernetes", "Terraform", "Ansible"],
+    "db": ["PostgreSQL", "MongoDB", "Redis", "Snowflake"],
+    "extra": ["Kafka", "Spark", "Airflow", "GraphQL", "machine learning"],
+    "years": ["3", "5", "7"],
+}
+
+
+def make_posting(rng: random.Random) -> str:
+    return TEMPLATE.format(**{key: rng.choice(values) for key, values in CHOICES.items()})
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--postings", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    postings = [make_posting(rng) for _ in range(args.postings)]
+
+    start = time.perf_counter()
+    extractor = get_spacy_extractor()
+    print(f"model load: {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    timings = []
+    for posting in postings:
+        start = time.perf_counter()
+        extractor.extract(posting)
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    print(f"single: p50 {timings[len(timings) // 2]:.2f} ms, p95 {timings[int(len(timings) * 0.95)]:.2f} ms")
+
+    start = time.perf_counter()
+    extractor.extract_batch(postings)
+    batch_ms = (time.perf_counter() - start) * 1000
+    print(f"batched: {batch_ms / len(postings):.2f} ms per posting")
+    print(f"sample: {extractor.extract(postings[0])}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Resume Reactor - Keyword Matcher Benchmark
+Compares the Aho-Corasick KeywordMatcher with the previous substring loop
+and with a per-keyword word-boundary regex loop (the loop that gives the
+same answers as the matcher) at 30, 300 and 3000 keywords.
+
+Usage (from backend/):
+    python -m benchmarks.bench_keyword_matcher --resumes 200
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.keyword_matcher import KeywordMatcher  # noqa: E402
+
+SYLLABLES = ["da", "ta", "ko", "re", "mi", "lo", "net", "py", "sql", "ops", "ter", "ix", "go", "an", "ly", "sis"]
+
+
+def make_keywords(rng: random.Random, count: int):
+    keywords = set()
+    while len(keywords) < count:
+        words = ["".join(rng.choice(SYLLABLES) for _ in range(rng.randint(1, 3))) for _ in range(rng.randint(1, 2))]
+        keywords.add(" ".join(words).title())
+    return sorted(keywords)
+
+
+def make_resume(rng: random.Random, vocabulary, words: int) -> str:
+    filler = ["led", "built", "team", "improved", "platform", "using", "and", "with", "for", "the"]
+    tokens = [rng.choice(vocabulary) if rng.random() < 0.15 else rng.choice(filler) for _ in range(words)]
+    return " ".join(tokens)
+
+
+def substring_loop(keywords, resume):
+    resume_lower = resume.lower()
+    return [k for k in keywords if k.lower() in resume_lower]
+
+
+def regex_loop(patterns, resume):
+    return [k for k, pattern in patterns if pattern.search(resume)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--resumes", type=int, default=200)
+    parser.add_argument("--words", type=int, default=700, help="words per resume")
+    parser.add_argument("--seed", type=int, default=11)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    print(f"{'keywords':>8} {'build ms':>9} {'substring ms':>13} {'regex loop ms':>14} {'aho-corasick ms':>16}   (per resume)")
+    for count in (30, 300, 3000):
+        keywords = make_keywords(rng, count)
+        resumes = [make_resume(rng, keywords, args.words) for _ in range(args.resumes)]
+
+        start = time.perf_counter()
+        matcher = KeywordMatcher(keywords, synonym_groups=[])
+        build_ms = (time.perf_counter() - start) * 1000
+
+        patterns = [(k, re.compile(rf"(?<!\w){re.escape(k)}(?!\w)", re.IGNORECASE)) for k in keywords]
+
+        start = time.perf_counter()
+        for resume in resumes:
+            substring_loop(keywords, resume)
+        substring_ms = (time.perf_counter() - start) * 1000 / len(resumes)
+
+        start = time.perf_counter()
+        expected = [regex_loop(patterns, resume) for resume in resumes]
+        regex_ms = (time.perf_counter() - start) * 1000 / len(resumes)
+
+        start = time.perf_counter()
+        actual = [matcher.match(resume)[0] for resume in resumes]
+        automaton_ms = (time.perf_counter() - start) * 1000 / len(resumes)
+
+        assert actual == expected, "matcher disagrees with the word-boundary regex loop"
+        print(f"{count:>8} {build_ms:>9.2f} {substring_ms:>13.3f} {regex_ms:>14.3f} {automaton_ms:>16.3f}")
+
+
+if __name__ == "__main__":
+    main()
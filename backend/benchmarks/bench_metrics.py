@@ -0,0 +1,58 @@
+"""
+Resume Reactor - Metrics Overhead Benchmark
+Per-operation cost of the instrumentation left on in production: counter
+increments, histogram observations, stage timers, and a full /metrics
+render with a realistic number of series.
+
+Usage (from backend/):
+    python -m benchmarks.bench_metrics
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.metrics import (  # noqa: E402
+    CACHE_REQUESTS, STAGE_SECONDS, render_metrics, time_stage
+)
+
+
+def per_op(label: str, func, iterations: int):
+    started = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    elapsed = time.perf_counter() - started
+    print(f"{label:<28} {elapsed / iterations * 1e9:>9.0f} ns/op")
+
+
+def timed_block():
+    with time_stage("bench"):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=200_000)
+    args = parser.parse_args()
+
+    per_op("bare loop", lambda: None, args.iterations)
+    per_op("counter inc (labels)", lambda: CACHE_REQUESTS.labels("bench", "hit").inc(), args.iterations)
+    child = STAGE_SECONDS.labels("bench")
+    per_op("histogram observe (child)", lambda: child.observe(0.042), args.iterations)
+    per_op("stage timer", timed_block, args.iterations)
+
+    # Roughly the series a busy worker exposes: ~20 stages and call types
+    for i in range(20):
+        STAGE_SECONDS.labels(f"stage_{i}").observe(0.1)
+    started = time.perf_counter()
+    renders = 200
+    for _ in range(renders):
+        text = render_metrics()
+    elapsed = time.perf_counter() - started
+    print(f"{'render /metrics':<28} {elapsed / renders * 1e3:>9.3f} ms ({len(text.splitlines())} lines)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+Resume Reactor - PDF Engine Benchmark
+Compares the single-pass PyMuPDF engine with the pdfplumber engine on a
+synthetic corpus of multi-page resumes. Each engine runs in its own
+subprocess so peak RSS is measured in isolation.
+
+Usage (from backend/):
+    python -m benchmarks.bench_pdf_engines --docs 50 --max-pages 4
+"""
+import argparse
+import io
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+ENGINES = ["pymupdf", "pdfplumber"]
+
+HEADINGS = ["Professional Summary", "Experience", "Education", "Skills", "Projects", "Certifications"]
+WORDS = (
+    "led developed implemented designed built delivered improved managed python sql "
+    "docker kubernetes aws react team platform pipeline latency revenue customers "
+    "migration analytics reporting automation testing cloud api services scale"
+).split()
+
+
+def make_resume_pdf(pages: int, seed: int) -> bytes:
+    """Render a plain-text resume of the given page count with reportlab"""
+    from reportlab.lib.pagesizes import letter
+    from reportlab.pdfgen import canvas
+
+    rng = random.Random(seed)
+    buffer = io.BytesIO()
+    pdf = canvas.Canvas(buffer, pagesize=letter)
+    for page in range(pages):
+        y = 740
+        if page == 0:
+            pdf.drawString(72, y, f"Candidate {seed}  |  candidate{seed}@example.com  |  (555) 010-{seed % 10000:04d}")
+            y -= 24
+        for heading in HEADINGS:
+            pdf.drawString(72, y, heading)
+            y -= 18
+            for _ in range(5):
+                line = " ".join(rng.choice(WORDS) for _ in range(12))
+                pdf.drawString(84, y, f"- {line.capitalize()} by {rng.randint(5, 60)}%")
+                y -= 14
+            y -= 8
+            if y < 100:
+                break
+        pdf.showPage()
+    pdf.save()
+    return buffer.getvalue()
+
+
+def build_corpus(directory: str, docs: int, max_pages: int):
+    for i in range(docs):
+        with open(os.path.join(directory, f"resume_{i:04d}.pdf"), "wb") as f:
+            f.write(make_resume_pdf(1 + i % max_pages, i))
+
+
+def run_worker(engine: str, directory: str, repeat: int):
+    """Parse the corpus from bytes with one engine and print JSON results"""
+    # Exclude OCR so only the extraction engines are compared
+    os.environ["OCR_MIN_PAGE_CHARS"] = "0"
+    from parsers.pdf_parser import parse_pdf
+
+    files = sorted(os.listdir(directory))
+    blobs = []
+    for name in files:
+        with open(os.path.join(directory, name), "rb") as f:
+            blobs.append(f.read())
+
+    baseline_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    timings = []
+    for _ in range(repeat):
+        for blob in blobs:
+            start = time.perf_counter()
+            parse_pdf(blob, engine=engine)
+            timings.append(time.perf_counter() - start)
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    timings.sort()
+    print(json.dumps({
+        "engine": engine,
+        "docs": len(blobs) * repeat,
+        "total_s": sum(timings),
+        "mean_ms": 1000 * sum(timings) / len(timings),
+        "p95_ms": 1000 * timings[int(len(timings) * 0.95) - 1],
+        "peak_rss_mb": peak_kb / 1024,
+        "rss_growth_mb": (peak_kb - baseline_kb) / 1024
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, default=50)
+    parser.add_argument("--max-pages", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--worker", choices=ENGINES, help=argparse.SUPPRESS)
+    parser.add_argument("--corpus", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker(args.worker, args.corpus, args.repeat)
+        return
+
+    with tempfile.TemporaryDirectory() as corpus:
+        build_corpus(corpus, args.docs, args.max_pages)
+        print(f"{'engine':<12} {'docs':>5} {'total s':>9} {'mean ms':>9} {'p95 ms':>9} {'peak RSS MB':>12} {'RSS growth MB':>14}")
+        for engine in ENGINES:
+            output = subprocess.run(
+                [sys.executable, "-m", "benchmarks.bench_pdf_engines",
+                 "--worker", engine, "--corpus", corpus, "--repeat", str(args.repeat)],
+                cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                capture_output=True, text=True, check=True
+            ).stdout
+            r = json.loads(output.strip().splitlines()[-1])
+            print(f"{r['engine']:<12} {r['docs']:>5} {r['total_s']:>9.2f} {r['mean_ms']:>9.2f} "
+                  f"{r['p95_ms']:>9.2f} {r['peak_rss_mb']:>12.1f} {r['rss_growth_mb']:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Resume Reactor - Prompt Context Benchmark
+Compares the old fixed character cuts with the section-aware context
+builder on generated resumes of growing length: estimated prompt tokens,
+completion budget, and whether the Experience section reaches the model.
+
+Usage (from backend/):
+    python -m benchmarks.bench_prompt_context
+"""
+import argparse
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from parsers.sections import extract_sections  # noqa: E402
+from services.prompt_context import (  # noqa: E402
+    build_resume_context, build_jd_context, estimate_tokens, max_tokens_for
+)
+
+EXPERIENCE_MARKER = "Shipped"
+
+
+def make_resume(rng: random.Random, jobs: int) -> str:
+    contact = "\n".join([
+        "Jordan Example", "jordan@example.com | (555) 010-2030", "123 Long Street Name, Springfield, ST 00000",
+        "linkedin.com/in/jordan-example | github.com/jordan-example | jordan.example.dev"
+    ])
+    summary = "Summary\n" + " ".join(["Engineer focused on reliable distributed systems and developer tooling."] * 8)
+    padding = "Objective\n" + " ".join(["Seeking a challenging role where I can grow and contribute."] * 14)
+    experience = ["Experience"]
+    for job in range(jobs):
+        experience.append(f"Senior Engineer, Company {job} (20{10 + job}-20{11 + job})")
+        for _ in range(4):
+            experience.append(
+                f"- {EXPERIENCE_MARKER} {rng.choice(['a billing', 'a search', 'an ingestion'])} service in "
+                f"{rng.choice(['Python', 'Go', 'Java'])}, cutting p99 latency by {rng.randint(10, 60)}%"
+            )
+    skills = "Skills\nPython, Go, SQL, Docker, Kubernetes, AWS, Terraform, Kafka"
+    education = "Education\nBS Computer Science, State University"
+    return "\n\n".join([contact, padding, summary, "\n".join(experience), skills, education])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seed", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    job_description = "\n".join(
+        ["About us: we are a fast-growing company with a great culture." * 4,
+         "Requirements:", "- 5+ years of Python or Go", "- Kubernetes and AWS", "- Strong ownership"] * 3
+    )
+    print(f"{'jobs':>4} {'old tokens':>10} {'new tokens':>10} {'old exp':>8} {'new exp':>8} "
+          f"{'old max_tokens':>15} {'new max_tokens':>15}")
+    for jobs in (1, 3, 6, 12):
+        resume = make_resume(rng, jobs)
+        sections = extract_sections(resume)
+
+        old = resume[:2000] + job_description[:1000]
+        new_resume = build_resume_context(sections, resume, task="suggestions")
+        new = new_resume + build_jd_context(job_description)
+
+        print(f"{jobs:>4} {estimate_tokens(old):>10} {estimate_tokens(new):>10} "
+              f"{resume[:2000].count(EXPERIENCE_MARKER):>8} {new_resume.count(EXPERIENCE_MARKER):>8} "
+              f"{1500:>15} {max_tokens_for('suggestions'):>15}")
+
+
+if __name__ == "__main__":
+    main()
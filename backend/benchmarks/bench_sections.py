@@ -0,0 +1,111 @@
+"""
+Resume Reactor - Section Segmentation Benchmark
+Compares the shared precompiled segmenter with the previous per-line,
+per-pattern implementation on a synthetic resume corpus, and checks that
+both produce identical sections.
+
+Usage (from backend/):
+    python -m benchmarks.bench_sections --docs 2000
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from parsers.sections import extract_sections, extract_section_spans  # noqa: E402
+
+HEADERS = [
+    "PROFESSIONAL SUMMARY", "Objective", "Work Experience", "Employment History",
+    "Education", "Academic Background", "Technical Skills", "Core Competencies",
+    "Projects", "Portfolio", "Certifications", "Licenses"
+]
+WORDS = (
+    "led developed implemented designed built delivered improved managed python sql "
+    "docker kubernetes aws react team platform pipeline latency revenue customers "
+    "migration analytics reporting automation testing cloud api services scale"
+).split()
+
+
+def legacy_extract_sections(text: str):
+    """The implementation previously duplicated in pdf_parser and docx_parser"""
+    sections = {
+        "contact": "", "summary": "", "experience": "", "education": "",
+        "skills": "", "projects": "", "certifications": "", "other": ""
+    }
+    section_patterns = {
+        "summary": r"(?:professional\s+)?summary|objective|profile|about\s*me",
+        "experience": r"(?:work\s+)?experience|employment|work\s*history|professional\s*experience",
+        "education": r"education|academic|qualifications|degrees?",
+        "skills": r"skills?|technical\s*skills?|competenc(?:y|ies)|technologies|expertise",
+        "projects": r"projects?|portfolio|work\s*samples?",
+        "certifications": r"certifications?|certificates?|licenses?|credentials?"
+    }
+    current_section = "contact"
+    section_content = []
+    for line in text.split('\n'):
+        line_stripped = line.strip()
+        if not line_stripped:
+            continue
+        matched_section = None
+        for section_name, pattern in section_patterns.items():
+            if re.match(f"^{pattern}.*$", line_stripped, re.IGNORECASE):
+                matched_section = section_name
+                break
+        if matched_section:
+            if section_content:
+                sections[current_section] = '\n'.join(section_content)
+            current_section = matched_section
+            section_content = []
+        else:
+            section_content.append(line_stripped)
+    if section_content:
+        sections[current_section] = '\n'.join(section_content)
+    return sections
+
+
+def make_resume(rng: random.Random, lines_per_section: int) -> str:
+    lines = ["Jane Candidate", "jane@example.com | (555) 010-2030", ""]
+    for header in rng.sample(HEADERS, 8):
+        lines.append(header)
+        for _ in range(lines_per_section):
+            indent = "  " if rng.random() < 0.3 else ""
+            lines.append(indent + "- " + " ".join(rng.choice(WORDS) for _ in range(10)))
+        lines.append("")
+    return "\n".join(lines)
+
+
+def timed(fn, corpus):
+    start = time.perf_counter()
+    results = [fn(text) for text in corpus]
+    return time.perf_counter() - start, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, default=2000)
+    parser.add_argument("--lines", type=int, default=12, help="content lines per section")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    corpus = [make_resume(rng, args.lines) for _ in range(args.docs)]
+    total_lines = sum(text.count("\n") + 1 for text in corpus)
+
+    legacy_s, legacy = timed(legacy_extract_sections, corpus)
+    shared_s, shared = timed(extract_sections, corpus)
+    spans_s, _ = timed(extract_section_spans, corpus)
+
+    mismatches = sum(1 for a, b in zip(legacy, shared) if a != b)
+    print(f"docs: {args.docs}  lines: {total_lines}  mismatches: {mismatches}")
+    print(f"legacy per-pattern match: {legacy_s * 1000:9.1f} ms  ({legacy_s / total_lines * 1e6:.2f} us/line)")
+    print(f"shared segmenter:         {shared_s * 1000:9.1f} ms  ({shared_s / total_lines * 1e6:.2f} us/line)")
+    print(f"spans only:               {spans_s * 1000:9.1f} ms  ({spans_s / total_lines * 1e6:.2f} us/line)")
+    print(f"speedup: {legacy_s / shared_s:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -15,11 +15,128 @@ NVIDIA_BASE_URL = os.getenv("NVIDIA_BASE_URL", "https://integrate.api.nvidia.com
 TEXT_MODEL = "meta/llama-3.1-70b-instruct"
 VISION_MODEL = "microsoft/phi-3.5-vision-instruct"
 
+# NVIDIA NIM HTTP Connection Pool
+NIM_HTTP2 = os.getenv("NIM_HTTP2", "true").lower() == "true"
+NIM_MAX_CONNECTIONS = int(os.getenv("NIM_MAX_CONNECTIONS", "100"))
+NIM_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("NIM_MAX_KEEPALIVE_CONNECTIONS", "20"))
+NIM_KEEPALIVE_EXPIRY = float(os.getenv("NIM_KEEPALIVE_EXPIRY", "30"))
+NIM_CONNECT_TIMEOUT = float(os.getenv("NIM_CONNECT_TIMEOUT", "5"))
+NIM_READ_TIMEOUT = float(os.getenv("NIM_READ_TIMEOUT", "120"))
+NIM_POOL_TIMEOUT = float(os.getenv("NIM_POOL_TIMEOUT", "10"))
+
+# NIM Scheduler (per worker process; 0 disables a rate limit)
+NIM_RPM_LIMIT = int(os.getenv("NIM_RPM_LIMIT", "40"))
+NIM_TPM_LIMIT = int(os.getenv("NIM_TPM_LIMIT", "0"))
+NIM_MAX_CONCURRENCY = int(os.getenv("NIM_MAX_CONCURRENCY", "16"))
+NIM_QUEUE_SIZE = int(os.getenv("NIM_QUEUE_SIZE", "64"))
+NIM_QUEUE_TIMEOUT_SECONDS = float(os.getenv("NIM_QUEUE_TIMEOUT_SECONDS", "30"))
+
+# NIM Resilience (per-attempt timeout, overall deadline including retries,
+# hedged second requests and a circuit breaker; 0 failures disables the breaker)
+NIM_CALL_TIMEOUT_SECONDS = float(os.getenv("NIM_CALL_TIMEOUT_SECONDS", "30"))
+NIM_DEADLINE_SECONDS = float(os.getenv("NIM_DEADLINE_SECONDS", "60"))
+NIM_MAX_RETRIES = int(os.getenv("NIM_MAX_RETRIES", "2"))
+NIM_RETRY_BASE_DELAY = float(os.getenv("NIM_RETRY_BASE_DELAY", "0.5"))
+NIM_RETRY_MAX_DELAY = float(os.getenv("NIM_RETRY_MAX_DELAY", "8"))
+NIM_HEDGE_ENABLED = os.getenv("NIM_HEDGE_ENABLED", "false").lower() == "true"
+NIM_HEDGE_PERCENTILE = float(os.getenv("NIM_HEDGE_PERCENTILE", "0.95"))
+NIM_HEDGE_MIN_DELAY_MS = int(os.getenv("NIM_HEDGE_MIN_DELAY_MS", "500"))
+NIM_BREAKER_FAILURES = int(os.getenv("NIM_BREAKER_FAILURES", "5"))
+NIM_BREAKER_RESET_SECONDS = float(os.getenv("NIM_BREAKER_RESET_SECONDS", "30"))
+
+# LLM Response Cache
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true"
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", "cache/llm_cache.sqlite3")
+LLM_CACHE_TTL_SECONDS = int(os.getenv("LLM_CACHE_TTL_SECONDS", "86400"))
+LLM_CACHE_MEMORY_ENTRIES = int(os.getenv("LLM_CACHE_MEMORY_ENTRIES", "512"))
+LLM_CACHE_DISK_MAX_MB = int(os.getenv("LLM_CACHE_DISK_MAX_MB", "100"))
+
 # Application Settings
 MAX_FILE_SIZE_MB = 10
+UPLOAD_CHUNK_SIZE = int(os.getenv("UPLOAD_CHUNK_SIZE", str(64 * 1024)))
 ALLOWED_EXTENSIONS = [".pdf", ".docx"]
 TEMP_DIR = "temp_uploads"
 
+# Temp File Sweeper (TTL and total-bytes quota for TEMP_DIR)
+TEMP_TTL_SECONDS = float(os.getenv("TEMP_TTL_SECONDS", "86400"))
+TEMP_MAX_MB = int(os.getenv("TEMP_MAX_MB", "1024"))
+TEMP_SWEEP_INTERVAL_SECONDS = float(os.getenv("TEMP_SWEEP_INTERVAL_SECONDS", "300"))
+# A worker never sweeps files it is still parsing, but other workers only
+# go by age: with several workers keep this above the parse timeout
+TEMP_MIN_AGE_SECONDS = float(os.getenv("TEMP_MIN_AGE_SECONDS", "60"))
+
+# Resume Store ("sqlite" is shared by all workers, "memory" is per process)
+RESUME_STORE_BACKEND = os.getenv("RESUME_STORE_BACKEND", "sqlite")
+RESUME_DB_PATH = os.getenv("RESUME_DB_PATH", "data/resume_store.sqlite3")
+RESUME_CACHE_SIZE = int(os.getenv("RESUME_CACHE_SIZE", "256"))
+
+# Registered Job Descriptions (compiled keyword matchers kept per worker)
+JD_MATCHER_CACHE_SIZE = int(os.getenv("JD_MATCHER_CACHE_SIZE", "256"))
+
+# Parse Worker Pool (PARSE_WORKERS=0 parses in a thread instead)
+PARSE_WORKERS = int(os.getenv("PARSE_WORKERS", str(min(4, os.cpu_count() or 1))))
+PARSE_MAX_QUEUE = int(os.getenv("PARSE_MAX_QUEUE", "16"))
+PARSE_TIMEOUT_SECONDS = float(os.getenv("PARSE_TIMEOUT_SECONDS", "60"))
+PARSE_MAX_TASKS_PER_CHILD = int(os.getenv("PARSE_MAX_TASKS_PER_CHILD", "50"))
+
+# PDF Parsing ("pymupdf" single pass, or "pdfplumber" for text extraction)
+PDF_ENGINE = os.getenv("PDF_ENGINE", "pymupdf")
+
+# OCR (pages with less text than OCR_MIN_PAGE_CHARS are OCR'd; each parse
+# worker runs its own OCR threads, so together they default to one per CPU)
+OCR_MIN_PAGE_CHARS = int(os.getenv("OCR_MIN_PAGE_CHARS", "20"))
+OCR_WORKERS = int(os.getenv("OCR_WORKERS", str(max(1, (os.cpu_count() or 1) // max(1, PARSE_WORKERS)))))
+OCR_TARGET_DPI = int(os.getenv("OCR_TARGET_DPI", "200"))
+OCR_MAX_PIXELS = int(os.getenv("OCR_MAX_PIXELS", str(8_000_000)))
+OCR_PAGE_TIMEOUT_SECONDS = float(os.getenv("OCR_PAGE_TIMEOUT_SECONDS", "30"))
+OCR_LANG = os.getenv("OCR_LANG", "eng")
+OCR_CACHE_DIR = os.getenv("OCR_CACHE_DIR", "cache/ocr")
+
+# Batch Analysis
+BATCH_MAX_RESUMES = int(os.getenv("BATCH_MAX_RESUMES", "500"))
+BATCH_ANALYZE_CONCURRENCY = int(os.getenv("BATCH_ANALYZE_CONCURRENCY", "8"))
+BATCH_ANALYZE_MAX_CONCURRENCY = int(os.getenv("BATCH_ANALYZE_MAX_CONCURRENCY", "32"))
+
+# Export Rendering (rendered files are cached in memory by content hash)
+EXPORT_WORKERS = int(os.getenv("EXPORT_WORKERS", "4"))
+EXPORT_CACHE_MAX_MB = int(os.getenv("EXPORT_CACHE_MAX_MB", "64"))
+
+# Bulk Export Jobs (job state lives in the resume store; rendered files wait in
+# BULK_EXPORT_DIR, outside the swept TEMP_DIR, until the job expires)
+BULK_EXPORT_MAX_RESUMES = int(os.getenv("BULK_EXPORT_MAX_RESUMES", "200"))
+BULK_EXPORT_CONCURRENCY = int(os.getenv("BULK_EXPORT_CONCURRENCY", "4"))
+BULK_EXPORT_JOB_TTL_SECONDS = float(os.getenv("BULK_EXPORT_JOB_TTL_SECONDS", "3600"))
+BULK_EXPORT_CHUNK_SIZE = int(os.getenv("BULK_EXPORT_CHUNK_SIZE", str(64 * 1024)))
+BULK_EXPORT_DIR = os.getenv("BULK_EXPORT_DIR", "data/bulk_exports")
+
+# Keyword Extraction ("llm", "spacy" runs offline, "hybrid" is spaCy enriched by the LLM)
+KEYWORD_MODES = ("llm", "spacy", "hybrid")
+KEYWORD_EXTRACTOR = os.getenv("KEYWORD_EXTRACTOR", "llm")
+SPACY_MODEL = os.getenv("SPACY_MODEL", "en_core_web_sm")
+SPACY_BATCH_SIZE = int(os.getenv("SPACY_BATCH_SIZE", "32"))
+SKILLS_GAZETTEER_PATH = os.getenv("SKILLS_GAZETTEER_PATH", "")
+
+# Prompt Context Budgets (estimated tokens of resume/JD text per prompt)
+PROMPT_RESUME_TOKEN_BUDGET = int(os.getenv("PROMPT_RESUME_TOKEN_BUDGET", "450"))
+PROMPT_JD_TOKEN_BUDGET = int(os.getenv("PROMPT_JD_TOKEN_BUDGET", "200"))
+PROMPT_KEYWORDS_JD_TOKEN_BUDGET = int(os.getenv("PROMPT_KEYWORDS_JD_TOKEN_BUDGET", "450"))
+PROMPT_REWRITE_JD_TOKEN_BUDGET = int(os.getenv("PROMPT_REWRITE_JD_TOKEN_BUDGET", "120"))
+
+# Analysis Latency Budget (0 waits for suggestions; otherwise late suggestions
+# are returned as pending and fetched later by analysis ID)
+ANALYZE_LATENCY_BUDGET_MS = int(os.getenv("ANALYZE_LATENCY_BUDGET_MS", "0"))
+PENDING_SUGGESTIONS_TTL_SECONDS = float(os.getenv("PENDING_SUGGESTIONS_TTL_SECONDS", "3600"))
+
+# Prometheus Metrics (shared by all server workers when set; empty it before
+# starting the server. Unset, each server process reports only its own metrics)
+PROMETHEUS_MULTIPROC_DIR = os.getenv("PROMETHEUS_MULTIPROC_DIR", "")
+
+# Request Tracing (admins send X-Trace or ?trace= with X-Admin-Token;
+# an empty ADMIN_TOKEN disables tracing and the admin endpoints)
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "")
+TRACE_DIR = os.getenv("TRACE_DIR", "cache/traces")
+TRACE_MAX_STORED = int(os.getenv("TRACE_MAX_STORED", "200"))
+
 # ATS Scoring Weights
 ATS_WEIGHTS = {
     "keyword_match": 0.35,
@@ -2,13 +2,37 @@
 Resume Reactor - FastAPI Application
 Main entry point for the backend API
 """
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, Response
 from contextlib import asynccontextmanager
+import asyncio
 import os
 
-from config import TEMP_DIR
+from config import TEMP_DIR, MAX_FILE_SIZE_MB, KEYWORD_EXTRACTOR, PROMETHEUS_MULTIPROC_DIR
+
+# Multiprocess metrics are written there as soon as services.metrics is
+# imported; a blank value in .env turns them off
+if PROMETHEUS_MULTIPROC_DIR:
+    os.makedirs(PROMETHEUS_MULTIPROC_DIR, exist_ok=True)
+else:
+    os.environ.pop("PROMETHEUS_MULTIPROC_DIR", None)
+
+from middleware.upload_limit import UploadSizeLimitMiddleware
+from middleware.request_metrics import RequestMetricsMiddleware
+from middleware.request_tracing import RequestTracingMiddleware
 from routes.resume import router as resume_router
+from routes.admin import router as admin_router
+from services.nvidia_client import close_nvidia_client, single_flight_stats
+from services.llm_cache import get_llm_cache
+from services.parse_pool import get_parse_pool
+from services.resume_store import get_resume_store, close_resume_store
+from services.temp_sweeper import get_temp_sweeper
+from services.export_service import get_export_templates, get_export_cache, shutdown_export_workers
+from services.bulk_export import get_bulk_export_manager
+from services.nim_scheduler import SchedulerRejected, get_nim_scheduler
+from services.nim_resilience import NimError, get_circuit_breaker, resilience_stats
+from services.metrics import CONTENT_TYPE, render_metrics, shutdown_metrics
 
 
 @asynccontextmanager
@@ -16,8 +40,31 @@ async def lifespan(app: FastAPI):
     """Application lifecycle manager"""
     # Startup: Create temp directory
     os.makedirs(TEMP_DIR, exist_ok=True)
+    # Startup: Spawn parse workers and open the resume store
+    get_parse_pool().start()
+    get_resume_store()
+    # Startup: Build export styles and the DOCX template once
+    await asyncio.to_thread(get_export_templates)
+    # Startup: Load the spaCy model once per worker when it is the default extractor
+    if KEYWORD_EXTRACTOR != "llm":
+        from services.spacy_keywords import get_spacy_extractor
+        await asyncio.to_thread(get_spacy_extractor)
+    # Startup: Sweep expired uploads in the background
+    get_temp_sweeper().start()
     yield
-    # Shutdown: Cleanup can be done here
+    # Shutdown: Stop the sweeper, bulk export jobs, parse workers and export threads
+    await get_temp_sweeper().stop()
+    await get_bulk_export_manager().close()
+    get_parse_pool().shutdown()
+    shutdown_export_workers()
+    # Shutdown: Close pooled NIM connections, the LLM cache and the resume store
+    await close_nvidia_client()
+    cache = get_llm_cache()
+    if cache is not None:
+        cache.close()
+    close_resume_store()
+    # Shutdown: Stop counting this worker's in-flight gauges
+    shutdown_metrics()
 
 
 app = FastAPI(
@@ -36,8 +83,43 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Refuse oversized uploads while they stream in (allowance for multipart framing)
+app.add_middleware(
+    UploadSizeLimitMiddleware,
+    max_body_bytes=MAX_FILE_SIZE_MB * 1024 * 1024 + 64 * 1024,
+    paths=["/api/upload"]
+)
+
+# Span traces for single requests flagged by an admin (X-Trace + X-Admin-Token)
+app.add_middleware(RequestTracingMiddleware)
+
+# Outermost, so request timings include the other middleware
+app.add_middleware(RequestMetricsMiddleware)
+
 # Register routes
 app.include_router(resume_router, prefix="/api", tags=["Resume"])
+app.include_router(admin_router, prefix="/api/admin", tags=["Admin"], include_in_schema=False)
+
+
+@app.exception_handler(SchedulerRejected)
+async def scheduler_rejected_handler(request: Request, exc: SchedulerRejected):
+    """NIM backpressure: 429 when the queue is full, 503 when the wait timed out"""
+    return JSONResponse(
+        status_code=exc.status_code,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(exc.retry_after)}
+    )
+
+
+@app.exception_handler(NimError)
+async def nim_error_handler(request: Request, exc: NimError):
+    """NIM failures after retries: 502/504 from upstream, 503 while the breaker is open"""
+    headers = {"Retry-After": str(exc.retry_after)} if exc.retry_after else None
+    return JSONResponse(
+        status_code=exc.status_code,
+        content={"detail": str(exc)},
+        headers=headers
+    )
 
 
 @app.get("/")
@@ -46,14 +128,27 @@ async def root():
     return {"status": "healthy", "app": "Resume Reactor API"}
 
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus metrics"""
+    return Response(content=render_metrics(), media_type=CONTENT_TYPE)
+
+
 @app.get("/health")
 async def health_check():
     """Detailed health check"""
+    cache = get_llm_cache()
     return {
         "status": "healthy",
         "version": "1.0.0",
         "services": {
             "api": True,
-            "nvidia_nim": True
-        }
+            "nvidia_nim": get_circuit_breaker().state != "open"
+        },
+        "llm_cache": cache.stats() if cache is not None else None,
+        "llm_requests": single_flight_stats(),
+        "nim_calls": resilience_stats(),
+        "nim_scheduler": get_nim_scheduler().stats(),
+        "temp_storage": get_temp_sweeper().stats(),
+        "export_cache": get_export_cache().stats()
     }
@@ -0,0 +1,60 @@
+"""
+Resume Reactor - Request Metrics Middleware
+Times every HTTP request by route template and counts requests in flight
+"""
+import time
+from typing import Any, Dict
+
+from services.metrics import HTTP_IN_FLIGHT, HTTP_REQUEST_SECONDS
+
+
+class RequestMetricsMiddleware:
+    """
+    Pure ASGI middleware recording request latency by method, route and
+    status. Routes are labelled by their template ("/api/resume/{resume_id}"),
+    never the raw path, so label cardinality stays bounded; paths that match
+    no route are labelled "unmatched". Streaming responses are timed until
+    their last chunk is sent.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self._templates: Dict[Any, str] = {}
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def recording_send(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        HTTP_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, recording_send)
+        finally:
+            HTTP_IN_FLIGHT.dec()
+            HTTP_REQUEST_SECONDS.labels(
+                scope["method"], self._route_template(scope), str(status)
+            ).observe(time.perf_counter() - started)
+
+    def _route_template(self, scope) -> str:
+        # The router stores the matched endpoint in the scope it was handed
+        endpoint = scope.get("endpoint")
+        if endpoint is None:
+            return "unmatched"
+        template = self._templates.get(endpoint)
+        if template is None:
+            template = "unmatched"
+            for route in getattr(scope.get("app"), "routes", []):
+                if getattr(route, "endpoint", None) is endpoint:
+                    template = route.path
+                    break
+            self._templates[endpoint] = template
+        return template
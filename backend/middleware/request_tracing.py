@@ -0,0 +1,74 @@
+"""
+Resume Reactor - Request Tracing Middleware
+Captures a span tree (and optionally a profile) for requests an admin flags
+"""
+import asyncio
+import uuid
+from typing import Optional
+from urllib.parse import parse_qs
+
+from config import ADMIN_TOKEN
+from services.tracing import Trace, get_trace_store, is_admin
+
+
+TRACE_FLAGS = ("1", "true", "profile")
+
+
+def _trace_mode(scope) -> Optional[str]:
+    """'spans' or 'profile' for an admin's flagged request, otherwise None"""
+    flag = token = None
+    for name, value in scope["headers"]:
+        if name == b"x-trace":
+            flag = value.decode("latin-1")
+        elif name == b"x-admin-token":
+            token = value.decode("latin-1")
+    query = scope.get("query_string", b"")
+    if flag is None and b"trace=" in query:
+        flag = parse_qs(query.decode("latin-1")).get("trace", [""])[-1]
+    if flag is None or flag.strip().lower() not in TRACE_FLAGS or not is_admin(token):
+        return None
+    return "profile" if flag.strip().lower() == "profile" else "spans"
+
+
+class RequestTracingMiddleware:
+    """
+    Pure ASGI middleware tracing single requests on demand. An admin sends
+    X-Trace: 1 (or ?trace=1) with X-Admin-Token to record a span tree, or
+    X-Trace: profile to also record a cProfile dump. The response carries
+    X-Trace-ID; the trace is saved once the response completes and served
+    by the admin routes. Unflagged or unauthorized requests pass straight
+    through, and with no ADMIN_TOKEN configured the flag is never read.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        mode = _trace_mode(scope) if ADMIN_TOKEN and scope["type"] == "http" else None
+        if mode is None:
+            await self.app(scope, receive, send)
+            return
+
+        request_id = uuid.uuid4().hex
+        trace = Trace(
+            request_id,
+            f"{scope['method']} {scope['path']}",
+            profile=mode == "profile"
+        )
+
+        async def tagging_send(message):
+            if message["type"] == "http.response.start":
+                trace.root.set(status=message["status"])
+                headers = list(message.get("headers", []))
+                headers.append((b"x-trace-id", request_id.encode("ascii")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            with trace:
+                await self.app(scope, receive, tagging_send)
+        finally:
+            try:
+                await asyncio.to_thread(get_trace_store().save, trace)
+            except Exception as e:
+                print(f"Trace save error: {e}")
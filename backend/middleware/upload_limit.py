@@ -0,0 +1,86 @@
+"""
+Resume Reactor - Upload Size Limit Middleware
+Rejects oversized upload bodies while they are still arriving
+"""
+import json
+from typing import Iterable
+
+
+class UploadSizeLimitMiddleware:
+    """
+    Pure ASGI middleware that caps request bodies on upload paths.
+    A declared Content-Length over the limit is refused before any body is
+    read; otherwise bytes are counted as they are received and the request
+    is answered with 413 as soon as the limit is crossed, before the
+    multipart parser has buffered the rest of the file.
+    """
+
+    def __init__(self, app, max_body_bytes: int, paths: Iterable[str]):
+        self.app = app
+        self.max_body_bytes = max_body_bytes
+        self.paths = set(paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] not in self.paths:
+            await self.app(scope, receive, send)
+            return
+
+        for name, value in scope.get("headers", []):
+            if name == b"content-length":
+                try:
+                    declared = int(value)
+                except ValueError:
+                    break
+                if declared > self.max_body_bytes:
+                    await self._reject(send)
+                    return
+                break
+
+        received = 0
+        exceeded = False
+        rejected = False
+
+        async def limited_receive():
+            nonlocal received, exceeded
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_body_bytes:
+                    exceeded = True
+                    raise UploadTooLarge()
+            return message
+
+        async def guarded_send(message):
+            nonlocal rejected
+            if exceeded:
+                # Replace whatever error the framework produced with a 413
+                if not rejected:
+                    rejected = True
+                    await self._reject(send)
+                return
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, guarded_send)
+        except UploadTooLarge:
+            if not rejected:
+                await self._reject(send)
+
+    async def _reject(self, send):
+        body = json.dumps({
+            "detail": f"File too large. Max size: {self.max_body_bytes // (1024 * 1024)}MB"
+        }).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 413,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"connection", b"close")
+            ]
+        })
+        await send({"type": "http.response.body", "body": body})
+
+
+class UploadTooLarge(Exception):
+    """Raised from receive() once an upload body crosses the limit"""
@@ -4,29 +4,44 @@ Extracts text and images from DOCX resumes
 """
 from docx import Document
 from docx.opc.constants import RELATIONSHIP_TYPE as RT
-import re
-from typing import Dict, Any
+import io
+from typing import Dict, Any, Union
 
+from parsers.sections import extract_sections
+from services.tracing import span
 
-def parse_docx(file_path: str) -> Dict[str, Any]:
+
+def parse_docx(source: Union[str, bytes]) -> Dict[str, Any]:
     """
     Parse a DOCX resume and extract text, sections, and image count.
+    Accepts a file path or the uploaded bytes.
     """
     text_content = ""
     images_count = 0
     
     try:
-        doc = Document(file_path)
+        if isinstance(source, (bytes, bytearray)):
+            source = io.BytesIO(source)
+        with span("docx_open"):
+            doc = Document(source)
         
         # Extract text from paragraphs
-        for para in doc.paragraphs:
-            text_content += para.text + "\n"
+        with span("docx_paragraphs") as paragraphs_span:
+            paragraphs = doc.paragraphs
+            for para in paragraphs:
+                text_content += para.text + "\n"
+            paragraphs_span.set(paragraphs=len(paragraphs))
         
         # Extract text from tables
-        for table in doc.tables:
-            for row in table.rows:
-                for cell in row.cells:
-                    text_content += cell.text + "\n"
+        with span("docx_tables") as tables_span:
+            tables = doc.tables
+            cells = 0
+            for table in tables:
+                for row in table.rows:
+                    for cell in row.cells:
+                        text_content += cell.text + "\n"
+                        cells += 1
+            tables_span.set(tables=len(tables), cells=cells)
         
         # Count images
         for rel in doc.part.rels.values():
@@ -46,61 +61,6 @@ def parse_docx(file_path: str) -> Dict[str, Any]:
     }
 
 
-def extract_sections(text: str) -> Dict[str, str]:
-    """
-    Extract resume sections based on common headings
-    """
-    sections = {
-        "contact": "",
-        "summary": "",
-        "experience": "",
-        "education": "",
-        "skills": "",
-        "projects": "",
-        "certifications": "",
-        "other": ""
-    }
-    
-    # Common section headers (case insensitive)
-    section_patterns = {
-        "summary": r"(?:professional\s+)?summary|objective|profile|about\s*me",
-        "experience": r"(?:work\s+)?experience|employment|work\s*history|professional\s*experience",
-        "education": r"education|academic|qualifications|degrees?",
-        "skills": r"skills?|technical\s*skills?|competenc(?:y|ies)|technologies|expertise",
-        "projects": r"projects?|portfolio|work\s*samples?",
-        "certifications": r"certifications?|certificates?|licenses?|credentials?"
-    }
-    
-    lines = text.split('\n')
-    current_section = "contact"
-    section_content = []
-    
-    for line in lines:
-        line_stripped = line.strip()
-        if not line_stripped:
-            continue
-        
-        # Check if this line is a section header
-        matched_section = None
-        for section_name, pattern in section_patterns.items():
-            if re.match(f"^{pattern}.*$", line_stripped, re.IGNORECASE):
-                matched_section = section_name
-                break
-        
-        if matched_section:
-            if section_content:
-                sections[current_section] = '\n'.join(section_content)
-            current_section = matched_section
-            section_content = []
-        else:
-            section_content.append(line_stripped)
-    
-    if section_content:
-        sections[current_section] = '\n'.join(section_content)
-    
-    return sections
-
-
 def extract_formatting_info(file_path: str) -> Dict[str, Any]:
     """
     Extract formatting information for ATS compatibility analysis
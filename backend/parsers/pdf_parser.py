@@ -2,47 +2,84 @@
 Resume Reactor - PDF Parser
 Extracts text and images from PDF resumes
 """
-import pdfplumber
 import fitz  # PyMuPDF
 import pytesseract
 from PIL import Image
+import hashlib
 import io
-import re
-from typing import Dict, List, Any
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Dict, List, Any, Optional, Union
 
+from parsers.sections import extract_sections
+from services.metrics import observe_stage, record_cache
+from services.tracing import span
+from config import (
+    PDF_ENGINE, OCR_MIN_PAGE_CHARS, OCR_WORKERS, OCR_TARGET_DPI, OCR_MAX_PIXELS,
+    OCR_PAGE_TIMEOUT_SECONDS, OCR_LANG, OCR_CACHE_DIR
+)
 
-def parse_pdf(file_path: str) -> Dict[str, Any]:
+
+def open_pdf(source: Union[str, bytes]) -> "fitz.Document":
+    """Open a PDF from a file path or from in-memory bytes"""
+    if isinstance(source, (bytes, bytearray)):
+        return fitz.open(stream=source, filetype="pdf")
+    return fitz.open(source)
+
+
+def parse_pdf(source: Union[str, bytes], engine: Optional[str] = None) -> Dict[str, Any]:
     """
-    Parse a PDF resume and extract text, sections, and image count.
-    Uses pdfplumber for text and PyMuPDF for images.
-    Falls back to OCR for scanned documents.
+    Parse a PDF resume and extract text, sections, and image metadata.
+    Accepts a file path or the uploaded bytes. The default "pymupdf" engine
+    gets text, images and text-layer flags in a single pass over one open
+    document; "pdfplumber" is kept as an opt-in text extractor.
+    Pages without a text layer (scans) are OCR'd individually.
     """
-    text_content = ""
+    engine = engine or PDF_ENGINE
+    page_texts: List[str] = []
+    image_xrefs: List[List[int]] = []
     images_count = 0
+    text_layer_pages: Optional[List[bool]] = None
     
-    # Extract text using pdfplumber
-    try:
-        with pdfplumber.open(file_path) as pdf:
-            for page in pdf.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    text_content += page_text + "\n"
-    except Exception as e:
-        print(f"pdfplumber error: {e}")
-    
-    # If no text found, try OCR
-    if len(text_content.strip()) < 50:
-        text_content = extract_text_with_ocr(file_path)
+    if engine == "pdfplumber":
+        page_texts = _extract_text_pdfplumber(source)
     
-    # Count and extract images using PyMuPDF
     try:
-        doc = fitz.open(file_path)
-        for page in doc:
-            images = page.get_images()
-            images_count += len(images)
-        doc.close()
+        doc = open_pdf(source)
     except Exception as e:
         print(f"PyMuPDF error: {e}")
+        doc = None
+    
+    if doc is not None:
+        try:
+            with span("pdf_text_layer", pages=doc.page_count, engine=engine):
+                for page in doc:
+                    if engine != "pdfplumber":
+                        page_texts.append(page.get_text("text", sort=True))
+                    images = page.get_images()
+                    images_count += len(images)
+                    image_xrefs.extend([page.number, img[0]] for img in images)
+            
+            if len(page_texts) < doc.page_count:
+                # Text extraction failed outright; OCR everything PyMuPDF can open
+                page_texts = [""] * doc.page_count
+            
+            # OCR only the pages that have no usable text layer
+            text_layer_pages = [len(page_text.strip()) >= OCR_MIN_PAGE_CHARS for page_text in page_texts]
+            scanned_pages = [i for i, has_text in enumerate(text_layer_pages) if not has_text]
+            for page_num, ocr_text in ocr_pages(doc, scanned_pages).items():
+                if ocr_text.strip():
+                    page_texts[page_num] = ocr_text
+        except Exception as e:
+            print(f"PyMuPDF error: {e}")
+        finally:
+            doc.close()
+    
+    if text_layer_pages is None or len(text_layer_pages) != len(page_texts):
+        # PyMuPDF could not open or read the file; judge what text we have
+        text_layer_pages = [len(page_text.strip()) >= OCR_MIN_PAGE_CHARS for page_text in page_texts]
+    text_content = "".join(page_text.rstrip("\n") + "\n" for page_text in page_texts if page_text)
     
     # Parse sections from text
     sections = extract_sections(text_content)
@@ -50,112 +87,193 @@ def parse_pdf(file_path: str) -> Dict[str, Any]:
     return {
         "text": text_content.strip(),
         "sections": sections,
-        "images_count": images_count
+        "images_count": images_count,
+        "image_xrefs": image_xrefs,
+        "page_count": len(page_texts),
+        "text_layer_pages": text_layer_pages
     }
 
 
-def extract_text_with_ocr(file_path: str) -> str:
+def _extract_text_pdfplumber(source: Union[str, bytes]) -> List[str]:
+    """Extract per-page text with pdfplumber (opt-in engine)"""
+    import pdfplumber
+    
+    page_texts = []
+    try:
+        if isinstance(source, (bytes, bytearray)):
+            source = io.BytesIO(source)
+        with pdfplumber.open(source) as pdf:
+            for page in pdf.pages:
+                page_texts.append(page.extract_text() or "")
+    except Exception as e:
+        print(f"pdfplumber error: {e}")
+    return page_texts
+
+
+def extract_text_with_ocr(source: Union[str, bytes]) -> str:
     """
-    Extract text from PDF using OCR (for scanned documents)
+    Extract text from every page of a PDF using OCR (for scanned documents)
     """
     text_content = ""
     try:
-        doc = fitz.open(file_path)
-        for page in doc:
-            # Convert page to image
-            pix = page.get_pixmap(matrix=fitz.Matrix(2, 2))
-            img = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
-            
-            # OCR the image
-            page_text = pytesseract.image_to_string(img)
-            text_content += page_text + "\n"
+        doc = open_pdf(source)
+        ocr_texts = ocr_pages(doc, list(range(doc.page_count)))
         doc.close()
+        for page_num in sorted(ocr_texts):
+            text_content += ocr_texts[page_num] + "\n"
     except Exception as e:
         print(f"OCR error: {e}")
     
     return text_content
 
 
-def extract_sections(text: str) -> Dict[str, str]:
+def ocr_pages(doc: "fitz.Document", page_numbers: List[int]) -> Dict[int, str]:
     """
-    Extract resume sections based on common headings
+    OCR the given pages of an open document.
+    Pages are rasterized one at a time on this thread (PyMuPDF is not
+    thread-safe) and recognized in parallel by a thread pool, since each
+    Tesseract call runs in its own process. Results are cached on disk by
+    page content hash, so a re-uploaded scan is never OCR'd twice.
     """
-    sections = {
-        "contact": "",
-        "summary": "",
-        "experience": "",
-        "education": "",
-        "skills": "",
-        "projects": "",
-        "certifications": "",
-        "other": ""
-    }
-    
-    # Common section headers (case insensitive)
-    section_patterns = {
-        "summary": r"(?:professional\s+)?summary|objective|profile|about\s*me",
-        "experience": r"(?:work\s+)?experience|employment|work\s*history|professional\s*experience",
-        "education": r"education|academic|qualifications|degrees?",
-        "skills": r"skills?|technical\s*skills?|competenc(?:y|ies)|technologies|expertise",
-        "projects": r"projects?|portfolio|work\s*samples?",
-        "certifications": r"certifications?|certificates?|licenses?|credentials?"
-    }
+    results: Dict[int, str] = {}
+    if not page_numbers:
+        return results
     
-    lines = text.split('\n')
-    current_section = "contact"  # First content is usually contact info
-    section_content = []
-    
-    for line in lines:
-        line_stripped = line.strip()
-        if not line_stripped:
-            continue
-        
-        # Check if this line is a section header
-        matched_section = None
-        for section_name, pattern in section_patterns.items():
-            if re.match(f"^{pattern}.*$", line_stripped, re.IGNORECASE):
-                matched_section = section_name
-                break
+    workers = max(1, min(OCR_WORKERS, len(page_numbers)))
+    with span("ocr", pages=len(page_numbers), workers=workers) as ocr_span, \
+            ThreadPoolExecutor(max_workers=workers) as executor:
+        in_flight = {}
+        cache_hits = 0
+        for page_num in page_numbers:
+            page = doc[page_num]
+            cache_key = page_content_hash(doc, page)
+            cached = _read_ocr_cache(cache_key)
+            record_cache("ocr", cached is not None)
+            if cached is not None:
+                results[page_num] = cached
+                cache_hits += 1
+                continue
+            
+            # Bound the number of rendered pages held in memory
+            if len(in_flight) >= workers * 2:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    _collect_ocr(future, in_flight.pop(future), results)
+            
+            image = rasterize_page(page)
+            future = executor.submit(_ocr_image, image)
+            in_flight[future] = (page_num, cache_key)
         
-        if matched_section:
-            # Save previous section content
-            if section_content:
-                sections[current_section] = '\n'.join(section_content)
-            current_section = matched_section
-            section_content = []
-        else:
-            section_content.append(line_stripped)
+        for future in list(in_flight):
+            _collect_ocr(future, in_flight.pop(future), results)
+        ocr_span.set(cache_hits=cache_hits)
     
-    # Save last section
-    if section_content:
-        sections[current_section] = '\n'.join(section_content)
-    
-    return sections
+    return results
+
+
+def rasterize_page(page: "fitz.Page") -> Image.Image:
+    """
+    Render a page to a grayscale image for OCR.
+    Uses OCR_TARGET_DPI, scaled down for oversized pages so the image stays
+    within OCR_MAX_PIXELS.
+    """
+    zoom = OCR_TARGET_DPI / 72
+    area = page.rect.width * page.rect.height
+    if area > 0 and area * zoom * zoom > OCR_MAX_PIXELS:
+        zoom = (OCR_MAX_PIXELS / area) ** 0.5
+    pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), colorspace=fitz.csGRAY)
+    return Image.frombytes("L", [pix.width, pix.height], pix.samples)
+
+
+def page_content_hash(doc: "fitz.Document", page: "fitz.Page") -> str:
+    """
+    Hash a page's content stream and embedded images together with the OCR
+    settings that affect the result
+    """
+    digest = hashlib.sha256(f"{OCR_LANG}|{OCR_TARGET_DPI}|{OCR_MAX_PIXELS}|".encode())
+    digest.update(f"{page.rect.width}x{page.rect.height}".encode())
+    digest.update(page.read_contents())
+    for img in page.get_images():
+        digest.update(doc.xref_stream_raw(img[0]) or b"")
+    return digest.hexdigest()
+
+
+def _ocr_image(image: Image.Image) -> tuple:
+    """Run Tesseract on one page image, returning the text and seconds taken"""
+    started = time.perf_counter()
+    text = pytesseract.image_to_string(
+        image,
+        lang=OCR_LANG,
+        timeout=OCR_PAGE_TIMEOUT_SECONDS
+    )
+    return text, time.perf_counter() - started
+
+
+def _collect_ocr(future, job: tuple, results: Dict[int, str]):
+    """Store a finished OCR job's text and cache it"""
+    page_num, cache_key = job
+    try:
+        text, seconds = future.result()
+    except Exception as e:
+        print(f"OCR error on page {page_num + 1}: {e}")
+        return
+    observe_stage("ocr_page", seconds)
+    results[page_num] = text
+    _write_ocr_cache(cache_key, text)
+
+
+def _read_ocr_cache(cache_key: str) -> Optional[str]:
+    """Read cached OCR text for a page hash"""
+    try:
+        with open(os.path.join(OCR_CACHE_DIR, f"{cache_key}.txt"), encoding="utf-8") as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def _write_ocr_cache(cache_key: str, text: str):
+    """Atomically write OCR text for a page hash"""
+    try:
+        os.makedirs(OCR_CACHE_DIR, exist_ok=True)
+        path = os.path.join(OCR_CACHE_DIR, f"{cache_key}.txt")
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"OCR cache write error: {e}")
 
 
-def extract_images_as_base64(file_path: str) -> List[str]:
+def extract_images_as_base64(
+    source: Union[str, bytes],
+    image_xrefs: Optional[List[List[int]]] = None
+) -> List[str]:
     """
-    Extract images from PDF as base64 strings for vision analysis
+    Extract images from PDF as base64 strings for vision analysis.
+    Pass the image_xrefs from parse_pdf to skip rescanning the pages.
     """
+    import base64
+    
     images_b64 = []
     try:
-        doc = fitz.open(file_path)
-        for page_num, page in enumerate(doc):
-            for img_idx, img in enumerate(page.get_images()):
-                xref = img[0]
-                pix = fitz.Pixmap(doc, xref)
-                
-                if pix.n >= 5:  # CMYK
-                    pix = fitz.Pixmap(fitz.csRGB, pix)
-                
-                img_data = pix.tobytes("png")
-                import base64
-                img_b64 = base64.b64encode(img_data).decode()
-                images_b64.append(img_b64)
-                
-                if len(images_b64) >= 5:  # Limit to 5 images
-                    break
-            if len(images_b64) >= 5:
+        doc = open_pdf(source)
+        if image_xrefs is None:
+            image_xrefs = [[page.number, img[0]] for page in doc for img in page.get_images()]
+        
+        seen = set()
+        for _, xref in image_xrefs:
+            if xref in seen:
+                continue
+            seen.add(xref)
+            pix = fitz.Pixmap(doc, xref)
+            
+            if pix.n >= 5:  # CMYK
+                pix = fitz.Pixmap(fitz.csRGB, pix)
+            
+            img_data = pix.tobytes("png")
+            images_b64.append(base64.b64encode(img_data).decode())
+            
+            if len(images_b64) >= 5:  # Limit to 5 images
                 break
         doc.close()
     except Exception as e:
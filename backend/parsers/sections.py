@@ -0,0 +1,122 @@
+"""
+Resume Reactor - Section Segmentation
+Splits resume text into sections using one precompiled header pattern
+"""
+import re
+from typing import Dict, List, NamedTuple, Optional, Tuple, Union
+
+from services.tracing import span as trace_span
+
+
+# Common section headers (case insensitive), tried in this order
+DEFAULT_SECTION_HEADERS: Dict[str, str] = {
+    "summary": r"(?:professional\s+)?summary|objective|profile|about\s*me",
+    "experience": r"(?:work\s+)?experience|employment|work\s*history|professional\s*experience",
+    "education": r"education|academic|qualifications|degrees?",
+    "skills": r"skills?|technical\s*skills?|competenc(?:y|ies)|technologies|expertise",
+    "projects": r"projects?|portfolio|work\s*samples?",
+    "certifications": r"certifications?|certificates?|licenses?|credentials?"
+}
+
+
+class SectionSpan(NamedTuple):
+    """One section block: header line offsets and content offsets into the text"""
+    name: str
+    header: Optional[Tuple[int, int]]
+    start: int
+    end: int
+
+
+class SectionSegmenter:
+    """
+    Resume section splitter.
+
+    Every header vocabulary is compiled into a single alternation with one
+    named group per section, so each line costs one regex match. A line
+    that starts with a header phrase opens that section; the text before
+    the first header is treated as contact details. Vocabularies map a
+    section name to a regex or to a list of literal header phrases.
+    """
+
+    def __init__(self, headers: Optional[Dict[str, Union[str, List[str]]]] = None):
+        headers = DEFAULT_SECTION_HEADERS if headers is None else headers
+        alternatives = []
+        for name, vocabulary in headers.items():
+            if not name.isidentifier():
+                raise ValueError(f"Section name must be an identifier: {name!r}")
+            if not isinstance(vocabulary, str):
+                vocabulary = "|".join(
+                    r"\s+".join(re.escape(word) for word in phrase.split())
+                    for phrase in vocabulary
+                )
+            alternatives.append(f"(?P<{name}>{vocabulary})")
+        self.section_names = ["contact", *headers, "other"]
+        self._header_re = re.compile("|".join(alternatives), re.IGNORECASE)
+
+    def match_header(self, line: str) -> Optional[str]:
+        """Section name if the (stripped) line is a section header"""
+        match = self._header_re.match(line)
+        return match.lastgroup if match else None
+
+    def segment_spans(self, text: str) -> List[SectionSpan]:
+        """
+        All section blocks in document order, as offsets into the text.
+        A block's content span runs from its first to its last non-blank
+        line, excluding surrounding whitespace.
+        """
+        spans: List[SectionSpan] = []
+        name, header, start, end = "contact", None, -1, -1
+        offset = 0
+        for line in text.split('\n'):
+            line_start = offset
+            offset += len(line) + 1
+
+            stripped = line.strip()
+            if not stripped:
+                continue
+            strip_start = line_start + (len(line) - len(line.lstrip()))
+            strip_end = strip_start + len(stripped)
+
+            matched = self.match_header(stripped)
+            if matched:
+                if start >= 0:
+                    spans.append(SectionSpan(name, header, start, end))
+                name, header, start, end = matched, (strip_start, strip_end), -1, -1
+            else:
+                if start < 0:
+                    start = strip_start
+                end = strip_end
+
+        if start >= 0:
+            spans.append(SectionSpan(name, header, start, end))
+        return spans
+
+    def segment(self, text: str) -> Dict[str, str]:
+        """
+        Section name to content. Content lines are stripped and joined with
+        newlines; when a section appears twice the later block wins.
+        """
+        sections = {name: "" for name in self.section_names}
+        for span in self.segment_spans(text):
+            lines = (line.strip() for line in text[span.start:span.end].split('\n'))
+            sections[span.name] = '\n'.join(line for line in lines if line)
+        return sections
+
+
+_default_segmenter = SectionSegmenter()
+
+
+def extract_sections(text: str) -> Dict[str, str]:
+    """
+    Extract resume sections based on common headings
+    """
+    with trace_span("extract_sections", chars=len(text)):
+        return _default_segmenter.segment(text)
+
+
+def extract_section_spans(text: str) -> List[SectionSpan]:
+    """
+    Extract resume section blocks as offsets into the text
+    """
+    with trace_span("extract_section_spans", chars=len(text)):
+        return _default_segmenter.segment_spans(text)
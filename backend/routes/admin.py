@@ -0,0 +1,68 @@
+"""
+Resume Reactor - Admin API Routes
+Retrieves request traces and profiles recorded with X-Trace
+"""
+from fastapi import APIRouter, Depends, Header, HTTPException
+from fastapi.responses import FileResponse, PlainTextResponse
+from typing import Literal, Optional
+import asyncio
+import re
+
+from config import ADMIN_TOKEN
+from services.tracing import get_trace_store, is_admin, profile_summary
+
+TRACE_ID_PATTERN = re.compile(r"[0-9a-f]{32}")
+
+
+async def require_admin(x_admin_token: Optional[str] = Header(None)):
+    """Admin routes do not exist without ADMIN_TOKEN and need it otherwise"""
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not is_admin(x_admin_token):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+
+router = APIRouter(dependencies=[Depends(require_admin)])
+
+
+def _check_trace_id(request_id: str):
+    if not TRACE_ID_PATTERN.fullmatch(request_id):
+        raise HTTPException(status_code=404, detail="Trace not found")
+
+
+@router.get("/traces/{request_id}")
+async def get_trace(request_id: str):
+    """
+    Get the span tree of a traced request (offsets and durations in ms)
+    """
+    _check_trace_id(request_id)
+    trace = await asyncio.to_thread(get_trace_store().load, request_id)
+    if trace is None:
+        raise HTTPException(status_code=404, detail="Trace not found")
+    return trace
+
+
+@router.get("/traces/{request_id}/profile")
+async def get_trace_profile(
+    request_id: str,
+    format: Literal["pstats", "text"] = "pstats",
+    sort: Literal["cumulative", "tottime", "calls"] = "cumulative",
+    limit: int = 40
+):
+    """
+    Download the cProfile dump of a request traced with X-Trace: profile,
+    or a text summary of its top functions with format=text
+    """
+    _check_trace_id(request_id)
+    path = get_trace_store().profile_path(request_id)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+
+    if format == "text":
+        summary = await asyncio.to_thread(profile_summary, path, max(1, limit), sort)
+        return PlainTextResponse(summary)
+    return FileResponse(
+        path,
+        media_type="application/octet-stream",
+        filename=f"{request_id}.prof"
+    )
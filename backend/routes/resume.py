@@ -2,23 +2,61 @@
 Resume Reactor - Resume API Routes
 Handles file upload, analysis, rewriting, and export
 """
-from fastapi import APIRouter, UploadFile, File, Form, HTTPException
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Request
+from fastapi.responses import Response, StreamingResponse
+from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel
-from typing import Optional, List
+from typing import Optional, List, Dict, Literal
 import os
+import json
 import uuid
+import hashlib
 import aiofiles
 
-from config import MAX_FILE_SIZE_MB, ALLOWED_EXTENSIONS, TEMP_DIR
+from config import (
+    MAX_FILE_SIZE_MB, ALLOWED_EXTENSIONS, TEMP_DIR, UPLOAD_CHUNK_SIZE,
+    BATCH_MAX_RESUMES, BATCH_ANALYZE_CONCURRENCY, BATCH_ANALYZE_MAX_CONCURRENCY,
+    ANALYZE_LATENCY_BUDGET_MS, BULK_EXPORT_MAX_RESUMES
+)
+from services.resume_store import get_resume_store
+from services.temp_sweeper import get_temp_sweeper
+from services.nim_scheduler import (
+    SchedulerRejected, set_request_priority, PRIORITY_INTERACTIVE, PRIORITY_BULK
+)
+from services.nim_resilience import NimError
+from services.metrics import time_stage
 
 router = APIRouter()
 
 
 # Request/Response Models
+KeywordMode = Literal["llm", "spacy", "hybrid"]
+
+
 class AnalyzeRequest(BaseModel):
     resume_id: str
+    job_description: Optional[str] = None
+    jd_id: Optional[str] = None
+    latency_budget_ms: Optional[int] = None
+    keyword_mode: Optional[KeywordMode] = None
+
+
+class BatchAnalyzeRequest(BaseModel):
+    resume_ids: List[str]
+    job_description: Optional[str] = None
+    jd_id: Optional[str] = None
+    concurrency: Optional[int] = None
+    keyword_mode: Optional[KeywordMode] = None
+
+
+class JobDescriptionRequest(BaseModel):
     job_description: str
+    keyword_mode: Optional[KeywordMode] = None
+
+
+class JobDescriptionResponse(BaseModel):
+    jd_id: str
+    keywords: List[str]
 
 
 class RewriteRequest(BaseModel):
@@ -28,6 +66,33 @@ class RewriteRequest(BaseModel):
     job_description: Optional[str] = None
 
 
+class SummaryRequest(BaseModel):
+    resume_id: str
+    target_role: Optional[str] = ""
+    years_experience: Optional[int] = 0
+
+
+class BulletPointsRequest(BaseModel):
+    experience_description: str
+    role: str
+    company: str
+    target_keywords: Optional[List[str]] = None
+
+
+class BulkExportRequest(BaseModel):
+    resume_ids: List[str]
+    formats: List[Literal["docx", "pdf"]] = ["docx"]
+
+
+class BulkExportStatus(BaseModel):
+    job_id: str
+    status: str
+    total: int
+    completed: int
+    failed: int
+    errors: List[Dict[str, str]] = []
+
+
 class SuggestionResponse(BaseModel):
     id: str
     section: str
@@ -42,10 +107,19 @@ class AnalysisResponse(BaseModel):
     ats_score: int
     keyword_matches: List[str]
     missing_keywords: List[str]
+    keyword_counts: Dict[str, int] = {}
     suggestions: List[SuggestionResponse]
+    suggestions_status: str = "ready"
+    analysis_id: Optional[str] = None
     format_issues: List[str]
 
 
+class DeferredSuggestionsResponse(BaseModel):
+    analysis_id: str
+    status: str
+    suggestions: List[SuggestionResponse]
+
+
 class ResumeContent(BaseModel):
     resume_id: str
     filename: str
@@ -54,10 +128,6 @@ class ResumeContent(BaseModel):
     images_detected: int
 
 
-# In-memory storage (would use database in production)
-resume_storage = {}
-
-
 @router.post("/upload", response_model=ResumeContent)
 async def upload_resume(file: UploadFile = File(...)):
     """
@@ -72,36 +142,84 @@ async def upload_resume(file: UploadFile = File(...)):
             detail=f"Invalid file type. Allowed: {ALLOWED_EXTENSIONS}"
         )
     
-    # Check file size
-    contents = await file.read()
-    if len(contents) > MAX_FILE_SIZE_MB * 1024 * 1024:
-        raise HTTPException(
-            status_code=400,
-            detail=f"File too large. Max size: {MAX_FILE_SIZE_MB}MB"
-        )
-    
-    # Generate unique ID and save file
+    # Copy to TEMP_DIR in chunks, hashing as we go; memory use stays constant.
+    # Starlette has already received the whole body into its spooled temp
+    # file by now (UploadSizeLimitMiddleware is what cuts off oversized
+    # bodies while they arrive), so the checks below only avoid copying,
+    # hashing and parsing a file that is bad.
     resume_id = str(uuid.uuid4())
     file_path = os.path.join(TEMP_DIR, f"{resume_id}{file_ext}")
+    max_bytes = MAX_FILE_SIZE_MB * 1024 * 1024
+    digest = hashlib.sha256()
+    size = 0
     
-    async with aiofiles.open(file_path, 'wb') as f:
-        await f.write(contents)
+    try:
+        with time_stage("upload_read"):
+            async with aiofiles.open(file_path, 'wb') as f:
+                while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                    if size == 0 and not has_file_signature(file_ext, chunk):
+                        raise HTTPException(
+                            status_code=400,
+                            detail=f"File content does not match a {file_ext} document"
+                        )
+                    size += len(chunk)
+                    # The middleware's limit allows for multipart framing
+                    if size > max_bytes:
+                        raise HTTPException(
+                            status_code=413,
+                            detail=f"File too large. Max size: {MAX_FILE_SIZE_MB}MB"
+                        )
+                    digest.update(chunk)
+                    await f.write(chunk)
+        if size == 0:
+            raise HTTPException(status_code=400, detail="File is empty")
+    except BaseException:
+        if os.path.exists(file_path):
+            os.remove(file_path)
+        raise
     
-    # Parse the resume
-    from parsers.pdf_parser import parse_pdf
-    from parsers.docx_parser import parse_docx
+    # Identical bytes reuse the earlier file and parse
+    content_key = digest.hexdigest() + file_ext
+    store = get_resume_store()
+    sweeper = get_temp_sweeper()
+    upload = await store.aget_upload(content_key)
     
-    if file_ext == ".pdf":
-        parsed = parse_pdf(file_path)
+    if upload is not None and sweeper.reuse(upload["file_path"]):
+        os.remove(file_path)
+        file_path = upload["file_path"]
+        parsed = upload["parsed"]
+    elif upload is not None:
+        # The earlier copy was swept; this one takes its place
+        await store.aset_upload_file(content_key, file_path)
+        parsed = upload["parsed"]
     else:
-        parsed = parse_docx(file_path)
+        # Parse the resume in the worker pool
+        from concurrent.futures.process import BrokenProcessPool
+        from services.parse_pool import get_parse_pool, ParsePoolBusy, ParseTimeout
+        
+        try:
+            # Held until the upload record points at the file
+            with sweeper.hold(file_path):
+                parsed = await get_parse_pool().parse(file_path, file_ext)
+                await store.aput_upload(content_key, file_path, parsed)
+        except ParsePoolBusy:
+            raise HTTPException(
+                status_code=503,
+                detail="Server is busy parsing other resumes. Please retry shortly.",
+                headers={"Retry-After": "5"}
+            )
+        except ParseTimeout:
+            raise HTTPException(status_code=504, detail="Resume parsing timed out")
+        except BrokenProcessPool:
+            # The workers were restarted; the same upload will usually parse on retry
+            raise HTTPException(
+                status_code=503,
+                detail="Resume parser crashed. Please retry shortly.",
+                headers={"Retry-After": "1"}
+            )
     
-    # Store in memory
-    resume_storage[resume_id] = {
-        "file_path": file_path,
-        "filename": file.filename,
-        "parsed": parsed
-    }
+    # Register the resume
+    await store.acreate_resume(resume_id, file_path, file.filename, content_key)
     
     return ResumeContent(
         resume_id=resume_id,
@@ -112,39 +230,187 @@ async def upload_resume(file: UploadFile = File(...)):
     )
 
 
+def has_file_signature(file_ext: str, head: bytes) -> bool:
+    """Check the leading bytes of an upload against its claimed type"""
+    if file_ext == ".pdf":
+        # The spec tolerates a little junk before the header
+        return b"%PDF-" in head[:1024]
+    if file_ext == ".docx":
+        return head.startswith(b"PK\x03\x04")
+    return False
+
+
 @router.post("/analyze", response_model=AnalysisResponse)
 async def analyze_resume(request: AnalyzeRequest):
     """
     Analyze resume against a job description
     Returns ATS score and improvement suggestions
     """
-    if request.resume_id not in resume_storage:
+    resume_data = await get_resume_store().aget_resume(request.resume_id)
+    if resume_data is None:
         raise HTTPException(status_code=404, detail="Resume not found")
     
-    resume_data = resume_storage[request.resume_id]
-    
     from services.ats_analyzer import analyze_ats_compatibility
+    from services.jd_registry import get_job_description
     
-    analysis = await analyze_ats_compatibility(
-        resume_text=resume_data["parsed"]["text"],
-        job_description=request.job_description
+    latency_budget_ms = request.latency_budget_ms
+    if latency_budget_ms is None:
+        latency_budget_ms = ANALYZE_LATENCY_BUDGET_MS
+    
+    if request.jd_id:
+        jd = await get_job_description(request.jd_id)
+        if jd is None:
+            raise HTTPException(status_code=404, detail="Job description not found")
+        analysis = await analyze_ats_compatibility(
+            resume_text=resume_data["parsed"]["text"],
+            job_description=jd["job_description"],
+            jd_keywords=jd["keywords"],
+            matcher=jd["matcher"],
+            latency_budget_ms=latency_budget_ms,
+            sections=resume_data["parsed"].get("sections")
+        )
+    elif request.job_description:
+        analysis = await analyze_ats_compatibility(
+            resume_text=resume_data["parsed"]["text"],
+            job_description=request.job_description,
+            latency_budget_ms=latency_budget_ms,
+            keyword_mode=request.keyword_mode,
+            sections=resume_data["parsed"].get("sections")
+        )
+    else:
+        raise HTTPException(status_code=400, detail="Provide either job_description or jd_id")
+    
+    return build_analysis_response(request.resume_id, analysis)
+
+
+@router.post("/analyze/batch")
+async def analyze_resume_batch(request: BatchAnalyzeRequest):
+    """
+    Analyze many resumes against one job description.
+    Streams one NDJSON line per resume as each analysis finishes.
+    """
+    set_request_priority(PRIORITY_BULK)
+    if not request.resume_ids:
+        raise HTTPException(status_code=400, detail="resume_ids is empty")
+    if len(request.resume_ids) > BATCH_MAX_RESUMES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many resumes. Max per batch: {BATCH_MAX_RESUMES}"
+        )
+    
+    from services.ats_analyzer import analyze_batch
+    from services.jd_registry import get_job_description, register_job_description as do_register
+    
+    # Resolve keywords once for the whole batch
+    if request.jd_id:
+        jd = await get_job_description(request.jd_id)
+        if jd is None:
+            raise HTTPException(status_code=404, detail="Job description not found")
+    elif request.job_description:
+        jd = await do_register(request.job_description, request.keyword_mode)
+    else:
+        raise HTTPException(status_code=400, detail="Provide either job_description or jd_id")
+    
+    concurrency = min(
+        request.concurrency or BATCH_ANALYZE_CONCURRENCY,
+        BATCH_ANALYZE_MAX_CONCURRENCY
     )
     
+    resumes = {}
+    not_found = []
+    store = get_resume_store()
+    for resume_id in dict.fromkeys(request.resume_ids):
+        resume_data = await store.aget_resume(resume_id)
+        if resume_data is not None:
+            resumes[resume_id] = resume_data["parsed"]["text"]
+        else:
+            not_found.append(resume_id)
+    
+    async def ndjson_lines():
+        for resume_id in not_found:
+            yield json.dumps({"resume_id": resume_id, "error": "Resume not found"}) + "\n"
+        
+        async for result in analyze_batch(
+            resumes=resumes,
+            job_description=jd["job_description"],
+            jd_keywords=jd["keywords"],
+            matcher=jd["matcher"],
+            concurrency=concurrency
+        ):
+            if "error" in result:
+                line = result
+            else:
+                line = jsonable_encoder(build_analysis_response(result["resume_id"], result))
+            yield json.dumps(line) + "\n"
+    
+    return StreamingResponse(ndjson_lines(), media_type="application/x-ndjson")
+
+
+def build_analysis_response(resume_id: str, analysis: dict) -> AnalysisResponse:
+    """Shape an analyzer result into the public response model"""
     return AnalysisResponse(
-        resume_id=request.resume_id,
+        resume_id=resume_id,
         ats_score=analysis["score"],
         keyword_matches=analysis["matched_keywords"],
         missing_keywords=analysis["missing_keywords"],
+        keyword_counts=analysis.get("keyword_counts", {}),
         suggestions=analysis["suggestions"],
+        suggestions_status=analysis.get("suggestions_status", "ready"),
+        analysis_id=analysis.get("analysis_id"),
         format_issues=analysis["format_issues"]
     )
 
 
+@router.get("/analyze/{analysis_id}/suggestions", response_model=DeferredSuggestionsResponse)
+async def get_analysis_suggestions(analysis_id: str):
+    """
+    Fetch suggestions that were still pending when an analysis hit its latency budget
+    """
+    from services.ats_analyzer import get_deferred_suggestions
+    
+    record = await get_deferred_suggestions(analysis_id)
+    if record is None:
+        raise HTTPException(status_code=404, detail="Analysis not found or expired")
+    return DeferredSuggestionsResponse(
+        analysis_id=analysis_id,
+        status=record["status"],
+        suggestions=record["suggestions"]
+    )
+
+
+@router.post("/jd", response_model=JobDescriptionResponse)
+async def register_job_description(request: JobDescriptionRequest):
+    """
+    Register a job description once and reuse its keywords across analyses
+    """
+    if not request.job_description.strip():
+        raise HTTPException(status_code=400, detail="Job description is empty")
+    
+    from services.jd_registry import register_job_description as do_register
+    
+    jd = await do_register(request.job_description, request.keyword_mode)
+    return JobDescriptionResponse(jd_id=jd["jd_id"], keywords=jd["keywords"])
+
+
+@router.get("/jd/{jd_id}", response_model=JobDescriptionResponse)
+async def get_job_description(jd_id: str):
+    """
+    Get a registered job description's keywords by ID
+    """
+    from services.jd_registry import get_job_description as do_get
+    
+    jd = await do_get(jd_id)
+    if jd is None:
+        raise HTTPException(status_code=404, detail="Job description not found")
+    return JobDescriptionResponse(jd_id=jd["jd_id"], keywords=jd["keywords"])
+
+
 @router.post("/rewrite")
 async def rewrite_section(request: RewriteRequest):
     """
     Get AI-powered rewrite suggestions for a resume section
     """
+    set_request_priority(PRIORITY_INTERACTIVE)
     from services.ai_rewriter import generate_rewrite
     
     rewritten = await generate_rewrite(
@@ -161,30 +427,190 @@ async def rewrite_section(request: RewriteRequest):
     }
 
 
+@router.post("/rewrite/stream")
+async def rewrite_section_stream(request: RewriteRequest):
+    """
+    Stream a section rewrite over server-sent events.
+    Emits `token` events as text is generated, then one `result` event.
+    """
+    set_request_priority(PRIORITY_INTERACTIVE)
+    from services.ai_rewriter import stream_rewrite
+    
+    async def events():
+        async for event, data in stream_rewrite(
+            original_text=request.original_text,
+            section=request.section,
+            job_description=request.job_description
+        ):
+            if event == "result":
+                data = {
+                    "original": request.original_text,
+                    "suggested": data["text"],
+                    "improvements": data["improvements"],
+                    "keywords_added": data["keywords_added"]
+                }
+            yield format_sse(event, data)
+    
+    return sse_response(events())
+
+
+@router.post("/summary/stream")
+async def generate_summary_stream(request: SummaryRequest):
+    """
+    Stream a professional summary for a stored resume over server-sent events
+    """
+    set_request_priority(PRIORITY_INTERACTIVE)
+    resume_data = await get_resume_store().aget_resume(request.resume_id)
+    if resume_data is None:
+        raise HTTPException(status_code=404, detail="Resume not found")
+    
+    from services.ai_rewriter import stream_summary
+    
+    resume_text = resume_data["parsed"]["text"]
+    
+    async def events():
+        async for event, data in stream_summary(
+            resume_text=resume_text,
+            target_role=request.target_role or "",
+            years_experience=request.years_experience or 0,
+            sections=resume_data["parsed"].get("sections")
+        ):
+            yield format_sse(event, data)
+    
+    return sse_response(events())
+
+
+@router.post("/bullets/stream")
+async def generate_bullet_points_stream(request: BulletPointsRequest):
+    """
+    Stream ATS-optimized bullet points for a role over server-sent events
+    """
+    set_request_priority(PRIORITY_INTERACTIVE)
+    from services.ai_rewriter import stream_bullet_points
+    
+    async def events():
+        async for event, data in stream_bullet_points(
+            experience_description=request.experience_description,
+            role=request.role,
+            company=request.company,
+            target_keywords=request.target_keywords
+        ):
+            yield format_sse(event, data)
+    
+    return sse_response(events())
+
+
+def format_sse(event: str, data) -> str:
+    """Encode one server-sent event"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def sse_response(events) -> StreamingResponse:
+    """
+    Wrap an event generator in an unbuffered SSE response.
+    Headers are already sent once events flow, so a scheduler refusal or
+    NIM failure is reported as a final `error` event instead of a status.
+    """
+    async def guarded():
+        try:
+            async for event in events:
+                yield event
+        except (SchedulerRejected, NimError) as e:
+            yield format_sse("error", {
+                "detail": str(e),
+                "status": e.status_code,
+                "retry_after": e.retry_after
+            })
+    
+    return StreamingResponse(
+        guarded(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.post("/export/bulk", response_model=BulkExportStatus)
+async def start_bulk_export(request: BulkExportRequest):
+    """
+    Start rendering many resumes in the background; poll the job, then download a ZIP
+    """
+    if not request.resume_ids:
+        raise HTTPException(status_code=400, detail="resume_ids is empty")
+    if not request.formats:
+        raise HTTPException(status_code=400, detail="formats is empty")
+    if len(request.resume_ids) > BULK_EXPORT_MAX_RESUMES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many resumes. Max per export: {BULK_EXPORT_MAX_RESUMES}"
+        )
+    
+    from services.bulk_export import get_bulk_export_manager
+    
+    job = await get_bulk_export_manager().submit(request.resume_ids, request.formats)
+    return BulkExportStatus(**job.progress())
+
+
+@router.get("/export/bulk/{job_id}", response_model=BulkExportStatus)
+async def get_bulk_export(job_id: str):
+    """
+    Get a bulk export job's progress
+    """
+    from services.bulk_export import get_bulk_export_manager
+    
+    job = await get_bulk_export_manager().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Export job not found")
+    return BulkExportStatus(**job.progress())
+
+
+@router.get("/export/bulk/{job_id}/download")
+async def download_bulk_export(job_id: str):
+    """
+    Download a finished bulk export as a ZIP, assembled while it streams
+    """
+    from services.bulk_export import get_bulk_export_manager, stream_zip
+    
+    job = await get_bulk_export_manager().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Export job not found")
+    if job.status == "running":
+        raise HTTPException(status_code=409, detail="Export job is still running")
+    if not job.files:
+        raise HTTPException(status_code=422, detail="Export job produced no files")
+    # Checked up front: once the stream starts the status can no longer change
+    if job.missing_files():
+        raise HTTPException(status_code=410, detail="Export files expired; start a new export")
+    
+    return StreamingResponse(
+        stream_zip(job),
+        media_type="application/zip",
+        headers={"Content-Disposition": f'attachment; filename="resumes_{job_id[:8]}.zip"'}
+    )
+
+
 @router.get("/export/{resume_id}/{format}")
-async def export_resume(resume_id: str, format: str):
+async def export_resume(resume_id: str, format: str, request: Request):
     """
     Export the optimized resume as DOCX or PDF
     """
-    if resume_id not in resume_storage:
+    resume_data = await get_resume_store().aget_resume(resume_id)
+    if resume_data is None:
         raise HTTPException(status_code=404, detail="Resume not found")
     
     if format not in ["docx", "pdf"]:
         raise HTTPException(status_code=400, detail="Format must be 'docx' or 'pdf'")
     
-    from services.export_service import export_resume as do_export
+    from services.export_service import export_resume as do_export, MEDIA_TYPES
     
-    resume_data = resume_storage[resume_id]
-    output_path = await do_export(
-        resume_data=resume_data,
-        format=format
-    )
+    content_hash, content = await do_export(resume_data=resume_data, format=format)
     
-    return FileResponse(
-        output_path,
-        media_type="application/octet-stream",
-        filename=f"resume_optimized.{format}"
-    )
+    etag = f'"{content_hash}"'
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag in request.headers.get("if-none-match", ""):
+        return Response(status_code=304, headers=headers)
+    
+    headers["Content-Disposition"] = f'attachment; filename="resume_optimized.{format}"'
+    return Response(content=content, media_type=MEDIA_TYPES[format], headers=headers)
 
 
 @router.get("/resume/{resume_id}")
@@ -192,10 +618,10 @@ async def get_resume(resume_id: str):
     """
     Get stored resume data by ID
     """
-    if resume_id not in resume_storage:
+    data = await get_resume_store().aget_resume(resume_id)
+    if data is None:
         raise HTTPException(status_code=404, detail="Resume not found")
     
-    data = resume_storage[resume_id]
     return {
         "resume_id": resume_id,
         "filename": data["filename"],
@@ -214,17 +640,31 @@ async def update_resume(resume_id: str, request: UpdateResumeRequest):
     """
     Update resume content (after applying suggestions)
     """
-    if resume_id not in resume_storage:
+    store = get_resume_store()
+    resume_data = await store.aget_resume(resume_id)
+    if resume_data is None:
         raise HTTPException(status_code=404, detail="Resume not found")
     
-    # Update the stored resume data
-    resume_storage[resume_id]["parsed"]["text"] = request.text_content
-    resume_storage[resume_id]["parsed"]["sections"] = request.sections
+    # Re-analysis reuses suggestions for unchanged sections by content hash;
+    # the changed ones are reported so the client knows what will be redone
+    old_sections = resume_data["parsed"].get("sections", {})
+    changed_sections = [
+        name for name in dict.fromkeys([*old_sections, *request.sections])
+        if old_sections.get(name, "") != request.sections.get(name, "")
+    ]
+    
+    # Copy-on-write: the resume gets its own parsed copy, the upload is untouched
+    await store.aupdate_parsed(resume_id, {
+        **resume_data["parsed"],
+        "text": request.text_content,
+        "sections": request.sections
+    })
     
     return {
         "resume_id": resume_id,
         "message": "Resume updated successfully",
         "text_content": request.text_content,
-        "sections": request.sections
+        "sections": request.sections,
+        "changed_sections": changed_sections
     }
 
@@ -2,8 +2,12 @@
 Resume Reactor - AI Rewriter Service
 Generates improved resume content using NVIDIA NIM
 """
-from typing import Dict, Any, Optional, List
-from services.nvidia_client import generate_text
+from typing import Dict, Any, Optional, List, AsyncIterator, Tuple
+from services.nvidia_client import generate_text, stream_text
+from services.prompt_context import build_resume_context, rewrite_jd_context, max_tokens_for
+
+# Everything here is sampled writing the user can ask for again to get a
+# different take, so none of it is served from the LLM cache
 
 
 async def generate_rewrite(
@@ -14,9 +18,43 @@ async def generate_rewrite(
     """
     Generate an improved version of resume text
     """
+    prompt = build_rewrite_prompt(original_text, section, job_description)
+    response = await generate_text(
+        prompt, max_tokens=max_tokens_for("rewrite", original_text), temperature=0.7,
+        task="rewrite", use_cache=False
+    )
+    return parse_rewrite(response, original_text)
+
+
+async def stream_rewrite(
+    original_text: str,
+    section: str,
+    job_description: Optional[str] = None
+) -> AsyncIterator[Tuple[str, Any]]:
+    """
+    Stream a rewrite as ("token", text) events followed by one
+    ("result", fields) event holding the parsed rewrite
+    """
+    prompt = build_rewrite_prompt(original_text, section, job_description)
+    parts = []
+    async for token in stream_text(
+        prompt, max_tokens=max_tokens_for("rewrite", original_text), temperature=0.7,
+        task="rewrite", use_cache=False
+    ):
+        parts.append(token)
+        yield "token", token
+    yield "result", parse_rewrite("".join(parts), original_text)
+
+
+def build_rewrite_prompt(
+    original_text: str,
+    section: str,
+    job_description: Optional[str] = None
+) -> str:
+    """Build the rewrite prompt for a resume section"""
     jd_context = ""
     if job_description:
-        jd_context = f"\nTarget Job Description:\n{job_description[:500]}\n"
+        jd_context = f"\nTarget Job Description:\n{rewrite_jd_context(job_description)}\n"
     
     prompt = f"""You are an expert resume writer who specializes in ATS optimization.
 
@@ -41,10 +79,11 @@ IMPROVEMENTS:
 
 KEYWORDS_ADDED:
 [comma-separated list of keywords you added]"""
+    return prompt
 
-    response = await generate_text(prompt, max_tokens=600, temperature=0.7)
-    
-    # Parse response
+
+def parse_rewrite(response: str, original_text: str) -> Dict[str, Any]:
+    """Parse REWRITTEN/IMPROVEMENTS/KEYWORDS_ADDED from a rewrite completion"""
     rewritten = extract_section(response, "REWRITTEN")
     improvements = extract_list(response, "IMPROVEMENTS")
     keywords = extract_keywords_list(response, "KEYWORDS_ADDED")
@@ -65,6 +104,42 @@ async def generate_bullet_points(
     """
     Generate ATS-optimized bullet points for a work experience
     """
+    prompt = build_bullet_points_prompt(experience_description, role, company, target_keywords)
+    response = await generate_text(
+        prompt, max_tokens=max_tokens_for("bullet_points"), temperature=0.7,
+        task="bullet_points", use_cache=False
+    )
+    return parse_bullet_points(response)
+
+
+async def stream_bullet_points(
+    experience_description: str,
+    role: str,
+    company: str,
+    target_keywords: List[str] = None
+) -> AsyncIterator[Tuple[str, Any]]:
+    """
+    Stream bullet points as ("token", text) events followed by one
+    ("result", {"bullets": [...]}) event
+    """
+    prompt = build_bullet_points_prompt(experience_description, role, company, target_keywords)
+    parts = []
+    async for token in stream_text(
+        prompt, max_tokens=max_tokens_for("bullet_points"), temperature=0.7,
+        task="bullet_points", use_cache=False
+    ):
+        parts.append(token)
+        yield "token", token
+    yield "result", {"bullets": parse_bullet_points("".join(parts))}
+
+
+def build_bullet_points_prompt(
+    experience_description: str,
+    role: str,
+    company: str,
+    target_keywords: List[str] = None
+) -> str:
+    """Build the bullet point prompt for a work experience"""
     keywords_hint = ""
     if target_keywords:
         keywords_hint = f"\nTry to incorporate these keywords: {', '.join(target_keywords[:5])}"
@@ -83,9 +158,11 @@ Requirements:
 - Make ATS-friendly
 
 Format: Return ONLY the bullet points, one per line, starting with "•" """
+    return prompt
 
-    response = await generate_text(prompt, max_tokens=400, temperature=0.7)
-    
+
+def parse_bullet_points(response: str) -> List[str]:
+    """Parse bullet lines from a bullet point completion"""
     bullets = []
     for line in response.split('\n'):
         line = line.strip()
@@ -100,14 +177,51 @@ Format: Return ONLY the bullet points, one per line, starting with "•" """
 async def generate_summary(
     resume_text: str,
     target_role: str = "",
-    years_experience: int = 0
+    years_experience: int = 0,
+    sections: Optional[Dict[str, str]] = None
 ) -> str:
     """
     Generate a professional summary for the resume
     """
+    prompt = build_summary_prompt(resume_text, target_role, years_experience, sections)
+    response = await generate_text(
+        prompt, max_tokens=max_tokens_for("summary"), temperature=0.7,
+        task="summary", use_cache=False
+    )
+    return response.strip()
+
+
+async def stream_summary(
+    resume_text: str,
+    target_role: str = "",
+    years_experience: int = 0,
+    sections: Optional[Dict[str, str]] = None
+) -> AsyncIterator[Tuple[str, Any]]:
+    """
+    Stream a professional summary as ("token", text) events followed by one
+    ("result", {"summary": ...}) event
+    """
+    prompt = build_summary_prompt(resume_text, target_role, years_experience, sections)
+    parts = []
+    async for token in stream_text(
+        prompt, max_tokens=max_tokens_for("summary"), temperature=0.7,
+        task="summary", use_cache=False
+    ):
+        parts.append(token)
+        yield "token", token
+    yield "result", {"summary": "".join(parts).strip()}
+
+
+def build_summary_prompt(
+    resume_text: str,
+    target_role: str = "",
+    years_experience: int = 0,
+    sections: Optional[Dict[str, str]] = None
+) -> str:
+    """Build the professional summary prompt"""
     prompt = f"""Create a compelling professional summary for this resume:
 
-{resume_text[:1500]}
+{build_resume_context(sections, resume_text, task="summary")}
 
 Target Role: {target_role if target_role else "Not specified"}
 Years of Experience: {years_experience if years_experience else "Auto-detect from resume"}
@@ -119,9 +233,7 @@ Requirements:
 - Professional but engaging tone
 
 Return ONLY the summary text, nothing else."""
-
-    response = await generate_text(prompt, max_tokens=200, temperature=0.7)
-    return response.strip()
+    return prompt
 
 
 async def answer_clarifying_question(
@@ -146,7 +258,10 @@ USER'S ANSWER:
 Generate a professional resume bullet point or text that incorporates this information.
 Format: Return ONLY the resume text, nothing else."""
 
-    response = await generate_text(prompt, max_tokens=200, temperature=0.6)
+    response = await generate_text(
+        prompt, max_tokens=max_tokens_for("clarification"), temperature=0.6,
+        task="clarification", use_cache=False
+    )
     
     return {
         "generated_text": response.strip(),
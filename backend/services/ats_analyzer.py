@@ -2,50 +2,84 @@
 Resume Reactor - ATS Analyzer
 Analyzes resumes for ATS compatibility and keyword matching
 """
+import asyncio
+import hashlib
+import json
 import re
-from typing import Dict, List, Any
+import uuid
+from typing import Dict, List, Any, Optional, AsyncIterator, Set
 from collections import Counter
 
 from services.nvidia_client import generate_text
-from config import ATS_WEIGHTS
+from services.nim_resilience import NimError
+from services.nim_scheduler import SchedulerRejected
+from services.llm_cache import get_llm_cache
+from services.prompt_context import (
+    build_resume_context, build_jd_context, keywords_jd_context, max_tokens_for
+)
+from services.keyword_matcher import KeywordMatcher, get_keyword_matcher
+from services.resume_store import get_resume_store
+from services.metrics import time_stage, timed_stage
+from services.tracing import span
+from config import ATS_WEIGHTS, KEYWORD_EXTRACTOR, KEYWORD_MODES
 
 
 async def analyze_ats_compatibility(
     resume_text: str,
-    job_description: str
+    job_description: str,
+    jd_keywords: Optional[List[str]] = None,
+    matcher: Optional[KeywordMatcher] = None,
+    latency_budget_ms: Optional[int] = None,
+    keyword_mode: Optional[str] = None,
+    sections: Optional[Dict[str, str]] = None
 ) -> Dict[str, Any]:
     """
     Analyze resume against job description for ATS compatibility.
     Returns score, matched/missing keywords, and improvement suggestions.
+    Pass precomputed jd_keywords/matcher (see jd_registry) to skip extraction,
+    or keyword_mode to choose how they are extracted (see extract_keywords).
+
+    Runs as a stage pipeline: keyword extraction overlaps format analysis,
+    then matching, then the suggestions call. Pass the resume's sections
+    to reuse cached suggestions for sections that have not changed since
+    the last analysis against the same job description.
+    With a latency budget, suggestions that are not ready when it runs out
+    are finished in the background; the result then has
+    suggestions_status "pending" and an analysis_id to fetch them with
+    get_deferred_suggestions. If the suggestions call fails the score is
+    still returned, with suggestions_status "failed".
     """
-    # Extract keywords from job description
-    jd_keywords = await extract_keywords(job_description)
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + latency_budget_ms / 1000 if latency_budget_ms else None
     
-    # Find matches and gaps
-    resume_lower = resume_text.lower()
-    matched = []
-    missing = []
+    # Stage 1: keyword extraction alongside format analysis
+    if jd_keywords is None:
+        keyword_task = asyncio.create_task(
+            timed_stage("keyword_extraction", extract_keywords(job_description, keyword_mode))
+        )
+        try:
+            format_issues = await timed_stage(
+                "format_analysis", asyncio.to_thread(analyze_format, resume_text)
+            )
+            jd_keywords = await keyword_task
+        finally:
+            keyword_task.cancel()
+    else:
+        with time_stage("format_analysis"):
+            format_issues = analyze_format(resume_text)
+    if matcher is None:
+        matcher = get_keyword_matcher(jd_keywords)
     
-    for keyword in jd_keywords:
-        if keyword.lower() in resume_lower:
-            matched.append(keyword)
-        else:
-            missing.append(keyword)
+    # Stage 2: find matches and gaps in one pass over the resume
+    with time_stage("keyword_match"):
+        hits = matcher.scan(resume_text)
+    matched = [k for k in matcher.keywords if k in hits]
+    missing = [k for k in matcher.keywords if k not in hits]
     
     # Calculate base score
     keyword_score = (len(matched) / max(len(jd_keywords), 1)) * 100
-    
-    # Analyze format compliance
-    format_issues = analyze_format(resume_text)
     format_score = max(0, 100 - (len(format_issues) * 10))
     
-    # Generate AI suggestions
-    suggestions = await generate_suggestions(
-        resume_text, 
-        job_description, 
-        missing
-    )
-    
     # Calculate weighted final score
     final_score = int(
         keyword_score * ATS_WEIGHTS["keyword_match"] +
@@ -54,16 +88,161 @@ async def analyze_ats_compatibility(
         (keyword_score * 0.8) * ATS_WEIGHTS["skills_coverage"]
     )
     
-    return {
+    result = {
         "score": min(100, max(0, final_score)),
         "matched_keywords": matched,
         "missing_keywords": missing,
-        "suggestions": suggestions,
+        "keyword_counts": {keyword: len(spans) for keyword, spans in hits.items()},
+        "suggestions": [],
+        "suggestions_status": "ready",
+        "analysis_id": None,
         "format_issues": format_issues
     }
+    
+    # Stage 3: AI suggestions, within whatever budget is left
+    if sections:
+        suggestions_job = generate_section_suggestions(resume_text, job_description, missing, sections)
+    else:
+        suggestions_job = generate_suggestions(resume_text, job_description, missing)
+    suggestion_task = asyncio.create_task(timed_stage("suggestions", suggestions_job))
+    timeout = None if deadline is None else max(0, deadline - loop.time())
+    try:
+        done, _ = await asyncio.wait({suggestion_task}, timeout=timeout)
+    except asyncio.CancelledError:
+        suggestion_task.cancel()
+        raise
+    if done:
+        try:
+            result["suggestions"] = suggestion_task.result()
+        except (NimError, SchedulerRejected) as e:
+            # The score stands on its own; report the suggestions as failed
+            print(f"Suggestions error: {e}")
+            result["suggestions_status"] = "failed"
+    else:
+        result["suggestions_status"] = "pending"
+        result["analysis_id"] = await defer_suggestions(suggestion_task)
+    return result
+
+
+# Keep references so deferred suggestion tasks are not garbage collected
+_deferred_tasks: Set[asyncio.Task] = set()
 
 
-async def extract_keywords(job_description: str) -> List[str]:
+async def defer_suggestions(suggestion_task: asyncio.Task) -> str:
+    """
+    Let a suggestions task finish in the background and store its result.
+    Returns the analysis ID the suggestions can be fetched with.
+    """
+    analysis_id = uuid.uuid4().hex
+    store = get_resume_store()
+    await store.aput_suggestions(analysis_id, {"status": "pending", "suggestions": []})
+
+    async def finish():
+        try:
+            record = {"status": "ready", "suggestions": await suggestion_task}
+        except Exception as e:
+            print(f"Deferred suggestions error: {e}")
+            record = {"status": "failed", "suggestions": []}
+        await store.aput_suggestions(analysis_id, record)
+
+    task = asyncio.create_task(finish())
+    _deferred_tasks.add(task)
+    task.add_done_callback(_deferred_tasks.discard)
+    return analysis_id
+
+
+async def get_deferred_suggestions(analysis_id: str) -> Optional[Dict[str, Any]]:
+    """Deferred suggestions record for an analysis, or None if unknown or expired"""
+    return await get_resume_store().aget_suggestions(analysis_id)
+
+
+async def analyze_batch(
+    resumes: Dict[str, str],
+    job_description: str,
+    jd_keywords: List[str],
+    matcher: KeywordMatcher,
+    concurrency: int
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Analyze many resumes against one job description.
+    Keywords are extracted by the caller once; at most `concurrency` analyses
+    run at a time and results are yielded in completion order.
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def analyze_one(resume_id: str, resume_text: str) -> Dict[str, Any]:
+        async with semaphore:
+            try:
+                analysis = await analyze_ats_compatibility(
+                    resume_text=resume_text,
+                    job_description=job_description,
+                    jd_keywords=jd_keywords,
+                    matcher=matcher
+                )
+            except Exception as e:
+                print(f"Batch analysis error for {resume_id}: {e}")
+                return {"resume_id": resume_id, "error": str(e)}
+            return {"resume_id": resume_id, **analysis}
+
+    tasks = [
+        asyncio.create_task(analyze_one(resume_id, resume_text))
+        for resume_id, resume_text in resumes.items()
+    ]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        # Client went away or the consumer stopped early
+        for task in tasks:
+            task.cancel()
+
+
+async def extract_keywords(
+    job_description: str,
+    mode: Optional[str] = None,
+    fallback: bool = True
+) -> List[str]:
+    """
+    Extract important keywords from job description, plus common technical
+    keywords as a fallback. Modes (default KEYWORD_EXTRACTOR):
+    "llm" asks the model, "spacy" runs offline with no network call, and
+    "hybrid" runs spaCy and lets the LLM fill the remaining slots.
+    When the LLM call fails the other keywords are used alone, or with
+    fallback=False the NimError is raised.
+    """
+    mode = mode or KEYWORD_EXTRACTOR
+    if mode not in KEYWORD_MODES:
+        raise ValueError(f"Unknown keyword mode: {mode}")
+    technical_keywords = extract_technical_keywords(job_description)
+    
+    async def llm_keywords() -> List[str]:
+        try:
+            return await extract_llm_keywords(job_description)
+        except NimError as e:
+            if not fallback:
+                raise
+            print(f"Keyword extraction error, using local keywords only: {e}")
+            return []
+    
+    if mode == "llm":
+        return merge_keywords(await llm_keywords(), technical_keywords)
+    
+    from services.spacy_keywords import extract_spacy_keywords
+    
+    if mode == "spacy":
+        local_keywords = await asyncio.to_thread(extract_spacy_keywords, job_description)
+        return merge_keywords(local_keywords, technical_keywords)
+    
+    # Hybrid: the LLM call runs while spaCy does, and only enriches its result
+    llm_task = asyncio.create_task(llm_keywords())
+    try:
+        local_keywords = await asyncio.to_thread(extract_spacy_keywords, job_description)
+        return merge_keywords(local_keywords, technical_keywords, await llm_task)
+    finally:
+        llm_task.cancel()
+
+
+async def extract_llm_keywords(job_description: str) -> List[str]:
     """
     Extract important keywords from job description using AI
     """
@@ -71,35 +250,46 @@ async def extract_keywords(job_description: str) -> List[str]:
 Return ONLY a comma-separated list of keywords, nothing else.
 
 Job Description:
-{job_description[:2000]}
+{keywords_jd_context(job_description)}
 
 Keywords:"""
 
-    response = await generate_text(prompt, max_tokens=300, temperature=0.3)
+    response = await generate_text(prompt, max_tokens=max_tokens_for("keywords"), temperature=0.3, task="keywords")
     
     # Parse keywords from response
     keywords = [k.strip() for k in response.split(',')]
-    keywords = [k for k in keywords if k and len(k) > 1]
-    
-    # Add common technical keywords extraction as fallback
-    technical_patterns = [
-        r'\b(Python|JavaScript|React|Node\.js|AWS|Docker|SQL|Git)\b',
-        r'\b(Machine Learning|Data Analysis|API|REST|MongoDB)\b',
-        r'\b(Agile|Scrum|CI/CD|DevOps|Cloud)\b'
-    ]
-    
-    for pattern in technical_patterns:
-        matches = re.findall(pattern, job_description, re.IGNORECASE)
-        keywords.extend(matches)
-    
-    # Deduplicate while preserving order
+    return [k for k in keywords if k and len(k) > 1]
+
+
+TECHNICAL_KEYWORD_PATTERNS = [
+    re.compile(r'\b(Python|JavaScript|React|Node\.js|AWS|Docker|SQL|Git)\b', re.IGNORECASE),
+    re.compile(r'\b(Machine Learning|Data Analysis|API|REST|MongoDB)\b', re.IGNORECASE),
+    re.compile(r'\b(Agile|Scrum|CI/CD|DevOps|Cloud)\b', re.IGNORECASE)
+]
+
+
+def extract_technical_keywords(job_description: str) -> List[str]:
+    """
+    Extract common technical keywords with regexes (no LLM call)
+    """
+    keywords = []
+    for pattern in TECHNICAL_KEYWORD_PATTERNS:
+        keywords.extend(pattern.findall(job_description))
+    return keywords
+
+
+def merge_keywords(*keyword_lists: List[str]) -> List[str]:
+    """
+    Deduplicate keywords case-insensitively, preserving order
+    """
     seen = set()
     unique_keywords = []
-    for k in keywords:
-        k_lower = k.lower()
-        if k_lower not in seen:
-            seen.add(k_lower)
-            unique_keywords.append(k)
+    for keywords in keyword_lists:
+        for k in keywords:
+            k_lower = k.lower()
+            if k_lower not in seen:
+                seen.add(k_lower)
+                unique_keywords.append(k)
     
     return unique_keywords[:30]  # Limit to top 30
 
@@ -111,10 +301,14 @@ def analyze_format(resume_text: str) -> List[str]:
     issues = []
     
     # Check for common issues
-    if not re.search(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}', resume_text):
+    with span("format_email_regex"):
+        has_email = re.search(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}', resume_text)
+    if not has_email:
         issues.append("No email address detected")
     
-    if not re.search(r'\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}', resume_text):
+    with span("format_phone_regex"):
+        has_phone = re.search(r'\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}', resume_text)
+    if not has_phone:
         issues.append("No phone number detected")
     
     if len(resume_text) < 500:
@@ -126,12 +320,15 @@ def analyze_format(resume_text: str) -> List[str]:
     # Check for action verbs
     action_verbs = ['led', 'managed', 'developed', 'created', 'implemented', 
                     'achieved', 'improved', 'designed', 'built', 'delivered']
-    has_action_verbs = any(verb in resume_text.lower() for verb in action_verbs)
+    with span("format_action_verbs"):
+        has_action_verbs = any(verb in resume_text.lower() for verb in action_verbs)
     if not has_action_verbs:
         issues.append("Consider using more action verbs (led, managed, developed, etc.)")
     
     # Check for quantifiable achievements
-    if not re.search(r'\d+%|\$\d+|\d+\+', resume_text):
+    with span("format_metrics_regex"):
+        has_metrics = re.search(r'\d+%|\$\d+|\d+\+', resume_text)
+    if not has_metrics:
         issues.append("Add quantifiable achievements (percentages, dollar amounts, numbers)")
     
     return issues
@@ -140,25 +337,27 @@ def analyze_format(resume_text: str) -> List[str]:
 async def generate_suggestions(
     resume_text: str,
     job_description: str,
-    missing_keywords: List[str]
+    missing_keywords: List[str],
+    sections: Optional[Dict[str, str]] = None
 ) -> List[Dict[str, Any]]:
     """
-    Generate improvement suggestions using AI
+    Generate improvement suggestions using AI.
+    With sections, the prompt carries the most relevant ones within the
+    token budget instead of the start of the raw text.
     """
-    import json
     suggestions = []
     
     if missing_keywords:
         prompt = f"""You are an expert ATS resume optimizer. 
 
 RESUME:
-{resume_text[:2000]}
+{build_resume_context(sections, resume_text, task="suggestions")}
 
 MISSING KEYWORDS that should be incorporated:
 {', '.join(missing_keywords[:10])}
 
 JOB DESCRIPTION:
-{job_description[:1000]}
+{build_jd_context(job_description)}
 
 Generate 5 specific, actionable suggestions to improve this resume's ATS score.
 
@@ -176,7 +375,9 @@ Example format:
 
 Return only the Python list, nothing else:"""
 
-        response = await generate_text(prompt, max_tokens=1500, temperature=0.7)
+        response = await generate_text(
+            prompt, max_tokens=max_tokens_for("suggestions"), temperature=0.7, task="suggestions"
+        )
         
         # Try to parse as Python/JSON list
         try:
@@ -227,6 +428,121 @@ Return only the Python list, nothing else:"""
     return suggestions
 
 
+def section_hashes(sections: Dict[str, str]) -> Dict[str, str]:
+    """Content hash of every non-empty section the suggestions prompt can see"""
+    return {
+        name: hashlib.sha256(content.strip().encode("utf-8")).hexdigest()
+        for name, content in sections.items()
+        # Contact details never reach the prompt, so editing them reuses everything
+        if name != "contact" and content and content.strip()
+    }
+
+
+def _suggestion_section(suggestion: Dict[str, Any], names: List[str]) -> Optional[str]:
+    """Map a suggestion's free-form section label ("Technical Skills") to a section key"""
+    label = suggestion.get("section", "").lower()
+    for name in names:
+        if name in label:
+            return name
+    return None
+
+
+def _tag_keywords(suggestions: List[Dict[str, Any]], missing_keywords: List[str]) -> List[Dict[str, Any]]:
+    """Record which of the missing keywords each suggestion adds, for checking on reuse"""
+    return [
+        {**suggestion, "keywords": [
+            keyword for keyword in missing_keywords
+            if keyword.lower() in suggestion.get("suggested", "").lower()
+        ]}
+        for suggestion in suggestions
+    ]
+
+
+def _still_relevant(suggestion: Dict[str, Any], missing: set) -> bool:
+    """A cached suggestion that only added keywords the resume now has is stale"""
+    keywords = suggestion.get("keywords")
+    return not keywords or any(keyword.lower() in missing for keyword in keywords)
+
+
+async def generate_section_suggestions(
+    resume_text: str,
+    job_description: str,
+    missing_keywords: List[str],
+    sections: Dict[str, str]
+) -> List[Dict[str, Any]]:
+    """
+    Suggestions with per-section caching, for the edit-analyze loop.
+    Suggestions are cached per (job description, section, section hash).
+    Sections whose content is unchanged reuse their cached suggestions,
+    minus those whose keywords are no longer missing;
+    only the changed sections are sent to the LLM, and when every section
+    changed (or nothing is cached yet) all of them are.
+    Suggestions not tied to one section are only reused while every
+    section is unchanged.
+    """
+    cache = get_llm_cache()
+    hashes = section_hashes(sections)
+    if cache is None or not hashes:
+        return await generate_suggestions(resume_text, job_description, missing_keywords, sections)
+    
+    jd_hash = hashlib.sha256(job_description.encode("utf-8")).hexdigest()
+    all_sections_hash = hashlib.sha256(json.dumps(sorted(hashes.items())).encode("utf-8")).hexdigest()
+    
+    def cache_key(name: str, content_hash: str) -> str:
+        payload = json.dumps(["section-suggestions", jd_hash, name, content_hash])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    
+    keys = {name: cache_key(name, content_hash) for name, content_hash in hashes.items()}
+    general_key = cache_key("", all_sections_hash)
+    
+    cached: Dict[str, List[Dict[str, Any]]] = {}
+    for name, key in keys.items():
+        value = await cache.aget(key)
+        if value is not None:
+            cached[name] = json.loads(value)
+    general_value = await cache.aget(general_key)
+    general = json.loads(general_value) if general_value is not None else []
+    
+    changed = [name for name in hashes if name not in cached]
+    if changed:
+        scoped = sections if len(changed) == len(hashes) else {name: sections[name] for name in changed}
+        fresh = _tag_keywords(
+            await generate_suggestions(resume_text, job_description, missing_keywords, scoped),
+            missing_keywords
+        )
+        
+        buckets: Dict[str, List[Dict[str, Any]]] = {name: [] for name in changed}
+        new_general = []
+        for suggestion in fresh:
+            name = _suggestion_section(suggestion, changed)
+            if name is None:
+                new_general.append(suggestion)
+            else:
+                buckets[name].append(suggestion)
+        
+        # An empty result may be a failed call; never cache it for the whole TTL
+        if fresh:
+            for name, bucket in buckets.items():
+                await cache.aset(keys[name], json.dumps(bucket))
+            await cache.aset(general_key, json.dumps(new_general))
+        cached.update(buckets)
+        general = new_general
+    
+    missing = {keyword.lower() for keyword in missing_keywords}
+    merged = []
+    seen = set()
+    for suggestion in [s for name in hashes for s in cached.get(name, [])] + general:
+        if not _still_relevant(suggestion, missing):
+            continue
+        # A scoped call may repeat advice already cached for another section
+        key = suggestion.get("suggested", "").strip().lower()
+        if key not in seen:
+            seen.add(key)
+            merged.append({k: v for k, v in suggestion.items() if k != "keywords"})
+    merged.sort(key=lambda suggestion: suggestion.get("impact_score", 0), reverse=True)
+    return merged[:5]
+
+
 def extract_field(text: str, field_name: str) -> str:
     """Helper to extract a field value from text"""
     pattern = rf"{field_name}:\s*(.+?)(?=\n[A-Za-z_]+:|$)"
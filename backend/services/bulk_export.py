@@ -0,0 +1,263 @@
+"""
+Resume Reactor - Bulk Export
+Background jobs that render many resumes and stream them back as one ZIP
+"""
+import asyncio
+import json
+import os
+import re
+import time
+import uuid
+import zipfile
+from typing import Dict, Any, Iterator, List, Optional
+
+from config import (
+    BULK_EXPORT_DIR, BULK_EXPORT_CONCURRENCY, BULK_EXPORT_CHUNK_SIZE
+)
+from services.export_service import export_resume
+from services.resume_store import get_resume_store
+
+
+class BulkExportJob:
+    """
+    One bulk export: renders every (resume, format) pair to a file in
+    BULK_EXPORT_DIR and tracks progress. The job's record is kept in the
+    resume store, so any worker can report progress and serve the
+    download; only the worker that created it runs it.
+    """
+
+    def __init__(self, resume_ids: List[str], formats: List[str]):
+        self.job_id = uuid.uuid4().hex
+        self.items = [(resume_id, fmt) for resume_id in resume_ids for fmt in formats]
+        self.status = "running"
+        self.completed = 0
+        self.errors: List[Dict[str, str]] = []
+        self.files: List[Dict[str, Any]] = []
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+        self.task: Optional[asyncio.Task] = None
+        self._save_lock = asyncio.Lock()
+
+    def progress(self) -> Dict[str, Any]:
+        """Public status of the job"""
+        return {
+            "job_id": self.job_id,
+            "status": self.status,
+            "total": len(self.items),
+            "completed": self.completed,
+            "failed": len(self.errors),
+            "errors": self.errors
+        }
+
+    def to_record(self) -> Dict[str, Any]:
+        """The job's state as stored in the resume store"""
+        return {
+            **self.progress(),
+            "items": self.items,
+            "files": self.files,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at
+        }
+
+    @classmethod
+    def from_record(cls, record: Dict[str, Any]) -> "BulkExportJob":
+        job = cls.__new__(cls)
+        job.job_id = record["job_id"]
+        job.items = [tuple(item) for item in record["items"]]
+        job.status = record["status"]
+        job.completed = record["completed"]
+        job.errors = record["errors"]
+        job.files = record["files"]
+        job.created_at = record["created_at"]
+        job.finished_at = record["finished_at"]
+        job.task = None
+        return job
+
+    async def save(self):
+        """Write the current state to the store; writes land in order"""
+        async with self._save_lock:
+            await get_resume_store().aput_export_job(self.job_id, self.to_record())
+
+    def missing_files(self) -> List[str]:
+        """Rendered files that are no longer on disk"""
+        return [entry["path"] for entry in self.files if not os.path.exists(entry["path"])]
+
+    def remove_files(self):
+        """Delete the rendered files"""
+        _remove_files(self.files)
+        self.files = []
+
+
+def _remove_files(files: List[Dict[str, Any]]):
+    for entry in files:
+        try:
+            os.remove(entry["path"])
+        except OSError:
+            pass
+
+
+def _archive_name(filename: str, resume_id: str, fmt: str) -> str:
+    """Readable, collision-free name for a file inside the ZIP"""
+    stem = os.path.splitext(os.path.basename(filename or "resume"))[0]
+    stem = re.sub(r'[^A-Za-z0-9._-]+', '_', stem).strip('._') or "resume"
+    return f"{stem}_{resume_id[:8]}_optimized.{fmt}"
+
+
+class _ZipStream:
+    """Unseekable sink for zipfile that hands written bytes to the caller"""
+
+    def __init__(self):
+        self._buffer = bytearray()
+
+    def write(self, data: bytes) -> int:
+        self._buffer += data
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data = bytes(self._buffer)
+        self._buffer.clear()
+        return data
+
+
+def stream_zip(job: BulkExportJob, chunk_size: int = BULK_EXPORT_CHUNK_SIZE) -> Iterator[bytes]:
+    """
+    Assemble the job's ZIP while it is being sent. Files are copied in
+    chunks and each chunk is yielded as soon as zipfile writes it, so
+    memory stays at about one chunk regardless of archive size.
+    Members are stored uncompressed: DOCX and PDF are compressed already.
+    """
+    sink = _ZipStream()
+    with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_STORED) as archive:
+        for entry in job.files:
+            with open(entry["path"], "rb") as source, archive.open(entry["name"], "w") as member:
+                while True:
+                    chunk = source.read(chunk_size)
+                    if not chunk:
+                        break
+                    member.write(chunk)
+                    yield sink.drain()
+            yield sink.drain()
+        if job.errors:
+            archive.writestr("errors.json", json.dumps(job.errors, indent=2))
+    yield sink.drain()
+
+
+class BulkExportManager:
+    """
+    Runs bulk export jobs in the background. Renders go through the export
+    service's thread pool, at most `concurrency` at a time per job. Jobs
+    and their files are dropped once their store record expires,
+    BULK_EXPORT_JOB_TTL_SECONDS after the last progress update.
+    """
+
+    def __init__(self, concurrency: int, directory: str = BULK_EXPORT_DIR):
+        self.concurrency = max(1, concurrency)
+        self.directory = directory
+        # Jobs running in this process
+        self._jobs: Dict[str, BulkExportJob] = {}
+
+    async def submit(self, resume_ids: List[str], formats: List[str]) -> BulkExportJob:
+        """Start a job and return it immediately"""
+        await self.prune()
+        os.makedirs(self.directory, exist_ok=True)
+        job = BulkExportJob(list(dict.fromkeys(resume_ids)), list(dict.fromkeys(formats)))
+        await job.save()
+        self._jobs[job.job_id] = job
+        job.task = asyncio.create_task(self._run(job))
+        job.task.add_done_callback(lambda _: self._jobs.pop(job.job_id, None))
+        return job
+
+    async def get(self, job_id: str) -> Optional[BulkExportJob]:
+        """Look up a job that has not expired, whichever worker runs it"""
+        await self.prune()
+        local = self._jobs.get(job_id)
+        if local is not None:
+            return local
+        record = await get_resume_store().aget_export_job(job_id)
+        return BulkExportJob.from_record(record) if record is not None else None
+
+    async def prune(self):
+        """Forget expired jobs and delete their files"""
+        for record in await get_resume_store().apop_expired_export_jobs():
+            await asyncio.to_thread(_remove_files, record["files"])
+
+    async def close(self):
+        """Cancel the jobs running here; cancelled jobs delete their own files"""
+        jobs = list(self._jobs.values())
+        for job in jobs:
+            job.task.cancel()
+        for job in jobs:
+            try:
+                await job.task
+            except asyncio.CancelledError:
+                pass
+        self._jobs.clear()
+
+    async def _run(self, job: BulkExportJob):
+        semaphore = asyncio.Semaphore(self.concurrency)
+        store = get_resume_store()
+
+        async def render_one(index: int, resume_id: str, fmt: str):
+            async with semaphore:
+                resume_data = await store.aget_resume(resume_id)
+                if resume_data is None:
+                    job.errors.append({"resume_id": resume_id, "format": fmt, "error": "Resume not found"})
+                    await job.save()
+                    return
+                path = os.path.join(self.directory, f"bulk_{job.job_id}_{index}.{fmt}")
+                try:
+                    _, content = await export_resume(resume_data, fmt)
+                    await asyncio.to_thread(_write_file, path, content)
+                except Exception as e:
+                    print(f"Bulk export error for {resume_id} ({fmt}): {e}")
+                    job.errors.append({"resume_id": resume_id, "format": fmt, "error": str(e)})
+                    await job.save()
+                    return
+                job.files.append({
+                    "index": index,
+                    "path": path,
+                    "name": _archive_name(resume_data.get("filename", ""), resume_id, fmt)
+                })
+                job.completed += 1
+                await job.save()
+
+        try:
+            await asyncio.gather(*(
+                render_one(index, resume_id, fmt)
+                for index, (resume_id, fmt) in enumerate(job.items)
+            ))
+            # Archive members follow the submitted order, not completion order
+            job.files.sort(key=lambda entry: entry["index"])
+            job.status = "done" if job.files else "failed"
+        except asyncio.CancelledError:
+            job.status = "cancelled"
+            job.remove_files()
+            raise
+        except Exception as e:
+            print(f"Bulk export job {job.job_id} failed: {e}")
+            job.status = "failed"
+        finally:
+            job.finished_at = time.time()
+            try:
+                await job.save()
+            except Exception as e:
+                print(f"Bulk export job {job.job_id} could not be saved: {e}")
+
+
+def _write_file(path: str, content: bytes):
+    with open(path, "wb") as f:
+        f.write(content)
+
+
+_manager: Optional[BulkExportManager] = None
+
+
+def get_bulk_export_manager() -> BulkExportManager:
+    """Get the process-wide bulk export manager"""
+    global _manager
+    if _manager is None:
+        _manager = BulkExportManager(concurrency=BULK_EXPORT_CONCURRENCY)
+    return _manager
@@ -2,8 +2,15 @@
 Resume Reactor - Export Service
 Generates ATS-friendly DOCX and PDF outputs
 """
-import os
-from typing import Dict, Any
+import asyncio
+import contextvars
+import hashlib
+import io
+import json
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional, Tuple, Union, BinaryIO
 from docx import Document
 from docx.shared import Pt, Inches
 from docx.enum.text import WD_ALIGN_PARAGRAPH
@@ -12,44 +19,219 @@ from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
 from reportlab.lib.units import inch
 
-from config import TEMP_DIR
+from config import EXPORT_WORKERS, EXPORT_CACHE_MAX_MB
+from services.metrics import record_cache, time_stage
+from services.tracing import span
 
 
-async def export_resume(
-    resume_data: Dict[str, Any],
-    format: str
-) -> str:
+# Bump when the rendered layout changes so cached exports are not reused
+RENDER_VERSION = 1
+
+# Section order for ATS
+SECTION_ORDER = ["summary", "experience", "education", "skills", "projects", "certifications"]
+SECTION_TITLES = {
+    "summary": "PROFESSIONAL SUMMARY",
+    "experience": "PROFESSIONAL EXPERIENCE",
+    "education": "EDUCATION",
+    "skills": "SKILLS",
+    "projects": "PROJECTS",
+    "certifications": "CERTIFICATIONS"
+}
+
+MEDIA_TYPES = {
+    "docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    "pdf": "application/pdf"
+}
+
+
+class ExportTemplates:
     """
-    Export resume to specified format (docx or pdf)
+    Rendering assets built once per process: the reportlab paragraph
+    styles and a serialized DOCX with the page margins already applied
     """
-    resume_id = resume_data.get("file_path", "").split("\\")[-1].split(".")[0]
-    output_filename = f"{resume_id}_optimized.{format}"
-    output_path = os.path.join(TEMP_DIR, output_filename)
-    
-    parsed = resume_data.get("parsed", {})
-    sections = parsed.get("sections", {})
-    
-    if format == "docx":
-        create_docx(output_path, sections, parsed.get("text", ""))
-    else:
-        create_pdf(output_path, sections, parsed.get("text", ""))
+
+    def __init__(self):
+        styles = getSampleStyleSheet()
+        
+        self.header_style = ParagraphStyle(
+            'Header',
+            parent=styles['Heading2'],
+            fontSize=12,
+            spaceAfter=6,
+            spaceBefore=12,
+            textColor='#1a1a1a'
+        )
+        
+        self.body_style = ParagraphStyle(
+            'Body',
+            parent=styles['Normal'],
+            fontSize=10,
+            spaceAfter=3,
+            leading=14
+        )
+        
+        self.contact_style = ParagraphStyle(
+            'Contact',
+            parent=styles['Normal'],
+            fontSize=10,
+            alignment=1,  # Center
+            spaceAfter=12
+        )
+        
+        doc = Document()
+        # Set narrow margins for more content space
+        for section in doc.sections:
+            section.top_margin = Inches(0.5)
+            section.bottom_margin = Inches(0.5)
+            section.left_margin = Inches(0.75)
+            section.right_margin = Inches(0.75)
+        buffer = io.BytesIO()
+        doc.save(buffer)
+        self.docx_template = buffer.getvalue()
+
+    def new_document(self):
+        """A fresh DOCX document based on the template"""
+        return Document(io.BytesIO(self.docx_template))
+
+
+_templates: Optional[ExportTemplates] = None
+_templates_lock = threading.Lock()
+
+
+def get_export_templates() -> ExportTemplates:
+    """Get the process-wide export templates, building them on first use"""
+    global _templates
+    if _templates is None:
+        with _templates_lock:
+            if _templates is None:
+                _templates = ExportTemplates()
+    return _templates
+
+
+class ExportCache:
+    """
+    Byte-bounded LRU of rendered exports, keyed by a hash of the resume's
+    sections and the format. Edits change the sections and therefore the
+    key, so stale exports are never served; they just age out.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            content = self._entries.get(key)
+            if content is None:
+                self.misses += 1
+                record_cache("export", False)
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            record_cache("export", True)
+            return content
+
+    def set(self, key: str, content: bytes):
+        if len(content) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= len(previous)
+            self._entries[key] = content
+            self._bytes += len(content)
+            while self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted)
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and current size"""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self._entries),
+                "bytes": self._bytes
+            }
+
+
+_cache = ExportCache(EXPORT_CACHE_MAX_MB * 1024 * 1024)
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def get_export_cache() -> ExportCache:
+    """Get the process-wide export cache"""
+    return _cache
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=EXPORT_WORKERS, thread_name_prefix="export")
+    return _executor
+
+
+def shutdown_export_workers():
+    """Stop the render threads"""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+def export_key(sections: Dict[str, str], format: str) -> str:
+    """Content hash of the sections a render depends on"""
+    payload = json.dumps(
+        [RENDER_VERSION, format, sections],
+        sort_keys=True,
+        ensure_ascii=False
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def render_export(sections: Dict[str, str], format: str) -> bytes:
+    """Render sections to DOCX or PDF bytes"""
+    buffer = io.BytesIO()
+    with time_stage(f"export_render_{format}"):
+        if format == "docx":
+            create_docx(buffer, sections, "")
+        else:
+            create_pdf(buffer, sections, "")
+    return buffer.getvalue()
+
+
+async def export_resume(resume_data: Dict[str, Any], format: str) -> Tuple[str, bytes]:
+    """
+    Export resume to specified format (docx or pdf).
+    Returns the export's content hash (usable as an ETag) and its bytes;
+    unchanged resumes are served from cache, others render in a thread.
+    """
+    sections = resume_data.get("parsed", {}).get("sections", {})
+    with span("export", format=format) as export_span:
+        key = export_key(sections, format)
+        
+        content = _cache.get(key)
+        export_span.set(cached=content is not None)
+        if content is None:
+            loop = asyncio.get_running_loop()
+            # Executor threads do not inherit context; carry it so render spans nest here
+            context = contextvars.copy_context()
+            content = await loop.run_in_executor(_get_executor(), context.run, render_export, sections, format)
+            _cache.set(key, content)
     
-    return output_path
+    return key, content
 
 
-def create_docx(output_path: str, sections: Dict[str, str], full_text: str):
+def create_docx(output: Union[str, BinaryIO], sections: Dict[str, str], full_text: str):
     """
     Create ATS-friendly DOCX resume
     Simple formatting, no tables or graphics for maximum ATS compatibility
     """
-    doc = Document()
-    
-    # Set narrow margins for more content space
-    for section in doc.sections:
-        section.top_margin = Inches(0.5)
-        section.bottom_margin = Inches(0.5)
-        section.left_margin = Inches(0.75)
-        section.right_margin = Inches(0.75)
+    doc = get_export_templates().new_document()
     
     # Add contact section (usually at top)
     if sections.get("contact"):
@@ -59,23 +241,12 @@ def create_docx(output_path: str, sections: Dict[str, str], full_text: str):
             run = contact.add_run(line + '\n')
             run.font.size = Pt(10)
     
-    # Section order for ATS
-    section_order = ["summary", "experience", "education", "skills", "projects", "certifications"]
-    section_titles = {
-        "summary": "PROFESSIONAL SUMMARY",
-        "experience": "PROFESSIONAL EXPERIENCE",
-        "education": "EDUCATION",
-        "skills": "SKILLS",
-        "projects": "PROJECTS",
-        "certifications": "CERTIFICATIONS"
-    }
-    
-    for section_key in section_order:
+    for section_key in SECTION_ORDER:
         content = sections.get(section_key, "")
         if content:
             # Add section header
             header = doc.add_paragraph()
-            header_run = header.add_run(section_titles.get(section_key, section_key.upper()))
+            header_run = header.add_run(SECTION_TITLES.get(section_key, section_key.upper()))
             header_run.bold = True
             header_run.font.size = Pt(12)
             
@@ -88,15 +259,15 @@ def create_docx(output_path: str, sections: Dict[str, str], full_text: str):
                     run.font.size = Pt(10)
                     run.font.name = 'Calibri'
     
-    doc.save(output_path)
+    doc.save(output)
 
 
-def create_pdf(output_path: str, sections: Dict[str, str], full_text: str):
+def create_pdf(output: Union[str, BinaryIO], sections: Dict[str, str], full_text: str):
     """
     Create clean, readable PDF resume
     """
     doc = SimpleDocTemplate(
-        output_path,
+        output,
         pagesize=letter,
         rightMargin=0.75*inch,
         leftMargin=0.75*inch,
@@ -104,65 +275,27 @@ def create_pdf(output_path: str, sections: Dict[str, str], full_text: str):
         bottomMargin=0.5*inch
     )
     
-    styles = getSampleStyleSheet()
-    
-    # Custom styles
-    header_style = ParagraphStyle(
-        'Header',
-        parent=styles['Heading2'],
-        fontSize=12,
-        spaceAfter=6,
-        spaceBefore=12,
-        textColor='#1a1a1a'
-    )
-    
-    body_style = ParagraphStyle(
-        'Body',
-        parent=styles['Normal'],
-        fontSize=10,
-        spaceAfter=3,
-        leading=14
-    )
-    
-    contact_style = ParagraphStyle(
-        'Contact',
-        parent=styles['Normal'],
-        fontSize=10,
-        alignment=1,  # Center
-        spaceAfter=12
-    )
-    
+    templates = get_export_templates()
     story = []
     
     # Contact info
     if sections.get("contact"):
         contact_text = sections["contact"].replace('\n', '<br/>')
-        story.append(Paragraph(contact_text, contact_style))
+        story.append(Paragraph(contact_text, templates.contact_style))
         story.append(Spacer(1, 0.2*inch))
     
-    # Sections
-    section_order = ["summary", "experience", "education", "skills", "projects", "certifications"]
-    section_titles = {
-        "summary": "PROFESSIONAL SUMMARY",
-        "experience": "PROFESSIONAL EXPERIENCE",
-        "education": "EDUCATION",
-        "skills": "SKILLS",
-        "projects": "PROJECTS",
-        "certifications": "CERTIFICATIONS"
-    }
-    
-    for section_key in section_order:
+    for section_key in SECTION_ORDER:
         content = sections.get(section_key, "")
         if content:
             # Section header
-            story.append(Paragraph(section_titles.get(section_key, section_key.upper()), header_style))
+            story.append(Paragraph(SECTION_TITLES.get(section_key, section_key.upper()), templates.header_style))
             
             # Section content
             for line in content.split('\n'):
                 if line.strip():
                     # Escape special characters for reportlab
                     safe_line = line.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
-                    story.append(Paragraph(safe_line, body_style))
+                    story.append(Paragraph(safe_line, templates.body_style))
     
     doc.build(story)
 
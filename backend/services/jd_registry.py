@@ -0,0 +1,92 @@
+"""
+Resume Reactor - Job Description Registry
+Registers job descriptions once so their keywords are extracted a single time
+"""
+import hashlib
+import re
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional
+
+from config import JD_MATCHER_CACHE_SIZE
+from services.ats_analyzer import extract_keywords
+from services.keyword_matcher import KeywordMatcher
+from services.resume_store import get_resume_store
+
+
+# Matchers are rebuilt from stored keywords once per worker, for the most
+# recently used postings
+_matchers: "OrderedDict[str, KeywordMatcher]" = OrderedDict()
+
+
+def normalize_job_description(job_description: str) -> str:
+    """Collapse whitespace so trivially reformatted postings share an ID"""
+    return re.sub(r'\s+', ' ', job_description).strip()
+
+
+def make_jd_id(job_description: str) -> str:
+    """Derive a stable ID from the normalized job description"""
+    normalized = normalize_job_description(job_description)
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()[:32]
+
+
+def normalize_keywords(keywords: List[str]) -> List[str]:
+    """
+    Tidy extracted keywords: collapse whitespace, strip list punctuation
+    and drop case-insensitive duplicates while preserving order
+    """
+    seen = set()
+    normalized = []
+    for keyword in keywords:
+        keyword = re.sub(r'\s+', ' ', keyword).strip(" \t.;:-•*\"'")
+        if len(keyword) < 2:
+            continue
+        key = keyword.lower()
+        if key not in seen:
+            seen.add(key)
+            normalized.append(keyword)
+    return normalized
+
+
+async def register_job_description(
+    job_description: str,
+    keyword_mode: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Register a job description, extracting its keywords and matcher.
+    Registering the same posting again returns the existing entry, whatever
+    keyword_mode it is registered with.
+    """
+    jd_id = make_jd_id(job_description)
+    existing = await get_job_description(jd_id)
+    if existing is not None:
+        return existing
+
+    # A failed LLM call must not be registered as the posting's keyword list
+    keywords = normalize_keywords(await extract_keywords(job_description, keyword_mode, fallback=False))
+    await get_resume_store().aput_job_description(jd_id, {
+        "jd_id": jd_id,
+        "job_description": job_description,
+        "keywords": keywords
+    })
+    return await get_job_description(jd_id)
+
+
+async def get_job_description(jd_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Look up a registered job description, with its matcher attached
+    """
+    record = await get_resume_store().aget_job_description(jd_id)
+    if record is None:
+        return None
+    return {**record, "matcher": _get_matcher(jd_id, record["keywords"])}
+
+
+def _get_matcher(jd_id: str, keywords: List[str]) -> KeywordMatcher:
+    matcher = _matchers.get(jd_id)
+    if matcher is None:
+        matcher = KeywordMatcher(keywords)
+        _matchers[jd_id] = matcher
+        while len(_matchers) > JD_MATCHER_CACHE_SIZE:
+            _matchers.popitem(last=False)
+    _matchers.move_to_end(jd_id)
+    return matcher
@@ -0,0 +1,196 @@
+"""
+Resume Reactor - Keyword Matcher
+Matches a fixed job-description keyword list against resume text
+"""
+import re
+from bisect import bisect_right
+from collections import deque
+from functools import lru_cache
+from typing import Dict, List, Tuple, Iterable, Optional
+
+
+# Terms in a group are interchangeable: a JD asking for any one of them is
+# satisfied by a resume mentioning any other
+SYNONYM_GROUPS: List[List[str]] = [
+    ["javascript", "js", "ecmascript"],
+    ["typescript", "ts"],
+    ["kubernetes", "k8s"],
+    ["postgresql", "postgres"],
+    ["node.js", "nodejs", "node js"],
+    ["react", "react.js", "reactjs"],
+    ["machine learning", "ml"],
+    ["artificial intelligence", "ai"],
+    ["natural language processing", "nlp"],
+    ["ci/cd", "cicd", "continuous integration"],
+    ["amazon web services", "aws"],
+    ["google cloud platform", "gcp", "google cloud"],
+    ["microsoft azure", "azure"],
+    ["golang", "go"],
+    ["c#", "csharp", "c sharp"],
+    ["user experience", "ux"],
+    ["search engine optimization", "seo"],
+]
+
+_WHITESPACE_RE = re.compile(r'\s+')
+_WHITESPACE_RUN_RE = re.compile(r'\s{2,}')
+
+
+def _normalize_term(term: str) -> str:
+    return _WHITESPACE_RE.sub(' ', term.lower()).strip()
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == '_'
+
+
+class KeywordMatcher:
+    """
+    Aho-Corasick automaton over a job description's keywords and their
+    synonyms. Built once per keyword list (cache it per JD) and then finds
+    every keyword in a single linear pass over the resume.
+
+    Matching is case-insensitive, treats any whitespace run as one space,
+    and only accepts hits on token boundaries, so "Go" does not match
+    "Google" and "R" does not match every word containing an r.
+    """
+
+    def __init__(
+        self,
+        keywords: List[str],
+        synonym_groups: Optional[Iterable[Iterable[str]]] = None
+    ):
+        self.keywords = list(keywords)
+
+        synonyms: Dict[str, set] = {}
+        for group in SYNONYM_GROUPS if synonym_groups is None else synonym_groups:
+            terms = {_normalize_term(t) for t in group}
+            for term in terms:
+                synonyms.setdefault(term, set()).update(terms)
+
+        # term -> indices of the keywords it satisfies
+        term_keywords: Dict[str, List[int]] = {}
+        for index, keyword in enumerate(self.keywords):
+            term = _normalize_term(keyword)
+            if not term:
+                continue
+            for variant in synonyms.get(term, {term}):
+                owners = term_keywords.setdefault(variant, [])
+                if index not in owners:
+                    owners.append(index)
+
+        self._build(term_keywords)
+
+    def _build(self, term_keywords: Dict[str, List[int]]):
+        """Build the goto trie, failure links and merged outputs"""
+        goto: List[Dict[str, int]] = [{}]
+        outputs: List[List[Tuple[int, List[int]]]] = [[]]
+
+        for term, owners in term_keywords.items():
+            state = 0
+            for ch in term:
+                next_state = goto[state].get(ch)
+                if next_state is None:
+                    next_state = len(goto)
+                    goto[state][ch] = next_state
+                    goto.append({})
+                    outputs.append([])
+                state = next_state
+            outputs[state].append((len(term), owners))
+
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, next_state in goto[state].items():
+                queue.append(next_state)
+                fallback = fail[state]
+                while fallback and ch not in goto[fallback]:
+                    fallback = fail[fallback]
+                fail[next_state] = goto[fallback].get(ch, 0)
+                outputs[next_state] = outputs[next_state] + outputs[fail[next_state]]
+
+        self._goto = goto
+        self._fail = fail
+        self._outputs = [tuple(out) for out in outputs]
+
+    @staticmethod
+    def _prepare(text: str) -> Tuple[str, List[int], List[int]]:
+        """
+        Lowercase and collapse whitespace, returning the normalized text and
+        the breakpoints needed to map its offsets back to the original
+        """
+        lowered = text.lower()
+        if len(lowered) != len(text):
+            # A few characters expand when lowercased; keep offsets aligned
+            lowered = ''.join(ch if len(ch.lower()) != 1 else ch.lower() for ch in text)
+
+        # After each run collapses to one space, later offsets shift left
+        breaks: List[int] = []
+        shifts: List[int] = []
+        shift = 0
+        for run in _WHITESPACE_RUN_RE.finditer(lowered):
+            breaks.append(run.start() - shift + 1)
+            shift += len(run.group()) - 1
+            shifts.append(shift)
+        return _WHITESPACE_RE.sub(' ', lowered), breaks, shifts
+
+    @staticmethod
+    def _to_original(position: int, breaks: List[int], shifts: List[int]) -> int:
+        index = bisect_right(breaks, position)
+        return position + (shifts[index - 1] if index else 0)
+
+    def scan(self, text: str) -> Dict[str, List[Tuple[int, int]]]:
+        """
+        Every keyword found in the text, with the (start, end) offsets of
+        each occurrence in the original text
+        """
+        normalized, breaks, shifts = self._prepare(text)
+        goto, fail, outputs = self._goto, self._fail, self._outputs
+        length = len(normalized)
+
+        hits: Dict[int, List[Tuple[int, int]]] = {}
+        state = 0
+        for end, ch in enumerate(normalized):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if not outputs[state]:
+                continue
+            for term_length, owners in outputs[state]:
+                start = end - term_length + 1
+                # Token boundaries, applied only where the term itself starts/ends with a word character
+                if _is_word_char(normalized[start]) and start > 0 and _is_word_char(normalized[start - 1]):
+                    continue
+                if _is_word_char(ch) and end + 1 < length and _is_word_char(normalized[end + 1]):
+                    continue
+                span = (
+                    self._to_original(start, breaks, shifts),
+                    self._to_original(end, breaks, shifts) + 1
+                )
+                for index in owners:
+                    hits.setdefault(index, []).append(span)
+
+        return {self.keywords[index]: hits[index] for index in sorted(hits)}
+
+    def counts(self, text: str) -> Dict[str, int]:
+        """Occurrence count for every keyword found in the text"""
+        return {keyword: len(spans) for keyword, spans in self.scan(text).items()}
+
+    def match(self, text: str) -> Tuple[List[str], List[str]]:
+        """
+        Split the keywords into those found in the text and those missing
+        """
+        found = self.scan(text)
+        matched = [k for k in self.keywords if k in found]
+        missing = [k for k in self.keywords if k not in found]
+        return matched, missing
+
+
+@lru_cache(maxsize=128)
+def _cached_matcher(keywords: Tuple[str, ...]) -> KeywordMatcher:
+    return KeywordMatcher(list(keywords))
+
+
+def get_keyword_matcher(keywords: List[str]) -> KeywordMatcher:
+    """Build a matcher for a keyword list, reusing one built for the same list"""
+    return _cached_matcher(tuple(keywords))
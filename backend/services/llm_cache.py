@@ -0,0 +1,269 @@
+"""
+Resume Reactor - LLM Response Cache
+Two-tier cache for NIM completions: an in-memory LRU in front of SQLite
+"""
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Dict, Any
+
+from config import (
+    LLM_CACHE_ENABLED, LLM_CACHE_PATH, LLM_CACHE_TTL_SECONDS,
+    LLM_CACHE_MEMORY_ENTRIES, LLM_CACHE_DISK_MAX_MB
+)
+from services.metrics import record_cache
+
+
+class LLMCache:
+    """
+    Completion cache keyed by the full request fingerprint.
+    Memory entries are evicted least-recently-used; disk entries are evicted
+    by last access once the store grows past its size limit.
+    A TTL of 0 disables expiry.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        ttl_seconds: int = 86400,
+        memory_entries: int = 512,
+        disk_max_bytes: int = 100 * 1024 * 1024
+    ):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.memory_entries = memory_entries
+        self.disk_max_bytes = disk_max_bytes
+
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._disk_bytes = 0
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(
+        model: str,
+        prompt: str,
+        system_prompt: str,
+        max_tokens: int,
+        temperature: float
+    ) -> str:
+        """Fingerprint a completion request"""
+        payload = json.dumps(
+            [model, prompt, system_prompt, max_tokens, temperature],
+            ensure_ascii=False
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _expiry(self, now: float) -> float:
+        return now + self.ttl_seconds if self.ttl_seconds > 0 else 0.0
+
+    @staticmethod
+    def _expired(expires_at: float, now: float) -> bool:
+        return bool(expires_at) and expires_at <= now
+
+    def _db(self) -> sqlite3.Connection:
+        """Open the disk store on first use (caller holds the lock)"""
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=10)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS llm_cache (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    expires_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )"""
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_llm_cache_accessed ON llm_cache(accessed_at)"
+            )
+            self._conn.commit()
+            self._disk_bytes = self._conn.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM llm_cache"
+            ).fetchone()[0]
+        return self._conn
+
+    def _memory_get(self, key: str, now: float) -> Optional[str]:
+        entry = self._memory.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if self._expired(expires_at, now):
+            del self._memory[key]
+            return None
+        self._memory.move_to_end(key)
+        return value
+
+    def _memory_set(self, key: str, value: str, expires_at: float):
+        self._memory[key] = (expires_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+            self.evictions += 1
+
+    def _disk_get(self, key: str, now: float) -> Optional[tuple]:
+        db = self._db()
+        row = db.execute(
+            "SELECT value, expires_at FROM llm_cache WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        value, expires_at = row
+        if self._expired(expires_at, now):
+            db.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+            db.commit()
+            return None
+        db.execute("UPDATE llm_cache SET accessed_at = ? WHERE key = ?", (now, key))
+        db.commit()
+        return value, expires_at
+
+    def _disk_set(self, key: str, value: str, expires_at: float, now: float):
+        db = self._db()
+        size = len(value.encode("utf-8"))
+        # A replaced entry's bytes no longer count
+        replaced = db.execute("SELECT size FROM llm_cache WHERE key = ?", (key,)).fetchone()
+        db.execute(
+            "INSERT OR REPLACE INTO llm_cache (key, value, size, expires_at, accessed_at) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (key, value, size, expires_at, now)
+        )
+        db.commit()
+        self._disk_bytes += size - (replaced[0] if replaced else 0)
+        if self._disk_bytes > self.disk_max_bytes:
+            self._evict_disk(now)
+
+    def _evict_disk(self, now: float):
+        """Drop expired rows, then least recently used rows until under the limit"""
+        db = self._db()
+        db.execute("DELETE FROM llm_cache WHERE expires_at > 0 AND expires_at <= ?", (now,))
+        # Other workers share the file, so recount rather than trust the running total
+        self._disk_bytes = db.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM llm_cache"
+        ).fetchone()[0]
+        while self._disk_bytes > self.disk_max_bytes:
+            rows = db.execute(
+                "SELECT key, size FROM llm_cache ORDER BY accessed_at LIMIT 64"
+            ).fetchall()
+            if not rows:
+                break
+            for key, size in rows:
+                db.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                self._disk_bytes -= size
+                self.evictions += 1
+                if self._disk_bytes <= self.disk_max_bytes:
+                    break
+        db.commit()
+
+    def get(self, key: str) -> Optional[str]:
+        """Look up a cached completion, promoting disk hits into memory"""
+        now = time.time()
+        with self._lock:
+            value = self._memory_get(key, now)
+            if value is not None:
+                self.memory_hits += 1
+                record_cache("llm", True)
+                return value
+            try:
+                row = self._disk_get(key, now)
+            except sqlite3.Error as e:
+                print(f"LLM cache read error: {e}")
+                row = None
+            if row is None:
+                self.misses += 1
+                record_cache("llm", False)
+                return None
+            value, expires_at = row
+            self._memory_set(key, value, expires_at)
+            self.disk_hits += 1
+            record_cache("llm", True)
+            return value
+
+    def set(self, key: str, value: str):
+        """Store a completion in both tiers"""
+        now = time.time()
+        expires_at = self._expiry(now)
+        with self._lock:
+            self._memory_set(key, value, expires_at)
+            self.stores += 1
+            try:
+                self._disk_set(key, value, expires_at, now)
+            except sqlite3.Error as e:
+                print(f"LLM cache write error: {e}")
+
+    async def aget(self, key: str) -> Optional[str]:
+        """Async lookup; memory hits return inline, disk lookups run in a thread"""
+        with self._lock:
+            value = self._memory_get(key, time.time())
+            if value is not None:
+                self.memory_hits += 1
+                record_cache("llm", True)
+                return value
+        return await asyncio.to_thread(self.get, key)
+
+    async def aset(self, key: str, value: str):
+        """Async store"""
+        await asyncio.to_thread(self.set, key, value)
+
+    def clear(self):
+        """Remove every cached entry from both tiers"""
+        with self._lock:
+            self._memory.clear()
+            db = self._db()
+            db.execute("DELETE FROM llm_cache")
+            db.commit()
+            self._disk_bytes = 0
+
+    def close(self):
+        """Close the disk store"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and tier sizes"""
+        hits = self.memory_hits + self.disk_hits
+        lookups = hits + self.misses
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_ratio": round(hits / lookups, 4) if lookups else 0.0,
+            "stores": self.stores,
+            "evictions": self.evictions,
+            "memory_entries": len(self._memory),
+            "disk_bytes": self._disk_bytes
+        }
+
+
+_cache: Optional[LLMCache] = None
+
+
+def get_llm_cache() -> Optional[LLMCache]:
+    """Get the process-wide LLM cache, or None when caching is disabled"""
+    global _cache
+    if not LLM_CACHE_ENABLED:
+        return None
+    if _cache is None:
+        _cache = LLMCache(
+            path=LLM_CACHE_PATH,
+            ttl_seconds=LLM_CACHE_TTL_SECONDS,
+            memory_entries=LLM_CACHE_MEMORY_ENTRIES,
+            disk_max_bytes=LLM_CACHE_DISK_MAX_MB * 1024 * 1024
+        )
+    return _cache
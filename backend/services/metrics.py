@@ -0,0 +1,248 @@
+"""
+Resume Reactor - Metrics
+Prometheus counters, gauges and histograms shared by every worker process
+"""
+import os
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, generate_latest
+)
+from prometheus_client.core import GaugeMetricFamily
+from prometheus_client.multiprocess import MultiProcessCollector, mark_process_dead
+
+from services.tracing import current_span, span
+
+# prometheus_client decides this when first imported: with the variable set
+# (exported, or from .env through config) every server worker writes its
+# values to files there and /metrics sums them. Parse workers never write;
+# they send their observations back with each job's result.
+MULTIPROCESS = "PROMETHEUS_MULTIPROC_DIR" in os.environ
+
+
+# Responses add "; charset=utf-8" to text types themselves
+CONTENT_TYPE = CONTENT_TYPE_LATEST.replace("; charset=utf-8", "")
+
+# Seconds; spans a cached lookup up to a long completion or OCR'd document
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+# Application metrics
+
+STAGE_SECONDS = Histogram(
+    "resume_reactor_stage_seconds",
+    "Time spent in each processing stage",
+    ["stage"],
+    buckets=DEFAULT_BUCKETS
+)
+HTTP_REQUEST_SECONDS = Histogram(
+    "resume_reactor_http_request_seconds",
+    "HTTP request latency by route and status",
+    ["method", "route", "status"],
+    buckets=DEFAULT_BUCKETS
+)
+HTTP_IN_FLIGHT = Gauge(
+    "resume_reactor_http_requests_in_flight",
+    "HTTP requests being handled",
+    multiprocess_mode="livesum"
+)
+LLM_REQUEST_SECONDS = Histogram(
+    "resume_reactor_llm_request_seconds",
+    "NIM call latency by call type, including retries (whole stream for streaming calls)",
+    ["task", "outcome"],
+    buckets=DEFAULT_BUCKETS
+)
+LLM_IN_FLIGHT = Gauge(
+    "resume_reactor_llm_requests_in_flight",
+    "NIM calls in progress by call type",
+    ["task"],
+    multiprocess_mode="livesum"
+)
+LLM_TOKENS = Counter(
+    "resume_reactor_llm_tokens_total",
+    "NIM tokens by call type and kind (prompt or completion)",
+    ["task", "kind"]
+)
+CACHE_REQUESTS = Counter(
+    "resume_reactor_cache_requests_total",
+    "Cache lookups by cache and result (hit or miss)",
+    ["cache", "result"]
+)
+
+# Set by the components that own the state, whenever it changes
+NIM_QUEUE_DEPTH = Gauge(
+    "resume_reactor_nim_queue_depth",
+    "NIM calls waiting for a scheduler slot",
+    multiprocess_mode="livesum"
+)
+NIM_ACTIVE_REQUESTS = Gauge(
+    "resume_reactor_nim_active_requests",
+    "NIM calls holding a scheduler slot",
+    multiprocess_mode="livesum"
+)
+NIM_CIRCUIT_OPEN = Gauge(
+    "resume_reactor_nim_circuit_open",
+    "1 while a worker's NIM circuit breaker is open",
+    multiprocess_mode="livemax"
+)
+PARSE_JOBS_PENDING = Gauge(
+    "resume_reactor_parse_jobs_pending",
+    "Parse jobs running or queued in the worker pools",
+    multiprocess_mode="livesum"
+)
+
+
+class _MetricsCollector:
+    """
+    Every server worker's metrics (merged from the multiprocess directory,
+    or this process's own), plus the cache hit ratio derived from the
+    lookup counts
+    """
+
+    def __init__(self):
+        self._source = MultiProcessCollector(None) if MULTIPROCESS else REGISTRY
+
+    def collect(self):
+        lookups: Dict[str, List[float]] = {}
+        for family in self._source.collect():
+            if family.name == "resume_reactor_cache_requests":
+                for sample in family.samples:
+                    if sample.name.endswith("_total"):
+                        hits_lookups = lookups.setdefault(sample.labels["cache"], [0.0, 0.0])
+                        hits_lookups[1] += sample.value
+                        if sample.labels["result"] == "hit":
+                            hits_lookups[0] += sample.value
+            yield family
+
+        ratio = GaugeMetricFamily(
+            "resume_reactor_cache_hit_ratio",
+            "Share of cache lookups that hit, since start",
+            labels=["cache"]
+        )
+        for cache, (hits, total) in lookups.items():
+            if total:
+                ratio.add_metric([cache], hits / total)
+        yield ratio
+
+
+_registry = CollectorRegistry()
+_registry.register(_MetricsCollector())
+
+
+def render_metrics() -> bytes:
+    """Every server worker's metrics in Prometheus text exposition format"""
+    return generate_latest(_registry)
+
+
+def shutdown_metrics():
+    """Drop this process's live gauges, so they stop counting towards the totals"""
+    if MULTIPROCESS:
+        mark_process_dead(os.getpid())
+
+
+# Observations made in a parse worker, waiting to go back with the job's result
+_worker_buffer: Optional[List[Tuple[str, str, Any]]] = None
+
+
+def buffer_worker_metrics():
+    """
+    Called when a parse worker starts. Stage timings and cache lookups are
+    kept for drain_worker_metrics() instead of written, so recycled workers
+    leave nothing behind in the multiprocess directory.
+    """
+    global _worker_buffer
+    _worker_buffer = []
+    # A worker that imported this module fresh (spawn) created gauge files
+    shutdown_metrics()
+
+
+def drain_worker_metrics() -> List[Tuple[str, str, Any]]:
+    """The observations buffered since the last drain (none outside a parse worker)"""
+    global _worker_buffer
+    if _worker_buffer is None:
+        return []
+    observations, _worker_buffer = _worker_buffer, []
+    return observations
+
+
+def apply_worker_metrics(observations: List[Tuple[str, str, Any]]):
+    """Record observations drained in a parse worker"""
+    for kind, name, value in observations:
+        if kind == "stage":
+            observe_stage(name, value)
+        else:
+            record_cache(name, value)
+
+
+class _StageTimer:
+    """Times a stage into STAGE_SECONDS and, in a traced request, as a span"""
+
+    __slots__ = ("_stage", "_span", "_started")
+
+    def __init__(self, stage: str):
+        self._stage = stage
+        self._span = span(stage)
+
+    def __enter__(self):
+        self._span.__enter__()
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        observe_stage(self._stage, time.perf_counter() - self._started)
+        return self._span.__exit__(*exc_info)
+
+
+def time_stage(stage: str):
+    """Context manager timing one pipeline stage (and tracing it in a traced request)"""
+    if current_span() is None and _worker_buffer is None:
+        return STAGE_SECONDS.labels(stage).time()
+    return _StageTimer(stage)
+
+
+def observe_stage(stage: str, seconds: float):
+    """Record a stage duration measured elsewhere"""
+    if _worker_buffer is not None:
+        _worker_buffer.append(("stage", stage, seconds))
+        return
+    STAGE_SECONDS.labels(stage).observe(seconds)
+
+
+def record_cache(cache: str, hit: bool):
+    """Count one cache lookup"""
+    if _worker_buffer is not None:
+        _worker_buffer.append(("cache", cache, hit))
+        return
+    CACHE_REQUESTS.labels(cache, "hit" if hit else "miss").inc()
+
+
+async def timed_stage(stage: str, awaitable):
+    """Await something while timing it as a stage (e.g. the body of a task)"""
+    with time_stage(stage):
+        return await awaitable
+
+
+@contextmanager
+def track_llm_call(task: str) -> Iterator:
+    """Count a NIM call as in flight and record its latency and outcome; yields its trace span"""
+    started = time.perf_counter()
+    outcome = "cancelled"
+    LLM_IN_FLIGHT.labels(task).inc()
+    try:
+        with span("llm", task=task) as call_span:
+            yield call_span
+        outcome = "success"
+    except Exception:
+        outcome = "error"
+        raise
+    finally:
+        LLM_IN_FLIGHT.labels(task).dec()
+        LLM_REQUEST_SECONDS.labels(task, outcome).observe(time.perf_counter() - started)
+
+
+def record_llm_tokens(task: str, prompt_tokens: int, completion_tokens: int):
+    """Count the tokens one NIM call used"""
+    LLM_TOKENS.labels(task, "prompt").inc(prompt_tokens)
+    LLM_TOKENS.labels(task, "completion").inc(completion_tokens)
@@ -0,0 +1,288 @@
+"""
+Resume Reactor - NIM Resilience
+Deadlines, retries, hedged requests and a circuit breaker for NIM calls
+"""
+import asyncio
+import math
+import random
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, TypeVar
+
+import httpx
+import openai
+
+from config import (
+    NIM_CALL_TIMEOUT_SECONDS, NIM_DEADLINE_SECONDS, NIM_MAX_RETRIES,
+    NIM_RETRY_BASE_DELAY, NIM_RETRY_MAX_DELAY, NIM_HEDGE_ENABLED, NIM_HEDGE_PERCENTILE,
+    NIM_HEDGE_MIN_DELAY_MS, NIM_BREAKER_FAILURES, NIM_BREAKER_RESET_SECONDS
+)
+from services.metrics import NIM_CIRCUIT_OPEN
+from services.nim_scheduler import SchedulerRejected, get_nim_scheduler
+from services.tracing import span
+
+
+T = TypeVar("T")
+
+# Latency samples needed before hedging is considered for a call type
+_MIN_HEDGE_SAMPLES = 20
+
+
+class NimError(Exception):
+    """A NIM call that failed; carries the HTTP status and Retry-After to answer with"""
+
+    status_code = 502
+    retryable = False
+
+    def __init__(self, message: str, retry_after: Optional[int] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class NimTimeout(NimError):
+    """An attempt exceeded its timeout, or the call its deadline"""
+
+    status_code = 504
+    retryable = True
+
+
+class NimRateLimited(NimError):
+    """NIM answered 429"""
+
+    status_code = 503
+    retryable = True
+
+
+class NimUpstreamError(NimError):
+    """Connection failure or 5xx from NIM"""
+
+    status_code = 502
+    retryable = True
+
+
+class NimRequestError(NimError):
+    """NIM refused the request itself (auth, validation); retrying cannot help"""
+
+    status_code = 502
+
+
+class NimUnavailable(NimError):
+    """The circuit breaker is open, so the call was not attempted"""
+
+    status_code = 503
+
+
+def _retry_after_header(error: openai.APIStatusError) -> Optional[int]:
+    try:
+        return max(1, math.ceil(float(error.response.headers.get("retry-after", ""))))
+    except (TypeError, ValueError):
+        return None
+
+
+def classify_error(error: BaseException) -> NimError:
+    """Map an exception from the OpenAI client or the transport to a NimError"""
+    if isinstance(error, NimError):
+        return error
+    if isinstance(error, (asyncio.TimeoutError, openai.APITimeoutError, httpx.TimeoutException)):
+        return NimTimeout("NIM request timed out")
+    if isinstance(error, openai.RateLimitError):
+        return NimRateLimited("NIM rate limit exceeded", _retry_after_header(error))
+    if isinstance(error, openai.APIStatusError):
+        if error.status_code >= 500 or error.status_code in (408, 409):
+            return NimUpstreamError(f"NIM returned {error.status_code}")
+        return NimRequestError(f"NIM rejected the request ({error.status_code}): {error.message}")
+    if isinstance(error, (openai.APIConnectionError, httpx.TransportError)):
+        return NimUpstreamError(f"Could not reach NIM: {error}")
+    return NimError(f"NIM call failed: {error}")
+
+
+class CircuitBreaker:
+    """
+    Opens after `failure_threshold` consecutive retryable failures and then
+    fails calls immediately for `reset_seconds`. After that one probe call
+    is let through (half-open): success closes the breaker, failure opens
+    it again. A threshold of 0 disables the breaker.
+    """
+
+    def __init__(self, failure_threshold: int, reset_seconds: float):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.state = "closed"
+        self.failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._stats = {"opened": 0, "rejected": 0}
+
+    def before_call(self):
+        """Raise NimUnavailable unless a call may go out now"""
+        if self.failure_threshold <= 0 or self.state == "closed":
+            return
+        if self.state == "open":
+            remaining = self._opened_at + self.reset_seconds - time.monotonic()
+            if remaining > 0:
+                self._stats["rejected"] += 1
+                raise NimUnavailable("NIM is unavailable (circuit open)", max(1, math.ceil(remaining)))
+            self.state = "half_open"
+            NIM_CIRCUIT_OPEN.set(0)
+        if self._probing:
+            self._stats["rejected"] += 1
+            raise NimUnavailable("NIM is unavailable (probing recovery)", 1)
+        self._probing = True
+
+    def record_success(self):
+        self.state = "closed"
+        NIM_CIRCUIT_OPEN.set(0)
+        self.failures = 0
+        self._probing = False
+
+    def record_failure(self):
+        self.failures += 1
+        self._probing = False
+        if self.failure_threshold <= 0:
+            return
+        if self.state == "half_open" or self.failures >= self.failure_threshold:
+            if self.state != "open":
+                self._stats["opened"] += 1
+            self.state = "open"
+            self._opened_at = time.monotonic()
+            NIM_CIRCUIT_OPEN.set(1)
+
+    def record_abandoned(self):
+        """The call ended without telling us anything about NIM's health"""
+        self._probing = False
+
+    def stats(self) -> Dict[str, Any]:
+        return {"state": self.state, "consecutive_failures": self.failures, **self._stats}
+
+
+class LatencyTracker:
+    """Rolling window of successful call latencies for one call type"""
+
+    def __init__(self, size: int = 200):
+        self._samples: Deque[float] = deque(maxlen=size)
+
+    def record(self, seconds: float):
+        self._samples.append(seconds)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """The q-th latency quantile, or None until there are enough samples"""
+        if len(self._samples) < _MIN_HEDGE_SAMPLES:
+            return None
+        ordered = sorted(self._samples)
+        return ordered[max(0, math.ceil(q * len(ordered)) - 1)]
+
+
+_breaker = CircuitBreaker(NIM_BREAKER_FAILURES, NIM_BREAKER_RESET_SECONDS)
+_latencies: Dict[str, LatencyTracker] = {}
+_stats = {"calls": 0, "failed": 0, "retries": 0, "hedged": 0, "hedge_wins": 0}
+
+
+def get_circuit_breaker() -> CircuitBreaker:
+    """Get the process-wide NIM circuit breaker"""
+    return _breaker
+
+
+def resilience_stats() -> Dict[str, Any]:
+    """Call, retry and hedge counters plus the breaker state"""
+    return {**_stats, "circuit": _breaker.stats()}
+
+
+def retry_delay(retry: int, retry_after: Optional[int] = None) -> float:
+    """Exponential backoff with full jitter, never shorter than a Retry-After"""
+    delay = random.uniform(0, min(NIM_RETRY_MAX_DELAY, NIM_RETRY_BASE_DELAY * 2 ** retry))
+    return max(delay, retry_after or 0)
+
+
+def _hedge_delay(task: str) -> Optional[float]:
+    if not NIM_HEDGE_ENABLED:
+        return None
+    threshold = _latencies.setdefault(task, LatencyTracker()).percentile(NIM_HEDGE_PERCENTILE)
+    if threshold is None:
+        return None
+    return max(threshold, NIM_HEDGE_MIN_DELAY_MS / 1000)
+
+
+async def _hedged(attempt: Callable[[float], Awaitable[T]], timeout: float, hedge_after: float) -> T:
+    """
+    Start attempt(); if it has not finished after hedge_after seconds and the
+    scheduler has a free slot, start a second one. The first success wins
+    and the other is cancelled.
+    """
+    primary = asyncio.create_task(attempt(timeout))
+    tasks = [primary]
+    try:
+        done, _ = await asyncio.wait(tasks, timeout=hedge_after)
+        if not done and get_nim_scheduler().has_capacity():
+            _stats["hedged"] += 1
+            tasks.append(asyncio.create_task(attempt(max(0.1, timeout - hedge_after))))
+
+        errors: List[BaseException] = []
+        pending = set(tasks)
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            finished = [t for t in done if t.exception() is None]
+            errors += [t.exception() for t in done if t.exception() is not None]
+            if finished:
+                if finished[0] is not primary:
+                    _stats["hedge_wins"] += 1
+                return finished[0].result()
+        # A refused hedge says nothing about the call; report the real failure
+        real = [e for e in errors if not isinstance(e, SchedulerRejected)]
+        raise (real or errors)[0]
+    finally:
+        for t in tasks:
+            t.cancel()
+
+
+async def call_with_resilience(
+    attempt: Callable[[float], Awaitable[T]],
+    task: str,
+    hedge: bool = False
+) -> T:
+    """
+    Run one NIM call under the deadline, retry policy, circuit breaker and,
+    with hedge, hedged requests. attempt(timeout) makes one upstream
+    request and must finish within `timeout` seconds; with hedging two may
+    run at once. Retryable failures are retried with backoff while the
+    deadline allows. Raises a NimError when the call cannot succeed;
+    scheduler refusals propagate unchanged.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + NIM_DEADLINE_SECONDS
+    _stats["calls"] += 1
+
+    retry = 0
+    while True:
+        _breaker.before_call()
+        timeout = min(NIM_CALL_TIMEOUT_SECONDS, deadline - loop.time())
+        hedge_after = _hedge_delay(task) if hedge else None
+        started = loop.time()
+        try:
+            with span("nim_attempt", retry=retry) as attempt_span:
+                if hedge_after is not None and hedge_after < timeout:
+                    attempt_span.set(hedge_after_ms=round(hedge_after * 1000))
+                    result = await _hedged(attempt, timeout, hedge_after)
+                else:
+                    result = await attempt(timeout)
+        except (SchedulerRejected, asyncio.CancelledError):
+            _breaker.record_abandoned()
+            raise
+        except Exception as e:
+            error = classify_error(e)
+            if error.retryable:
+                _breaker.record_failure()
+            else:
+                _breaker.record_abandoned()
+            delay = retry_delay(retry, error.retry_after)
+            if not error.retryable or retry >= NIM_MAX_RETRIES or loop.time() + delay >= deadline:
+                _stats["failed"] += 1
+                raise error from e
+            print(f"NIM {task} call failed ({error}), retrying in {delay:.2f}s")
+            _stats["retries"] += 1
+            retry += 1
+            await asyncio.sleep(delay)
+            continue
+
+        _breaker.record_success()
+        _latencies.setdefault(task, LatencyTracker()).record(loop.time() - started)
+        return result
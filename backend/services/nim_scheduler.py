@@ -0,0 +1,315 @@
+"""
+Resume Reactor - NIM Request Scheduler
+Central admission control for NIM calls: rate limits, priorities and backpressure
+"""
+import asyncio
+import math
+import time
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Dict, Any, List, Optional, AsyncIterator
+
+from config import (
+    NIM_RPM_LIMIT, NIM_TPM_LIMIT, NIM_MAX_CONCURRENCY, NIM_QUEUE_SIZE, NIM_QUEUE_TIMEOUT_SECONDS
+)
+from services.metrics import NIM_ACTIVE_REQUESTS, NIM_QUEUE_DEPTH
+from services.tracing import span
+
+
+# Priority classes; lower values are served first
+PRIORITY_INTERACTIVE = 0
+PRIORITY_STANDARD = 1
+PRIORITY_BULK = 2
+PRIORITY_NAMES = {
+    PRIORITY_INTERACTIVE: "interactive",
+    PRIORITY_STANDARD: "standard",
+    PRIORITY_BULK: "bulk"
+}
+
+# Priority of the current request; tasks it spawns inherit it
+_priority: ContextVar[int] = ContextVar("nim_priority", default=PRIORITY_STANDARD)
+
+
+def set_request_priority(priority: int):
+    """Set the NIM priority for the rest of the current request (or task)"""
+    _priority.set(priority)
+
+
+def current_priority() -> int:
+    """NIM priority of the current request"""
+    return _priority.get()
+
+
+class SchedulerRejected(Exception):
+    """Base for requests the scheduler refuses; carries the HTTP status and Retry-After"""
+
+    status_code = 503
+
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class SchedulerBusy(SchedulerRejected):
+    """Raised when the NIM queue is full"""
+
+    status_code = 429
+
+
+class SchedulerTimeout(SchedulerRejected):
+    """Raised when a request waited in the NIM queue past its deadline"""
+
+    status_code = 503
+
+
+class TokenBucket:
+    """Bucket refilled continuously at `per_minute` units per minute, holding at most one minute's worth"""
+
+    def __init__(self, per_minute: int):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.level = self.capacity
+        self._updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def delay(self, amount: float) -> float:
+        """Seconds until `amount` units are available (0 if they are now)"""
+        self._refill()
+        amount = min(amount, self.capacity)
+        return 0.0 if self.level >= amount else (amount - self.level) / self.rate
+
+    def take(self, amount: float):
+        self._refill()
+        self.level -= min(amount, self.capacity)
+
+    def give_back(self, amount: float):
+        self._refill()
+        self.level = min(self.capacity, self.level + amount)
+
+
+class _Waiter:
+    """One request waiting for, or holding, a NIM slot"""
+
+    __slots__ = ("priority", "seq", "tokens", "future", "enqueued_at", "granted", "used_tokens")
+
+    def __init__(self, priority: int, seq: int, tokens: int, future: asyncio.Future):
+        self.priority = priority
+        self.seq = seq
+        self.tokens = tokens
+        self.future = future
+        self.enqueued_at = time.monotonic()
+        self.granted = False
+        self.used_tokens: Optional[int] = None
+
+    def record_usage(self, total_tokens: Optional[int]):
+        """Actual tokens used, so the estimate can be corrected on release"""
+        self.used_tokens = total_tokens
+
+
+class NimScheduler:
+    """
+    Admission control for NIM requests.
+
+    A request needs a concurrency slot, one unit from the requests/min
+    bucket and its estimated tokens from the tokens/min bucket (limits of
+    0 disable a bucket). Waiting requests are served strictly by priority,
+    then arrival order. The queue is bounded: when it is full a newcomer
+    displaces the lowest-priority waiter if it outranks it, and is refused
+    otherwise. Waiting longer than queue_timeout is refused too.
+    """
+
+    def __init__(
+        self,
+        rpm: int,
+        tpm: int,
+        max_concurrency: int,
+        max_queue: int,
+        queue_timeout: float
+    ):
+        self.requests = TokenBucket(rpm) if rpm > 0 else None
+        self.tokens = TokenBucket(tpm) if tpm > 0 else None
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_queue = max(0, max_queue)
+        self.queue_timeout = queue_timeout
+        self._waiting: List[_Waiter] = []
+        self._active = 0
+        self._seq = 0
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._stats = {
+            name: {
+                "admitted": 0,
+                "rejected": 0,
+                "timed_out": 0,
+                "wait_seconds_total": 0.0,
+                "wait_seconds_max": 0.0
+            }
+            for name in PRIORITY_NAMES.values()
+        }
+
+    def _bucket_delay(self, tokens: int) -> float:
+        delay = 0.0
+        if self.requests is not None:
+            delay = max(delay, self.requests.delay(1))
+        if self.tokens is not None:
+            delay = max(delay, self.tokens.delay(tokens))
+        return delay
+
+    def retry_after(self, tokens: int = 0) -> int:
+        """Whole seconds a refused client should wait before retrying"""
+        delay = self._bucket_delay(tokens)
+        if self.requests is not None and self._waiting:
+            delay = max(delay, len(self._waiting) / self.requests.rate)
+        return max(1, math.ceil(delay))
+
+    def has_capacity(self, tokens: int = 0) -> bool:
+        """Whether a request would be admitted right now without queueing"""
+        return (
+            not self._waiting
+            and self._active < self.max_concurrency
+            and self._bucket_delay(tokens) == 0
+        )
+
+    def _grant(self, waiter: _Waiter):
+        if self.requests is not None:
+            self.requests.take(1)
+        if self.tokens is not None:
+            self.tokens.take(waiter.tokens)
+        self._active += 1
+        self._publish()
+        waiter.granted = True
+        wait = time.monotonic() - waiter.enqueued_at
+        stats = self._stats[PRIORITY_NAMES[waiter.priority]]
+        stats["admitted"] += 1
+        stats["wait_seconds_total"] += wait
+        stats["wait_seconds_max"] = max(stats["wait_seconds_max"], wait)
+        if not waiter.future.done():
+            waiter.future.set_result(None)
+
+    def _publish(self):
+        NIM_QUEUE_DEPTH.set(len(self._waiting))
+        NIM_ACTIVE_REQUESTS.set(self._active)
+
+    def _pump(self):
+        """Grant slots to waiters in priority order while limits allow"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        while self._waiting and self._active < self.max_concurrency:
+            head = min(self._waiting, key=lambda w: (w.priority, w.seq))
+            if head.future.done():
+                # Cancelled while queued
+                self._waiting.remove(head)
+                continue
+            delay = self._bucket_delay(head.tokens)
+            if delay > 0:
+                self._timer = asyncio.get_running_loop().call_later(delay, self._pump)
+                break
+            self._waiting.remove(head)
+            self._grant(head)
+        self._publish()
+
+    def _release(self, waiter: _Waiter):
+        self._active -= 1
+        if self.tokens is not None and waiter.used_tokens is not None:
+            # Return what the estimate over-reserved (or take what it missed)
+            difference = waiter.tokens - waiter.used_tokens
+            if difference > 0:
+                self.tokens.give_back(difference)
+            elif difference < 0:
+                self.tokens.take(-difference)
+        self._pump()
+
+    def _abandon(self, waiter: _Waiter):
+        if waiter in self._waiting:
+            self._waiting.remove(waiter)
+            self._publish()
+        elif waiter.granted:
+            self._release(waiter)
+
+    async def acquire(self, estimated_tokens: int, priority: Optional[int] = None) -> _Waiter:
+        """
+        Wait for a slot. Raises SchedulerBusy when the queue is full and
+        SchedulerTimeout when the wait exceeds queue_timeout.
+        """
+        priority = current_priority() if priority is None else priority
+        name = PRIORITY_NAMES[priority]
+        self._seq += 1
+        waiter = _Waiter(priority, self._seq, estimated_tokens, asyncio.get_running_loop().create_future())
+
+        # Fast path: nothing queued ahead and capacity available
+        if self.has_capacity(estimated_tokens):
+            self._grant(waiter)
+            return waiter
+
+        if len(self._waiting) >= self.max_queue:
+            worst = max(self._waiting, key=lambda w: (w.priority, w.seq), default=None)
+            if worst is None or worst.priority <= priority:
+                self._stats[name]["rejected"] += 1
+                raise SchedulerBusy("NIM request queue is full", self.retry_after(estimated_tokens))
+            # Make room by refusing the lowest-priority, most recent waiter
+            self._waiting.remove(worst)
+            self._stats[PRIORITY_NAMES[worst.priority]]["rejected"] += 1
+            worst.future.set_exception(
+                SchedulerBusy("Displaced by a higher-priority request", self.retry_after())
+            )
+
+        self._waiting.append(waiter)
+        self._pump()
+        try:
+            await asyncio.wait_for(waiter.future, timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            self._abandon(waiter)
+            self._stats[name]["timed_out"] += 1
+            raise SchedulerTimeout("Timed out waiting for a NIM slot", self.retry_after(estimated_tokens))
+        except BaseException:
+            self._abandon(waiter)
+            raise
+        return waiter
+
+    @asynccontextmanager
+    async def slot(self, estimated_tokens: int, priority: Optional[int] = None) -> AsyncIterator[_Waiter]:
+        """Hold a NIM slot for the duration of the block"""
+        with span("nim_queue_wait", tokens=estimated_tokens):
+            waiter = await self.acquire(estimated_tokens, priority)
+        try:
+            yield waiter
+        finally:
+            self._release(waiter)
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth, active calls, bucket levels and per-priority wait metrics"""
+        return {
+            "queued": len(self._waiting),
+            "active": self._active,
+            "requests_available": round(self.requests.level, 1) if self.requests is not None else None,
+            "tokens_available": round(self.tokens.level) if self.tokens is not None else None,
+            "priorities": {
+                name: {
+                    **stats,
+                    "wait_seconds_avg": round(stats["wait_seconds_total"] / stats["admitted"], 4)
+                    if stats["admitted"] else 0.0
+                }
+                for name, stats in self._stats.items()
+            }
+        }
+
+
+_scheduler: Optional[NimScheduler] = None
+
+
+def get_nim_scheduler() -> NimScheduler:
+    """Get the process-wide NIM scheduler"""
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = NimScheduler(
+            rpm=NIM_RPM_LIMIT,
+            tpm=NIM_TPM_LIMIT,
+            max_concurrency=NIM_MAX_CONCURRENCY,
+            max_queue=NIM_QUEUE_SIZE,
+            queue_timeout=NIM_QUEUE_TIMEOUT_SECONDS
+        )
+    return _scheduler
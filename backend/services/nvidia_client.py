@@ -2,44 +2,341 @@
 Resume Reactor - NVIDIA NIM Client
 Wrapper for NVIDIA's inference API (OpenAI-compatible)
 """
-from openai import OpenAI
-from config import NVIDIA_API_KEY, NVIDIA_BASE_URL, TEXT_MODEL, VISION_MODEL
+import asyncio
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
 
+import httpx
+from openai import AsyncOpenAI
 
-def get_nvidia_client():
-    """Get NVIDIA NIM client using OpenAI-compatible API"""
-    return OpenAI(
-        base_url=NVIDIA_BASE_URL,
-        api_key=NVIDIA_API_KEY
-    )
+from config import (
+    NVIDIA_API_KEY, NVIDIA_BASE_URL, TEXT_MODEL, VISION_MODEL,
+    NIM_HTTP2, NIM_MAX_CONNECTIONS, NIM_MAX_KEEPALIVE_CONNECTIONS,
+    NIM_KEEPALIVE_EXPIRY, NIM_CONNECT_TIMEOUT, NIM_READ_TIMEOUT, NIM_POOL_TIMEOUT
+)
+from services.llm_cache import LLMCache, get_llm_cache
+from services.metrics import record_llm_tokens, track_llm_call
+from services.nim_resilience import (
+    NimRequestError, call_with_resilience, classify_error, get_circuit_breaker
+)
+from services.nim_scheduler import get_nim_scheduler
+from services.prompt_context import estimate_tokens
+
+
+# Process-wide client, created on first use and shared by all requests
+_client: Optional[AsyncOpenAI] = None
+
+
+def init_nvidia_client() -> AsyncOpenAI:
+    """
+    Create the shared async NIM client backed by a pooled HTTP connection.
+    Safe to call more than once; an existing client is reused. Raises
+    NimRequestError when no API key is configured, so parsing and export
+    keep working without one and only NIM calls fail.
+    """
+    global _client
+    if _client is None:
+        if not NVIDIA_API_KEY:
+            raise NimRequestError("NVIDIA_API_KEY is not configured")
+        http_client = httpx.AsyncClient(
+            http2=NIM_HTTP2,
+            limits=httpx.Limits(
+                max_connections=NIM_MAX_CONNECTIONS,
+                max_keepalive_connections=NIM_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=NIM_KEEPALIVE_EXPIRY
+            ),
+            timeout=httpx.Timeout(
+                NIM_READ_TIMEOUT,
+                connect=NIM_CONNECT_TIMEOUT,
+                pool=NIM_POOL_TIMEOUT
+            )
+        )
+        _client = AsyncOpenAI(
+            base_url=NVIDIA_BASE_URL,
+            api_key=NVIDIA_API_KEY,
+            http_client=http_client,
+            # Retries are done by nim_resilience, which also knows the deadline
+            max_retries=0
+        )
+    return _client
+
+
+async def close_nvidia_client():
+    """Close the shared client and release its pooled connections"""
+    global _client
+    if _client is not None:
+        await _client.close()
+        _client = None
+
+
+def get_nvidia_client() -> AsyncOpenAI:
+    """Get the shared NVIDIA NIM client, creating it on first use"""
+    return _client or init_nvidia_client()
+
+
+class _Flight:
+    """One shared upstream call and the number of callers awaiting it"""
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class _StreamFlight:
+    """One shared upstream stream; chunks are kept so late joiners can replay them"""
+
+    def __init__(self):
+        self.chunks: List[str] = []
+        self.finished = False
+        self.changed = asyncio.Condition()
+        self.task: Optional[asyncio.Task] = None
+        self.waiters = 0
+        self.error: Optional[Exception] = None
+
+    async def publish(self, chunk: Optional[str] = None):
+        async with self.changed:
+            if chunk is None:
+                self.finished = True
+            else:
+                self.chunks.append(chunk)
+            self.changed.notify_all()
+
+
+# In-flight requests by fingerprint, for single-flight coalescing
+_flights: Dict[str, _Flight] = {}
+_stream_flights: Dict[str, _StreamFlight] = {}
+_flight_stats = {"upstream": 0, "coalesced": 0}
+
+
+def single_flight_stats() -> Dict[str, int]:
+    """Upstream calls made, callers served by another caller's call, and calls in flight"""
+    return {
+        **_flight_stats,
+        "in_flight": len(_flights) + len(_stream_flights)
+    }
+
+
+def _forget(flights: Dict[str, Any], key: str, flight: Any):
+    if flights.get(key) is flight:
+        del flights[key]
+
+
+async def _single_flight(key: str, call: Callable[[], Awaitable[str]]) -> str:
+    """
+    Run call() once for every concurrent caller with the same key.
+    Each caller awaits the shared task through a shield, so one caller
+    being cancelled does not cancel the call for the others; the upstream
+    call is only cancelled when its last caller goes away.
+    """
+    flight = _flights.get(key)
+    if flight is None:
+        flight = _Flight(asyncio.create_task(call()))
+        _flights[key] = flight
+        flight.task.add_done_callback(lambda _: _forget(_flights, key, flight))
+        _flight_stats["upstream"] += 1
+    else:
+        _flight_stats["coalesced"] += 1
+
+    flight.waiters += 1
+    try:
+        return await asyncio.shield(flight.task)
+    finally:
+        flight.waiters -= 1
+        if flight.waiters == 0 and not flight.task.done():
+            # Nobody is left to read the result; stop paying for it
+            _forget(_flights, key, flight)
+            flight.task.cancel()
+
+
+def _delta(chunk: Any) -> Optional[str]:
+    """Text carried by one streamed completion chunk"""
+    if not chunk.choices:
+        return None
+    return chunk.choices[0].delta.content
 
 
 async def generate_text(
     prompt: str,
     system_prompt: str = "You are an expert resume writer and ATS optimization specialist.",
     max_tokens: int = 1024,
-    temperature: float = 0.7
+    temperature: float = 0.7,
+    use_cache: bool = True,
+    task: str = "text"
 ) -> str:
     """
-    Generate text using NVIDIA NIM Llama model
+    Generate text using NVIDIA NIM Llama model.
+    Identical requests are served from the LLM cache unless use_cache is False
+    (sampled writing the user expects to vary); either way, identical
+    requests already in flight share one upstream call.
+    `task` names the call type for latency tracking and hedging.
+    Raises NimError when the call fails and SchedulerRejected when the
+    scheduler refuses it.
     """
-    client = get_nvidia_client()
-    
+    cache = get_llm_cache() if use_cache else None
+    cache_key = LLMCache.make_key(TEXT_MODEL, prompt, system_prompt, max_tokens, temperature)
+    if cache is not None:
+        cached = await cache.aget(cache_key)
+        if cached is not None:
+            return cached
+
+    async def complete() -> str:
+        client = get_nvidia_client()
+        estimated_tokens = estimate_tokens(system_prompt) + estimate_tokens(prompt) + max_tokens
+
+        async def attempt(timeout: float) -> str:
+            # Every attempt, retries and hedges included, needs its own slot
+            async with get_nim_scheduler().slot(estimated_tokens) as grant:
+                response = await asyncio.wait_for(
+                    client.chat.completions.create(
+                        model=TEXT_MODEL,
+                        messages=[
+                            {"role": "system", "content": system_prompt},
+                            {"role": "user", "content": prompt}
+                        ],
+                        max_tokens=max_tokens,
+                        temperature=temperature
+                    ),
+                    timeout
+                )
+                if response.usage is not None:
+                    grant.record_usage(response.usage.total_tokens)
+                    record_llm_tokens(task, response.usage.prompt_tokens, response.usage.completion_tokens)
+                return response.choices[0].message.content or ""
+
+        with track_llm_call(task):
+            content = await call_with_resilience(attempt, task, hedge=True)
+        if cache is not None and content:
+            await cache.aset(cache_key, content)
+        return content
+
+    return await _single_flight(cache_key, complete)
+
+
+async def stream_text(
+    prompt: str,
+    system_prompt: str = "You are an expert resume writer and ATS optimization specialist.",
+    max_tokens: int = 1024,
+    temperature: float = 0.7,
+    use_cache: bool = True,
+    task: str = "text"
+) -> AsyncIterator[str]:
+    """
+    Stream text from NVIDIA NIM Llama model as it is generated.
+    A cached completion is yielded as a single chunk (unless use_cache is
+    False). Identical streams already in flight are shared: a late joiner first receives the chunks
+    produced so far, then follows along live.
+    Failures before the first token are retried; later ones raise NimError
+    after the chunks already sent.
+    """
+    cache = get_llm_cache() if use_cache else None
+    cache_key = LLMCache.make_key(TEXT_MODEL, prompt, system_prompt, max_tokens, temperature)
+    if cache is not None:
+        cached = await cache.aget(cache_key)
+        if cached is not None:
+            yield cached
+            return
+
+    async def produce() -> AsyncIterator[str]:
+        client = get_nvidia_client()
+        parts = []
+        estimated_tokens = estimate_tokens(system_prompt) + estimate_tokens(prompt) + max_tokens
+
+        async def open_stream() -> Tuple[AsyncIterator[Any], Optional[str]]:
+            stream = await client.chat.completions.create(
+                model=TEXT_MODEL,
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": prompt}
+                ],
+                max_tokens=max_tokens,
+                temperature=temperature,
+                stream=True
+            )
+            try:
+                chunks = stream.__aiter__()
+                async for chunk in chunks:
+                    delta = _delta(chunk)
+                    if delta:
+                        return chunks, delta
+                return chunks, None
+            except BaseException:
+                await stream.close()
+                raise
+
+        async def attempt(timeout: float) -> Tuple[AsyncIterator[Any], Optional[str]]:
+            # Deadline covers time to first token; later reads use the HTTP read timeout
+            return await asyncio.wait_for(open_stream(), timeout)
+
+        # The slot is held for the whole stream, retries before the first token included
+        async with get_nim_scheduler().slot(estimated_tokens):
+            with track_llm_call(task):
+                chunks, first = await call_with_resilience(attempt, task)
+                if first is None:
+                    return
+                parts.append(first)
+                yield first
+                try:
+                    async for chunk in chunks:
+                        delta = _delta(chunk)
+                        if delta:
+                            parts.append(delta)
+                            yield delta
+                except Exception as e:
+                    error = classify_error(e)
+                    print(f"NVIDIA API streaming error: {error}")
+                    if error.retryable:
+                        get_circuit_breaker().record_failure()
+                    raise error from e
+                finally:
+                    # Streamed chunks carry no usage; count estimates instead
+                    record_llm_tokens(
+                        task,
+                        estimate_tokens(system_prompt) + estimate_tokens(prompt),
+                        estimate_tokens("".join(parts))
+                    )
+
+        content = "".join(parts)
+        if cache is not None and content:
+            await cache.aset(cache_key, content)
+
+    flight = _stream_flights.get(cache_key)
+    if flight is None:
+        flight = _StreamFlight()
+
+        async def pump():
+            try:
+                async for delta in produce():
+                    await flight.publish(delta)
+            except Exception as e:
+                # Handed to every subscriber (e.g. a scheduler refusal)
+                flight.error = e
+            finally:
+                await flight.publish(None)
+
+        flight.task = asyncio.create_task(pump())
+        _stream_flights[cache_key] = flight
+        flight.task.add_done_callback(lambda _: _forget(_stream_flights, cache_key, flight))
+        _flight_stats["upstream"] += 1
+    else:
+        _flight_stats["coalesced"] += 1
+
+    flight.waiters += 1
     try:
-        response = client.chat.completions.create(
-            model=TEXT_MODEL,
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": prompt}
-            ],
-            max_tokens=max_tokens,
-            temperature=temperature
-        )
-        return response.choices[0].message.content
-    except Exception as e:
-        print(f"NVIDIA API error: {e}")
-        # Fallback response if API fails
-        return f"[API Error: {str(e)}. Please check your NVIDIA API key.]"
+        index = 0
+        while True:
+            while index < len(flight.chunks):
+                yield flight.chunks[index]
+                index += 1
+            if flight.finished:
+                if flight.error is not None:
+                    raise flight.error
+                return
+            async with flight.changed:
+                await flight.changed.wait_for(lambda: flight.finished or len(flight.chunks) > index)
+    finally:
+        flight.waiters -= 1
+        if flight.waiters == 0 and not flight.task.done():
+            _forget(_stream_flights, cache_key, flight)
+            flight.task.cancel()
 
 
 async def analyze_image(
@@ -47,30 +344,39 @@ async def analyze_image(
     prompt: str = "Describe this image from a resume. Identify any certifications, skills, project screenshots, or achievements shown."
 ) -> str:
     """
-    Analyze an image using NVIDIA NIM Vision model
+    Analyze an image using NVIDIA NIM Vision model.
+    Raises NimError when the call fails.
     """
     client = get_nvidia_client()
-    
-    try:
-        response = client.chat.completions.create(
-            model=VISION_MODEL,
-            messages=[
-                {
-                    "role": "user",
-                    "content": [
-                        {"type": "text", "text": prompt},
+    # Images cost far more prompt tokens than their text; reserve a flat allowance
+    estimated_tokens = estimate_tokens(prompt) + 1024 + 512
+
+    async def attempt(timeout: float) -> str:
+        async with get_nim_scheduler().slot(estimated_tokens):
+            response = await asyncio.wait_for(
+                client.chat.completions.create(
+                    model=VISION_MODEL,
+                    messages=[
                         {
-                            "type": "image_url",
-                            "image_url": {
-                                "url": f"data:image/png;base64,{image_base64}"
-                            }
+                            "role": "user",
+                            "content": [
+                                {"type": "text", "text": prompt},
+                                {
+                                    "type": "image_url",
+                                    "image_url": {
+                                        "url": f"data:image/png;base64,{image_base64}"
+                                    }
+                                }
+                            ]
                         }
-                    ]
-                }
-            ],
-            max_tokens=512
-        )
-        return response.choices[0].message.content
-    except Exception as e:
-        print(f"Vision API error: {e}")
-        return f"[Could not analyze image: {str(e)}]"
+                    ],
+                    max_tokens=512
+                ),
+                timeout
+            )
+            if response.usage is not None:
+                record_llm_tokens("vision", response.usage.prompt_tokens, response.usage.completion_tokens)
+            return response.choices[0].message.content or ""
+
+    with track_llm_call("vision"):
+        return await call_with_resilience(attempt, "vision")
@@ -0,0 +1,220 @@
+"""
+Resume Reactor - Parse Worker Pool
+Runs CPU-heavy PDF/DOCX parsing in a process pool off the event loop
+"""
+import asyncio
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Any, List, Optional, Tuple, Union
+
+from config import (
+    PARSE_WORKERS, PARSE_MAX_QUEUE, PARSE_TIMEOUT_SECONDS, PARSE_MAX_TASKS_PER_CHILD
+)
+from services.metrics import (
+    PARSE_JOBS_PENDING, apply_worker_metrics, buffer_worker_metrics, drain_worker_metrics, time_stage
+)
+from services.tracing import capture_spans, current_trace, graft_span
+
+
+class ParsePoolBusy(Exception):
+    """Raised when the parse queue is full"""
+
+
+class ParseTimeout(Exception):
+    """Raised when a parse job exceeds its deadline"""
+
+
+def parse_document(source: Union[str, bytes], file_ext: str) -> Dict[str, Any]:
+    """
+    Parse a resume (file path or bytes) by extension. Runs inside a worker process.
+    """
+    if file_ext == ".pdf":
+        from parsers.pdf_parser import parse_pdf
+        with time_stage("parse_pdf"):
+            return parse_pdf(source)
+    from parsers.docx_parser import parse_docx
+    with time_stage("parse_docx"):
+        return parse_docx(source)
+
+
+def _parse_job(
+    source: Union[str, bytes],
+    file_ext: str,
+    trace: bool = False,
+    profile_path: Optional[str] = None
+) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]], List[Tuple[str, str, Any]]]:
+    """
+    Worker entry point: the parse result, the spans recorded while parsing
+    for a traced request, and the metric observations for the parent to
+    record
+    """
+    # Left over from a job that failed
+    drain_worker_metrics()
+    with capture_spans("parse_job", trace, profile_path) as root:
+        parsed = parse_document(source, file_ext)
+    return parsed, root.to_raw() if root is not None else None, drain_worker_metrics()
+
+
+def _limit_ocr_threads():
+    """OCR parallelism comes from several single-threaded Tesseracts, not OpenMP"""
+    os.environ.setdefault("OMP_THREAD_LIMIT", "1")
+
+
+def _warm_worker():
+    """Import parser dependencies once when a worker starts"""
+    _limit_ocr_threads()
+    buffer_worker_metrics()
+    import parsers.pdf_parser  # noqa: F401
+    import parsers.docx_parser  # noqa: F401
+
+
+def _terminate_workers(executor: ProcessPoolExecutor):
+    """Kill an executor's worker processes, busy ones included"""
+    if hasattr(executor, "terminate_workers"):
+        executor.terminate_workers()
+        return
+    # Before Python 3.14 the only handle on the workers is a private attribute
+    processes = getattr(executor, "_processes", None)
+    if not isinstance(processes, dict):
+        print("Parse pool cannot reach its worker processes, stuck jobs keep running")
+        return
+    for process in list(processes.values()):
+        process.terminate()
+
+
+class ParsePool:
+    """
+    Bounded process pool for resume parsing.
+    Workers are recycled after max_tasks_per_child jobs to contain leaks in
+    the PDF libraries. With max_workers=0 jobs run in a thread instead.
+    A job counts against the queue until it actually finishes, even after
+    its caller timed out; once abandoned jobs hold every worker the pool is
+    torn down and restarted, killing them.
+    """
+
+    def __init__(
+        self,
+        max_workers: int,
+        max_queue: int,
+        timeout: float,
+        max_tasks_per_child: int
+    ):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self.max_tasks_per_child = max_tasks_per_child
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._pending = 0
+        self._abandoned = 0
+
+    def start(self):
+        """Start the worker processes"""
+        if self.max_workers == 0:
+            # Thread mode: Tesseract subprocesses inherit this process's environment
+            _limit_ocr_threads()
+        if self.max_workers > 0 and self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                initializer=_warm_worker,
+                max_tasks_per_child=self.max_tasks_per_child or None
+            )
+
+    def shutdown(self):
+        """Stop the worker processes, dropping queued jobs"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def restart(self, kill: bool = False):
+        """
+        Replace the worker processes. With kill, the old workers are
+        terminated, so jobs stuck in native code stop holding them; their
+        callers see BrokenProcessPool.
+        """
+        executor = self._executor
+        self._executor = None
+        self.start()
+        if executor is not None:
+            if kill:
+                _terminate_workers(executor)
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    @property
+    def pending(self) -> int:
+        """Jobs running or waiting for a worker, abandoned ones included"""
+        return self._pending
+
+    def _finished(self):
+        self._pending -= 1
+        PARSE_JOBS_PENDING.dec()
+
+    async def parse(self, source: Union[str, bytes], file_ext: str) -> Dict[str, Any]:
+        """
+        Parse a file path or uploaded bytes in the pool.
+        Raises ParsePoolBusy when the queue is full, ParseTimeout when the
+        job overruns and BrokenProcessPool when a worker died under it.
+        """
+        if self._pending >= max(self.max_workers, 1) + self.max_queue:
+            raise ParsePoolBusy()
+
+        trace = current_trace()
+        args = (source, file_ext, trace is not None, trace.worker_profile_path() if trace else None)
+        loop = asyncio.get_running_loop()
+        executor = self._executor
+        if executor is None:
+            # A thread cannot be stopped; shield it so its slot is held until it returns
+            job = asyncio.ensure_future(asyncio.to_thread(_parse_job, *args))
+            waitable = asyncio.shield(job)
+            job.add_done_callback(lambda _: self._finished())
+        else:
+            job = executor.submit(_parse_job, *args)
+            waitable = asyncio.wrap_future(job)
+            job.add_done_callback(lambda _: loop.call_soon_threadsafe(self._finished))
+        self._pending += 1
+        PARSE_JOBS_PENDING.inc()
+
+        try:
+            parsed, spans, observations = await asyncio.wait_for(waitable, timeout=self.timeout)
+        except asyncio.TimeoutError:
+            # Cancelling frees a job that never started; a running one keeps its worker
+            if not job.done():
+                self._abandoned += 1
+                if executor is None:
+                    job.add_done_callback(lambda _: self._abandoned_finished())
+                else:
+                    job.add_done_callback(lambda _: loop.call_soon_threadsafe(self._abandoned_finished))
+                if executor is not None and executor is self._executor and self._abandoned >= self.max_workers:
+                    print("Every parse worker is stuck on an abandoned job, restarting workers")
+                    self.restart(kill=True)
+            raise ParseTimeout()
+        except BrokenProcessPool:
+            # A worker died (e.g. crashed inside a native library); start fresh once
+            if executor is self._executor:
+                print("Parse pool broken, restarting workers")
+                self.restart()
+            raise
+
+        apply_worker_metrics(observations)
+        if spans is not None:
+            graft_span(spans)
+        return parsed
+
+    def _abandoned_finished(self):
+        self._abandoned -= 1
+
+
+_pool: Optional[ParsePool] = None
+
+
+def get_parse_pool() -> ParsePool:
+    """Get the process-wide parse pool"""
+    global _pool
+    if _pool is None:
+        _pool = ParsePool(
+            max_workers=PARSE_WORKERS,
+            max_queue=PARSE_MAX_QUEUE,
+            timeout=PARSE_TIMEOUT_SECONDS,
+            max_tasks_per_child=PARSE_MAX_TASKS_PER_CHILD
+        )
+    return _pool
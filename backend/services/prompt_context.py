@@ -0,0 +1,155 @@
+"""
+Resume Reactor - Prompt Context Builder
+Packs resume sections and job descriptions into token budgets for prompts
+"""
+import math
+import re
+from typing import Dict, List, Optional
+
+from config import (
+    PROMPT_RESUME_TOKEN_BUDGET, PROMPT_JD_TOKEN_BUDGET, PROMPT_KEYWORDS_JD_TOKEN_BUDGET,
+    PROMPT_REWRITE_JD_TOKEN_BUDGET
+)
+
+
+# Sections in the order they are worth including, per task. Contact
+# details never help the model and are always left out.
+SECTION_PRIORITY: Dict[str, List[str]] = {
+    "suggestions": ["experience", "skills", "summary", "projects", "certifications", "education", "other"],
+    "summary": ["experience", "skills", "summary", "education", "projects", "certifications", "other"],
+}
+
+# Document order used when rendering the packed sections
+SECTION_ORDER = ["summary", "experience", "skills", "projects", "education", "certifications", "other"]
+
+# Completion budgets sized to each task's expected output
+TASK_MAX_TOKENS: Dict[str, int] = {
+    "keywords": 200,       # up to 30 short comma-separated terms
+    "suggestions": 1500,   # 5 JSON objects; kept at the original headroom so long rewrites are not cut off
+    "rewrite": 600,        # upper bound; scaled to the input below
+    "bullet_points": 300,  # 4-5 one-line bullets
+    "summary": 160,        # 2-3 sentences
+    "clarification": 160,  # one bullet or short paragraph
+}
+
+# Below this many tokens a truncated section is more noise than signal
+_MIN_SECTION_TOKENS = 40
+
+_TOKEN_RE = re.compile(r"\w+|[^\w\s]")
+_BLANK_LINES_RE = re.compile(r"\n\s*\n+")
+_SPACES_RE = re.compile(r"[ \t]+")
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Approximate BPE token count: one token per punctuation mark and per
+    started four characters of each word. Close enough to budget with and
+    much cheaper than loading a tokenizer.
+    """
+    return sum(max(1, math.ceil(len(piece) / 4)) for piece in _TOKEN_RE.findall(text))
+
+
+def compact_text(text: str) -> str:
+    """Collapse runs of spaces and blank lines, which cost tokens and add nothing"""
+    text = _SPACES_RE.sub(" ", text)
+    return _BLANK_LINES_RE.sub("\n", text).strip()
+
+
+def truncate_to_tokens(text: str, budget: int) -> str:
+    """
+    Longest prefix of the text within the budget, cut at a line break when
+    possible and otherwise at a word boundary
+    """
+    if budget <= 0:
+        return ""
+    if estimate_tokens(text) <= budget:
+        return text
+
+    kept: List[str] = []
+    used = 0
+    for line in text.split("\n"):
+        cost = estimate_tokens(line) + 1
+        if used + cost <= budget:
+            kept.append(line)
+            used += cost
+            continue
+        words = []
+        for word in line.split(" "):
+            cost = estimate_tokens(word)
+            if used + cost > budget:
+                break
+            words.append(word)
+            used += cost
+        if words:
+            kept.append(" ".join(words))
+        break
+    return "\n".join(kept)
+
+
+def build_resume_context(
+    sections: Optional[Dict[str, str]],
+    resume_text: str,
+    budget: int = PROMPT_RESUME_TOKEN_BUDGET,
+    task: str = "suggestions"
+) -> str:
+    """
+    Resume text for a prompt, packed into the token budget.
+    Sections are taken in the task's priority order; a section that does
+    not fit whole is truncated to the remaining budget, or skipped when
+    too little is left. Without usable sections the plain text is cut to
+    the budget instead.
+    """
+    sections = {
+        name: compact_text(content)
+        for name, content in (sections or {}).items()
+        if name != "contact" and content and content.strip()
+    }
+    if not sections:
+        return truncate_to_tokens(compact_text(resume_text), budget)
+
+    priority = SECTION_PRIORITY.get(task, SECTION_ORDER)
+    ordered = [name for name in priority if name in sections]
+    ordered += [name for name in sections if name not in ordered]
+
+    packed: Dict[str, str] = {}
+    remaining = budget
+    for name in ordered:
+        header_cost = estimate_tokens(name) + 2
+        available = remaining - header_cost
+        if available < _MIN_SECTION_TOKENS and estimate_tokens(sections[name]) > available:
+            continue
+        content = truncate_to_tokens(sections[name], available)
+        if not content:
+            continue
+        packed[name] = content
+        remaining -= header_cost + estimate_tokens(content)
+
+    render_order = [name for name in SECTION_ORDER if name in packed]
+    render_order += [name for name in packed if name not in render_order]
+    return "\n\n".join(f"{name.upper()}:\n{packed[name]}" for name in render_order)
+
+
+def build_jd_context(job_description: str, budget: int = PROMPT_JD_TOKEN_BUDGET) -> str:
+    """Job description for a prompt, compacted and cut to the token budget"""
+    return truncate_to_tokens(compact_text(job_description), budget)
+
+
+def keywords_jd_context(job_description: str) -> str:
+    """Job description for keyword extraction, which needs more of it"""
+    return build_jd_context(job_description, PROMPT_KEYWORDS_JD_TOKEN_BUDGET)
+
+
+def rewrite_jd_context(job_description: str) -> str:
+    """Job description for a section rewrite, where it is only a hint"""
+    return build_jd_context(job_description, PROMPT_REWRITE_JD_TOKEN_BUDGET)
+
+
+def max_tokens_for(task: str, input_text: str = "") -> int:
+    """
+    Completion budget for a task. Rewrites scale with the text being
+    rewritten (about 1.5x plus room for the notes), capped at the task limit.
+    """
+    limit = TASK_MAX_TOKENS[task]
+    if task == "rewrite" and input_text:
+        return max(200, min(limit, int(estimate_tokens(input_text) * 1.5) + 150))
+    return limit
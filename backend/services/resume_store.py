@@ -0,0 +1,590 @@
+"""
+Resume Reactor - Resume Store
+Pluggable persistence for resumes, parsed uploads, job descriptions and deferred suggestions
+"""
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
+
+from config import (
+    RESUME_STORE_BACKEND, RESUME_DB_PATH, RESUME_CACHE_SIZE, PENDING_SUGGESTIONS_TTL_SECONDS,
+    BULK_EXPORT_JOB_TTL_SECONDS
+)
+
+T = TypeVar("T")
+
+
+class ResumeStore:
+    """
+    Storage interface used by the routes.
+
+    Uploads hold the parsed result for a content hash, which never changes.
+    Their file_path is cleared when the temp sweeper deletes the file and
+    repointed when the same bytes are uploaded again.
+    A resume points at an upload and only gets its own parsed copy once it
+    is edited (copy-on-write). Records returned by get_resume are shared
+    and must be treated as read-only; write changes with update_parsed.
+
+    Async code uses the a-prefixed methods, which run the blocking ones in
+    a thread when the store does I/O, so a busy database never stalls the
+    event loop.
+    """
+
+    # Whether the methods below wait on I/O (and so must not run on the event loop)
+    blocking = False
+
+    async def _call(self, method: Callable[..., T], *args: Any) -> T:
+        if self.blocking:
+            return await asyncio.to_thread(method, *args)
+        return method(*args)
+
+    async def aget_resume(self, resume_id: str) -> Optional[Dict[str, Any]]:
+        return await self._call(self.get_resume, resume_id)
+
+    async def acreate_resume(self, resume_id: str, file_path: str, filename: str, content_key: str):
+        await self._call(self.create_resume, resume_id, file_path, filename, content_key)
+
+    async def aupdate_parsed(self, resume_id: str, parsed: Dict[str, Any]) -> bool:
+        return await self._call(self.update_parsed, resume_id, parsed)
+
+    async def aget_upload(self, content_key: str) -> Optional[Dict[str, Any]]:
+        return await self._call(self.get_upload, content_key)
+
+    async def aput_upload(self, content_key: str, file_path: str, parsed: Dict[str, Any]):
+        await self._call(self.put_upload, content_key, file_path, parsed)
+
+    async def aset_upload_file(self, content_key: str, file_path: str):
+        await self._call(self.set_upload_file, content_key, file_path)
+
+    async def aget_job_description(self, jd_id: str) -> Optional[Dict[str, Any]]:
+        return await self._call(self.get_job_description, jd_id)
+
+    async def aput_job_description(self, jd_id: str, record: Dict[str, Any]):
+        await self._call(self.put_job_description, jd_id, record)
+
+    async def aget_suggestions(self, analysis_id: str) -> Optional[Dict[str, Any]]:
+        return await self._call(self.get_suggestions, analysis_id)
+
+    async def aput_suggestions(self, analysis_id: str, record: Dict[str, Any]):
+        await self._call(self.put_suggestions, analysis_id, record)
+
+    async def aget_export_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return await self._call(self.get_export_job, job_id)
+
+    async def aput_export_job(self, job_id: str, record: Dict[str, Any]):
+        await self._call(self.put_export_job, job_id, record)
+
+    async def apop_expired_export_jobs(self) -> List[Dict[str, Any]]:
+        return await self._call(self.pop_expired_export_jobs)
+
+    def get_resume(self, resume_id: str) -> Optional[Dict[str, Any]]:
+        """Resume record with "parsed" resolved, or None"""
+        raise NotImplementedError
+
+    def get_resume_version(self, resume_id: str) -> Optional[int]:
+        """Current version of a resume, or None if it does not exist"""
+        raise NotImplementedError
+
+    def create_resume(self, resume_id: str, file_path: str, filename: str, content_key: str):
+        """Create a resume backed by an existing upload"""
+        raise NotImplementedError
+
+    def update_parsed(self, resume_id: str, parsed: Dict[str, Any]) -> bool:
+        """Replace a resume's parsed content; returns False if it does not exist"""
+        raise NotImplementedError
+
+    def get_upload(self, content_key: str) -> Optional[Dict[str, Any]]:
+        """Upload record ({"file_path", "parsed"}) for a content hash, or None"""
+        raise NotImplementedError
+
+    def put_upload(self, content_key: str, file_path: str, parsed: Dict[str, Any]):
+        """Store the parsed result of an upload"""
+        raise NotImplementedError
+
+    def set_upload_file(self, content_key: str, file_path: str):
+        """Point an upload at a new copy of its file"""
+        raise NotImplementedError
+
+    def forget_upload_file(self, file_path: str):
+        """Clear file_path on uploads stored at a file that was deleted"""
+        raise NotImplementedError
+
+    def get_job_description(self, jd_id: str) -> Optional[Dict[str, Any]]:
+        """Registered job description record, or None"""
+        raise NotImplementedError
+
+    def put_job_description(self, jd_id: str, record: Dict[str, Any]):
+        """Store a registered job description"""
+        raise NotImplementedError
+
+    def get_suggestions(self, analysis_id: str) -> Optional[Dict[str, Any]]:
+        """Deferred suggestions record ({"status", "suggestions"}), or None if unknown or expired"""
+        raise NotImplementedError
+
+    def put_suggestions(self, analysis_id: str, record: Dict[str, Any]):
+        """Store or replace a deferred suggestions record"""
+        raise NotImplementedError
+
+    def get_export_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Bulk export job record, or None if unknown or expired"""
+        raise NotImplementedError
+
+    def put_export_job(self, job_id: str, record: Dict[str, Any]):
+        """
+        Store or replace a bulk export job record. Each write pushes its
+        expiry BULK_EXPORT_JOB_TTL_SECONDS out, so a job whose worker died
+        mid-run still expires.
+        """
+        raise NotImplementedError
+
+    def pop_expired_export_jobs(self) -> List[Dict[str, Any]]:
+        """Remove expired bulk export jobs and return them, so their files can be deleted"""
+        raise NotImplementedError
+
+    def close(self):
+        """Release any held resources"""
+
+
+class MemoryResumeStore(ResumeStore):
+    """Process-local store; nothing survives a restart or crosses workers"""
+
+    def __init__(self):
+        self._resumes: Dict[str, Dict[str, Any]] = {}
+        self._uploads: Dict[str, Dict[str, Any]] = {}
+        self._job_descriptions: Dict[str, Dict[str, Any]] = {}
+        self._suggestions: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        self._export_jobs: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+
+    def get_resume(self, resume_id: str) -> Optional[Dict[str, Any]]:
+        row = self._resumes.get(resume_id)
+        if row is None:
+            return None
+        parsed = row["parsed"]
+        if parsed is None:
+            parsed = self._uploads[row["content_key"]]["parsed"]
+        return {**row, "parsed": parsed}
+
+    def get_resume_version(self, resume_id: str) -> Optional[int]:
+        row = self._resumes.get(resume_id)
+        return row["version"] if row else None
+
+    def create_resume(self, resume_id: str, file_path: str, filename: str, content_key: str):
+        self._resumes[resume_id] = {
+            "file_path": file_path,
+            "filename": filename,
+            "content_key": content_key,
+            "parsed": None,
+            "version": 1
+        }
+
+    def update_parsed(self, resume_id: str, parsed: Dict[str, Any]) -> bool:
+        row = self._resumes.get(resume_id)
+        if row is None:
+            return False
+        self._resumes[resume_id] = {**row, "parsed": parsed, "version": row["version"] + 1}
+        return True
+
+    def get_upload(self, content_key: str) -> Optional[Dict[str, Any]]:
+        return self._uploads.get(content_key)
+
+    def put_upload(self, content_key: str, file_path: str, parsed: Dict[str, Any]):
+        self._uploads[content_key] = {"file_path": file_path, "parsed": parsed}
+
+    def set_upload_file(self, content_key: str, file_path: str):
+        upload = self._uploads.get(content_key)
+        if upload is not None:
+            self._uploads[content_key] = {**upload, "file_path": file_path}
+
+    def forget_upload_file(self, file_path: str):
+        for content_key, upload in list(self._uploads.items()):
+            if upload["file_path"] == file_path:
+                self._uploads[content_key] = {**upload, "file_path": ""}
+
+    def get_job_description(self, jd_id: str) -> Optional[Dict[str, Any]]:
+        return self._job_descriptions.get(jd_id)
+
+    def put_job_description(self, jd_id: str, record: Dict[str, Any]):
+        self._job_descriptions[jd_id] = record
+
+    def get_suggestions(self, analysis_id: str) -> Optional[Dict[str, Any]]:
+        entry = self._suggestions.get(analysis_id)
+        if entry is None or entry[0] < time.time():
+            return None
+        return entry[1]
+
+    def put_suggestions(self, analysis_id: str, record: Dict[str, Any]):
+        now = time.time()
+        for key in [k for k, (expires_at, _) in self._suggestions.items() if expires_at < now]:
+            del self._suggestions[key]
+        self._suggestions[analysis_id] = (now + PENDING_SUGGESTIONS_TTL_SECONDS, record)
+
+    def get_export_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        entry = self._export_jobs.get(job_id)
+        if entry is None or entry[0] < time.time():
+            return None
+        return entry[1]
+
+    def put_export_job(self, job_id: str, record: Dict[str, Any]):
+        self._export_jobs[job_id] = (time.time() + BULK_EXPORT_JOB_TTL_SECONDS, record)
+
+    def pop_expired_export_jobs(self) -> List[Dict[str, Any]]:
+        now = time.time()
+        expired = [k for k, (expires_at, _) in self._export_jobs.items() if expires_at < now]
+        return [self._export_jobs.pop(k)[1] for k in expired]
+
+
+class SQLiteResumeStore(ResumeStore):
+    """
+    SQLite store in WAL mode, safe to share between uvicorn worker processes.
+    Queries are primary-key lookups, but a write can wait up to the busy
+    timeout on another worker's lock, so async callers go through a thread.
+    """
+
+    blocking = True
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=10)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS uploads (
+                content_key TEXT PRIMARY KEY,
+                file_path TEXT NOT NULL,
+                parsed TEXT NOT NULL,
+                created_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS uploads_file_path ON uploads (file_path);
+            CREATE TABLE IF NOT EXISTS resumes (
+                resume_id TEXT PRIMARY KEY,
+                file_path TEXT NOT NULL,
+                filename TEXT NOT NULL,
+                content_key TEXT NOT NULL,
+                parsed TEXT,
+                version INTEGER NOT NULL DEFAULT 1,
+                updated_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS job_descriptions (
+                jd_id TEXT PRIMARY KEY,
+                record TEXT NOT NULL,
+                created_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS suggestions (
+                analysis_id TEXT PRIMARY KEY,
+                record TEXT NOT NULL,
+                expires_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS export_jobs (
+                job_id TEXT PRIMARY KEY,
+                record TEXT NOT NULL,
+                expires_at REAL NOT NULL
+            );
+            """
+        )
+        self._conn.commit()
+
+    def get_resume(self, resume_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                """SELECT r.file_path, r.filename, r.content_key, r.version,
+                          COALESCE(r.parsed, u.parsed)
+                   FROM resumes r LEFT JOIN uploads u ON u.content_key = r.content_key
+                   WHERE r.resume_id = ?""",
+                (resume_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        file_path, filename, content_key, version, parsed = row
+        return {
+            "file_path": file_path,
+            "filename": filename,
+            "content_key": content_key,
+            "version": version,
+            "parsed": json.loads(parsed)
+        }
+
+    def get_resume_version(self, resume_id: str) -> Optional[int]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT version FROM resumes WHERE resume_id = ?", (resume_id,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def create_resume(self, resume_id: str, file_path: str, filename: str, content_key: str):
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO resumes (resume_id, file_path, filename, content_key, updated_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (resume_id, file_path, filename, content_key, time.time())
+            )
+            self._conn.commit()
+
+    def update_parsed(self, resume_id: str, parsed: Dict[str, Any]) -> bool:
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE resumes SET parsed = ?, version = version + 1, updated_at = ? "
+                "WHERE resume_id = ?",
+                (json.dumps(parsed), time.time(), resume_id)
+            )
+            self._conn.commit()
+        return cursor.rowcount > 0
+
+    def get_upload(self, content_key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT file_path, parsed FROM uploads WHERE content_key = ?", (content_key,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {"file_path": row[0], "parsed": json.loads(row[1])}
+
+    def put_upload(self, content_key: str, file_path: str, parsed: Dict[str, Any]):
+        with self._lock:
+            # Two workers may parse the same bytes at once; the first one wins
+            self._conn.execute(
+                "INSERT OR IGNORE INTO uploads (content_key, file_path, parsed, created_at) "
+                "VALUES (?, ?, ?, ?)",
+                (content_key, file_path, json.dumps(parsed), time.time())
+            )
+            self._conn.commit()
+
+    def set_upload_file(self, content_key: str, file_path: str):
+        with self._lock:
+            self._conn.execute(
+                "UPDATE uploads SET file_path = ? WHERE content_key = ?", (file_path, content_key)
+            )
+            self._conn.commit()
+
+    def forget_upload_file(self, file_path: str):
+        with self._lock:
+            self._conn.execute("UPDATE uploads SET file_path = '' WHERE file_path = ?", (file_path,))
+            self._conn.commit()
+
+    def get_job_description(self, jd_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT record FROM job_descriptions WHERE jd_id = ?", (jd_id,)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put_job_description(self, jd_id: str, record: Dict[str, Any]):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO job_descriptions (jd_id, record, created_at) VALUES (?, ?, ?)",
+                (jd_id, json.dumps(record), time.time())
+            )
+            self._conn.commit()
+
+    def get_suggestions(self, analysis_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT record FROM suggestions WHERE analysis_id = ? AND expires_at >= ?",
+                (analysis_id, time.time())
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put_suggestions(self, analysis_id: str, record: Dict[str, Any]):
+        now = time.time()
+        with self._lock:
+            self._conn.execute("DELETE FROM suggestions WHERE expires_at < ?", (now,))
+            self._conn.execute(
+                "INSERT OR REPLACE INTO suggestions (analysis_id, record, expires_at) VALUES (?, ?, ?)",
+                (analysis_id, json.dumps(record), now + PENDING_SUGGESTIONS_TTL_SECONDS)
+            )
+            self._conn.commit()
+
+    def get_export_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT record FROM export_jobs WHERE job_id = ? AND expires_at >= ?",
+                (job_id, time.time())
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put_export_job(self, job_id: str, record: Dict[str, Any]):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO export_jobs (job_id, record, expires_at) VALUES (?, ?, ?)",
+                (job_id, json.dumps(record), time.time() + BULK_EXPORT_JOB_TTL_SECONDS)
+            )
+            self._conn.commit()
+
+    def pop_expired_export_jobs(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            # RETURNING makes select-and-delete one statement, so two workers never both get a job
+            rows = self._conn.execute(
+                "DELETE FROM export_jobs WHERE expires_at < ? RETURNING record", (time.time(),)
+            ).fetchall()
+            self._conn.commit()
+        return [json.loads(row[0]) for row in rows]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class CachedResumeStore(ResumeStore):
+    """
+    Bounded LRU read-through cache in front of another store.
+    A cached resume still costs one version lookup on the backend per read
+    (so edits made by another worker are never served stale); the cache
+    saves the join and decoding the parsed JSON, not the round trip.
+    Uploads and job descriptions are cached as-is and served without
+    touching the backend. An upload's file_path can go stale when another
+    worker swept or replaced its file, so callers check the file exists.
+    """
+
+    def __init__(self, backend: ResumeStore, max_entries: int = 256):
+        self.backend = backend
+        self.blocking = backend.blocking
+        self.max_entries = max_entries
+        self._resumes: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._immutable: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        # Reads may run in several threads at once
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _remember(self, cache: OrderedDict, key: str, value: Dict[str, Any]):
+        with self._lock:
+            cache[key] = value
+            cache.move_to_end(key)
+            while len(cache) > self.max_entries:
+                cache.popitem(last=False)
+
+    def _lookup(self, cache: OrderedDict, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            value = cache.get(key)
+            if value is not None:
+                cache.move_to_end(key)
+            return value
+
+    def get_resume(self, resume_id: str) -> Optional[Dict[str, Any]]:
+        cached = self._lookup(self._resumes, resume_id)
+        if cached is not None:
+            if self.backend.get_resume_version(resume_id) == cached["version"]:
+                self.hits += 1
+                return cached
+            with self._lock:
+                self._resumes.pop(resume_id, None)
+        self.misses += 1
+        record = self.backend.get_resume(resume_id)
+        if record is not None:
+            self._remember(self._resumes, resume_id, record)
+        return record
+
+    def get_resume_version(self, resume_id: str) -> Optional[int]:
+        return self.backend.get_resume_version(resume_id)
+
+    def create_resume(self, resume_id: str, file_path: str, filename: str, content_key: str):
+        self.backend.create_resume(resume_id, file_path, filename, content_key)
+
+    def update_parsed(self, resume_id: str, parsed: Dict[str, Any]) -> bool:
+        with self._lock:
+            self._resumes.pop(resume_id, None)
+        return self.backend.update_parsed(resume_id, parsed)
+
+    def get_upload(self, content_key: str) -> Optional[Dict[str, Any]]:
+        key = f"upload:{content_key}"
+        cached = self._lookup(self._immutable, key)
+        if cached is not None:
+            return cached
+        upload = self.backend.get_upload(content_key)
+        if upload is not None:
+            self._remember(self._immutable, key, upload)
+        return upload
+
+    async def aget_upload(self, content_key: str) -> Optional[Dict[str, Any]]:
+        # Immutable hits skip the thread hop
+        cached = self._lookup(self._immutable, f"upload:{content_key}")
+        if cached is not None:
+            return cached
+        return await self._call(self.get_upload, content_key)
+
+    def put_upload(self, content_key: str, file_path: str, parsed: Dict[str, Any]):
+        self.backend.put_upload(content_key, file_path, parsed)
+
+    def set_upload_file(self, content_key: str, file_path: str):
+        with self._lock:
+            self._immutable.pop(f"upload:{content_key}", None)
+        self.backend.set_upload_file(content_key, file_path)
+
+    def forget_upload_file(self, file_path: str):
+        with self._lock:
+            for key in [
+                key for key, record in self._immutable.items()
+                if key.startswith("upload:") and record["file_path"] == file_path
+            ]:
+                del self._immutable[key]
+        self.backend.forget_upload_file(file_path)
+
+    def get_job_description(self, jd_id: str) -> Optional[Dict[str, Any]]:
+        key = f"jd:{jd_id}"
+        cached = self._lookup(self._immutable, key)
+        if cached is not None:
+            return cached
+        record = self.backend.get_job_description(jd_id)
+        if record is not None:
+            self._remember(self._immutable, key, record)
+        return record
+
+    async def aget_job_description(self, jd_id: str) -> Optional[Dict[str, Any]]:
+        cached = self._lookup(self._immutable, f"jd:{jd_id}")
+        if cached is not None:
+            return cached
+        return await self._call(self.get_job_description, jd_id)
+
+    def put_job_description(self, jd_id: str, record: Dict[str, Any]):
+        self.backend.put_job_description(jd_id, record)
+
+    def get_suggestions(self, analysis_id: str) -> Optional[Dict[str, Any]]:
+        # Pending records change under us, so they are never cached
+        return self.backend.get_suggestions(analysis_id)
+
+    def put_suggestions(self, analysis_id: str, record: Dict[str, Any]):
+        self.backend.put_suggestions(analysis_id, record)
+
+    def get_export_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        # Progress changes under us, so jobs are never cached
+        return self.backend.get_export_job(job_id)
+
+    def put_export_job(self, job_id: str, record: Dict[str, Any]):
+        self.backend.put_export_job(job_id, record)
+
+    def pop_expired_export_jobs(self) -> List[Dict[str, Any]]:
+        return self.backend.pop_expired_export_jobs()
+
+    def close(self):
+        self.backend.close()
+
+
+_store: Optional[ResumeStore] = None
+
+
+def get_resume_store() -> ResumeStore:
+    """Get the process-wide resume store selected by RESUME_STORE_BACKEND"""
+    global _store
+    if _store is None:
+        if RESUME_STORE_BACKEND == "memory":
+            _store = MemoryResumeStore()
+        else:
+            _store = CachedResumeStore(SQLiteResumeStore(RESUME_DB_PATH), RESUME_CACHE_SIZE)
+    return _store
+
+
+def close_resume_store():
+    """Close the process-wide resume store"""
+    global _store
+    if _store is not None:
+        _store.close()
+        _store = None
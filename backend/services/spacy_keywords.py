@@ -0,0 +1,193 @@
+"""
+Resume Reactor - Local Keyword Extraction
+Offline job-description keyword extraction with spaCy (no network calls)
+"""
+import re
+import threading
+from collections import Counter
+from typing import List, Optional
+
+import spacy
+from spacy.matcher import PhraseMatcher
+
+from config import SPACY_MODEL, SKILLS_GAZETTEER_PATH, SPACY_BATCH_SIZE
+from services.keyword_matcher import SYNONYM_GROUPS
+
+
+# Skills recognized verbatim regardless of what the statistical model thinks
+DEFAULT_SKILLS: List[str] = [
+    "Python", "Java", "JavaScript", "TypeScript", "Go", "Rust", "C++", "C#", "Ruby", "PHP",
+    "Scala", "Kotlin", "Swift", "R", "SQL", "NoSQL", "Bash", "HTML", "CSS",
+    "React", "Angular", "Vue", "Node.js", "Django", "Flask", "FastAPI", "Spring", "Rails",
+    ".NET", "GraphQL", "REST", "API", "Microservices", "gRPC",
+    "AWS", "Azure", "GCP", "Docker", "Kubernetes", "Terraform", "Ansible", "Jenkins",
+    "CI/CD", "DevOps", "Linux", "Git", "Kafka", "RabbitMQ", "Spark", "Hadoop", "Airflow",
+    "PostgreSQL", "MySQL", "MongoDB", "Redis", "Elasticsearch", "Snowflake", "DynamoDB",
+    "Machine Learning", "Deep Learning", "Data Analysis", "Data Science", "NLP",
+    "Computer Vision", "TensorFlow", "PyTorch", "scikit-learn", "Pandas", "NumPy",
+    "Tableau", "Power BI", "Excel", "Statistics", "A/B Testing", "ETL",
+    "Agile", "Scrum", "Kanban", "Jira", "Project Management", "Product Management",
+    "Leadership", "Mentoring", "Stakeholder Management", "Communication",
+    "Cloud", "Security", "Networking", "Unit Testing", "Test Automation", "Figma", "UX", "SEO"
+]
+
+# Entity labels that name tools, products, platforms or languages
+ENTITY_LABELS = {"ORG", "PRODUCT", "LANGUAGE", "WORK_OF_ART"}
+
+# Heads of noun chunks that are never useful keywords on their own
+GENERIC_TERMS = {
+    "ability", "abilities", "candidate", "candidates", "experience", "years", "year",
+    "team", "teams", "role", "position", "company", "skills", "skill", "knowledge",
+    "understanding", "opportunity", "work", "responsibilities", "requirements", "plus",
+    "environment", "job", "we", "you", "us", "things", "way", "level", "degree"
+}
+
+_EDGE_POS = {"DET", "PRON", "PUNCT", "NUM", "CCONJ", "ADP", "PART", "SYM"}
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# Components the extractor never reads; disabling them is most of the speedup
+_DISABLED_COMPONENTS = ["lemmatizer", "textcat", "textcat_multilabel", "senter"]
+
+
+class SpacyKeywordExtractor:
+    """
+    Keyword extractor combining three signals, in priority order:
+    skills gazetteer hits (PhraseMatcher on lowercase text), named entities
+    that look like tools or products, and cleaned-up noun chunks. Terms are
+    ranked by frequency within each signal.
+
+    When the configured model is not installed it falls back to a blank
+    English pipeline, which keeps the gazetteer but loses entities and
+    noun chunks.
+    """
+
+    def __init__(self, model: str, skills: List[str], batch_size: int = 32):
+        self.batch_size = batch_size
+        try:
+            self.nlp = spacy.load(model, disable=_DISABLED_COMPONENTS)
+        except OSError as e:
+            print(f"spaCy model {model} unavailable, using gazetteer only: {e}")
+            self.nlp = spacy.blank("en")
+
+        # Short skills ("Go", "R", "AI") are matched case-sensitively so the
+        # verb "go" or a stray "r" is not taken for a skill. Lowercase ones
+        # ("k8s", "js") also match as written, unless that is a common word
+        short = {s for s in skills if len(s) <= 3}
+        stop_words = self.nlp.Defaults.stop_words
+        exact = set()
+        for skill in short:
+            if skill.islower():
+                exact.update([skill.upper(), skill.capitalize()])
+                if skill not in stop_words:
+                    exact.add(skill)
+            else:
+                exact.add(skill)
+        self.matcher = PhraseMatcher(self.nlp.vocab, attr="LOWER")
+        self.matcher.add("SKILL", list(self.nlp.tokenizer.pipe(s for s in skills if s not in short)))
+        self.exact_matcher = PhraseMatcher(self.nlp.vocab, attr="ORTH")
+        self.exact_matcher.add("SKILL", list(self.nlp.tokenizer.pipe(sorted(exact))))
+
+    def extract_batch(self, texts: List[str], limit: int = 30) -> List[List[str]]:
+        """Keywords for each text, processed in one nlp.pipe pass"""
+        return [
+            self._keywords(doc, limit)
+            for doc in self.nlp.pipe(texts, batch_size=self.batch_size)
+        ]
+
+    def extract(self, text: str, limit: int = 30) -> List[str]:
+        """Keywords for one text"""
+        return self.extract_batch([text], limit)[0]
+
+    def _keywords(self, doc, limit: int) -> List[str]:
+        skills: Counter = Counter()
+        for matcher in (self.matcher, self.exact_matcher):
+            for _, start, end in matcher(doc):
+                skills[doc[start:end].text] += 1
+
+        entities: Counter = Counter()
+        for ent in doc.ents:
+            if ent.label_ in ENTITY_LABELS:
+                term = self._clean_span(ent)
+                if term:
+                    entities[term] += 1
+
+        chunks: Counter = Counter()
+        if doc.has_annotation("DEP"):
+            for chunk in doc.noun_chunks:
+                term = self._clean_span(chunk)
+                if term:
+                    chunks[term] += 1
+
+        keywords: List[str] = []
+        seen = set()
+        for counter in (skills, entities, chunks):
+            for term, _ in counter.most_common():
+                key = term.lower()
+                if key not in seen:
+                    seen.add(key)
+                    keywords.append(term)
+        return keywords[:limit]
+
+    @staticmethod
+    def _clean_span(span) -> Optional[str]:
+        """Trim determiners, stop words and punctuation off a span's edges"""
+        tokens = list(span)
+        while tokens and (tokens[0].is_stop or tokens[0].pos_ in _EDGE_POS):
+            tokens.pop(0)
+        while tokens and (tokens[-1].is_stop or tokens[-1].pos_ in _EDGE_POS):
+            tokens.pop()
+        if not tokens or len(tokens) > 4:
+            return None
+        if tokens[-1].lower_ in GENERIC_TERMS:
+            return None
+        term = _WHITESPACE_RE.sub(' ', span.doc[tokens[0].i:tokens[-1].i + 1].text).strip()
+        return term if len(term) > 1 else None
+
+
+def load_skills(path: Optional[str] = None) -> List[str]:
+    """
+    Built-in skills plus synonym terms, and one skill per line from the
+    optional gazetteer file
+    """
+    skills = list(DEFAULT_SKILLS)
+    for group in SYNONYM_GROUPS:
+        skills.extend(group)
+    if path:
+        try:
+            with open(path, encoding="utf-8") as f:
+                skills.extend(line.strip() for line in f if line.strip() and not line.startswith("#"))
+        except OSError as e:
+            print(f"Skills gazetteer error: {e}")
+    return list(dict.fromkeys(skills))
+
+
+_extractor: Optional[SpacyKeywordExtractor] = None
+_extractor_lock = threading.Lock()
+
+
+def get_spacy_extractor() -> SpacyKeywordExtractor:
+    """Get the process-wide extractor, loading the model on first use"""
+    global _extractor
+    if _extractor is None:
+        # Extraction runs in worker threads; load the model only once
+        with _extractor_lock:
+            if _extractor is None:
+                _extractor = SpacyKeywordExtractor(
+                    model=SPACY_MODEL,
+                    skills=load_skills(SKILLS_GAZETTEER_PATH),
+                    batch_size=SPACY_BATCH_SIZE
+                )
+    return _extractor
+
+
+def extract_spacy_keywords(job_description: str) -> List[str]:
+    """
+    Extract keywords from a job description locally. CPU-bound; call it
+    from a thread when on the event loop.
+    """
+    return get_spacy_extractor().extract(job_description)
+
+
+def extract_spacy_keywords_batch(job_descriptions: List[str]) -> List[List[str]]:
+    """Extract keywords from many job descriptions in one batched pass"""
+    return get_spacy_extractor().extract_batch(job_descriptions)
@@ -0,0 +1,197 @@
+"""
+Resume Reactor - Temp File Sweeper
+Background cleanup of uploaded files in TEMP_DIR
+"""
+import asyncio
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Any, Iterator, Optional
+
+from config import (
+    TEMP_DIR, TEMP_TTL_SECONDS, TEMP_MAX_MB, TEMP_SWEEP_INTERVAL_SECONDS, TEMP_MIN_AGE_SECONDS
+)
+from services.resume_store import get_resume_store
+
+
+class TempSweeper:
+    """
+    Periodically deletes files older than the TTL, then evicts the oldest
+    files until the directory is under its byte quota. Files younger than
+    min_age are never touched so in-flight uploads survive, nor are files
+    held by this process (e.g. waiting in the parse queue). on_delete is
+    called with each deleted path, so records pointing at it can be cleared.
+    Holds are per process: with several server workers sharing the
+    directory, keep min_age above the parse timeout.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        ttl_seconds: float,
+        max_bytes: int,
+        interval_seconds: float,
+        min_age_seconds: float = 60,
+        on_delete: Optional[Callable[[str], None]] = None
+    ):
+        self.directory = directory
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.interval_seconds = interval_seconds
+        self.min_age_seconds = min_age_seconds
+        self.on_delete = on_delete
+        self._task: Optional[asyncio.Task] = None
+
+        self.runs = 0
+        self.files_deleted = 0
+        self.bytes_reclaimed = 0
+        self.current_files = 0
+        self.current_bytes = 0
+        self.last_run: Optional[float] = None
+
+        # Sweeps run in a thread; holds are taken on the event loop
+        self._held: Dict[str, int] = {}
+        self._held_lock = threading.Lock()
+
+    @contextmanager
+    def hold(self, path: str) -> Iterator[None]:
+        """Keep a file from being swept while it is in use"""
+        with self._held_lock:
+            self._held[path] = self._held.get(path, 0) + 1
+        try:
+            yield
+        finally:
+            with self._held_lock:
+                self._held[path] -= 1
+                if not self._held[path]:
+                    del self._held[path]
+
+    def reuse(self, path: str) -> bool:
+        """
+        Mark an existing file as freshly used, so it is swept as if it had
+        just been uploaded; False if it is already gone
+        """
+        if not path:
+            return False
+        try:
+            os.utime(path)
+        except OSError:
+            return False
+        return True
+
+    def _delete(self, path: str, size: int, mtime: float) -> bool:
+        with self._held_lock:
+            if path in self._held:
+                return False
+        try:
+            # Reused since the directory was listed
+            if os.stat(path).st_mtime != mtime:
+                return False
+            os.remove(path)
+        except OSError as e:
+            print(f"Temp sweep error for {path}: {e}")
+            return False
+        self.files_deleted += 1
+        self.bytes_reclaimed += size
+        if self.on_delete is not None:
+            try:
+                self.on_delete(path)
+            except Exception as e:
+                print(f"Temp sweep record cleanup error for {path}: {e}")
+        return True
+
+    def sweep(self) -> Dict[str, Any]:
+        """Run one sweep pass and return the updated stats"""
+        now = time.time()
+        files = []
+        try:
+            with os.scandir(self.directory) as entries:
+                for entry in entries:
+                    if entry.is_file(follow_symlinks=False):
+                        stat = entry.stat(follow_symlinks=False)
+                        files.append((stat.st_mtime, stat.st_size, entry.path))
+        except FileNotFoundError:
+            files = []
+
+        # Oldest first
+        files.sort()
+        remaining = []
+        for mtime, size, path in files:
+            age = now - mtime
+            if age >= self.ttl_seconds and age >= self.min_age_seconds:
+                if self._delete(path, size, mtime):
+                    continue
+            remaining.append((mtime, size, path))
+
+        total_bytes = sum(size for _, size, _ in remaining)
+        kept = []
+        for mtime, size, path in remaining:
+            if total_bytes > self.max_bytes and now - mtime >= self.min_age_seconds:
+                if self._delete(path, size, mtime):
+                    total_bytes -= size
+                    continue
+            kept.append(path)
+
+        self.runs += 1
+        self.current_files = len(kept)
+        self.current_bytes = total_bytes
+        self.last_run = now
+        return self.stats()
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.to_thread(self.sweep)
+            except Exception as e:
+                print(f"Temp sweep failed: {e}")
+            await asyncio.sleep(self.interval_seconds)
+
+    def start(self):
+        """Start sweeping in the background"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop the background sweep"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Sweep counters and the directory's size after the last pass"""
+        return {
+            "runs": self.runs,
+            "files_deleted": self.files_deleted,
+            "bytes_reclaimed": self.bytes_reclaimed,
+            "current_files": self.current_files,
+            "current_bytes": self.current_bytes,
+            "quota_bytes": self.max_bytes,
+            "last_run": self.last_run
+        }
+
+
+def _forget_upload_file(path: str):
+    get_resume_store().forget_upload_file(path)
+
+
+_sweeper: Optional[TempSweeper] = None
+
+
+def get_temp_sweeper() -> TempSweeper:
+    """Get the process-wide temp sweeper"""
+    global _sweeper
+    if _sweeper is None:
+        _sweeper = TempSweeper(
+            directory=TEMP_DIR,
+            ttl_seconds=TEMP_TTL_SECONDS,
+            max_bytes=TEMP_MAX_MB * 1024 * 1024,
+            interval_seconds=TEMP_SWEEP_INTERVAL_SECONDS,
+            min_age_seconds=TEMP_MIN_AGE_SECONDS,
+            on_delete=_forget_upload_file
+        )
+    return _sweeper
@@ -0,0 +1,306 @@
+"""
+Resume Reactor - Request Tracing
+Opt-in span trees and cProfile dumps for single requests, stored by request ID
+"""
+import cProfile
+import hmac
+import json
+import os
+import pstats
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+
+from config import ADMIN_TOKEN, TRACE_DIR, TRACE_MAX_STORED
+
+
+class Span:
+    """One timed operation in a trace, with its child operations"""
+
+    __slots__ = ("name", "attrs", "start", "end", "children", "_token")
+
+    def __init__(self, name: str, attrs: Dict[str, Any]):
+        self.name = name
+        self.attrs = attrs
+        self.start = 0.0
+        self.end: Optional[float] = None
+        self.children: List["Span"] = []
+        self._token = None
+
+    def set(self, **attrs: Any):
+        """Add attributes once they are known (counts, outcomes)"""
+        self.attrs.update(attrs)
+
+    def __enter__(self) -> "Span":
+        self.start = time.perf_counter()
+        self._token = _current_span.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.end = time.perf_counter()
+        if exc_type is not None:
+            self.attrs.setdefault("error", exc_type.__name__)
+        try:
+            _current_span.reset(self._token)
+        except ValueError:
+            # Exited from another context (e.g. a generator finished elsewhere)
+            pass
+        return False
+
+    def to_raw(self) -> Dict[str, Any]:
+        """Picklable form with absolute clock readings, for crossing processes"""
+        return {
+            "name": self.name,
+            "attrs": self.attrs,
+            "start": self.start,
+            "end": self.end,
+            "children": [child.to_raw() for child in self.children]
+        }
+
+    @classmethod
+    def from_raw(cls, raw: Dict[str, Any]) -> "Span":
+        span = cls(raw["name"], raw["attrs"])
+        span.start = raw["start"]
+        span.end = raw["end"]
+        span.children = [cls.from_raw(child) for child in raw["children"]]
+        return span
+
+    def to_dict(self, origin: float) -> Dict[str, Any]:
+        """Offsets and durations in milliseconds relative to the trace start"""
+        end = self.end if self.end is not None else time.perf_counter()
+        return {
+            "name": self.name,
+            "start_ms": round((self.start - origin) * 1000, 3),
+            "duration_ms": round((end - self.start) * 1000, 3),
+            **({"attrs": self.attrs} if self.attrs else {}),
+            **({"children": [child.to_dict(origin) for child in self.children]} if self.children else {})
+        }
+
+
+class _NoopSpan:
+    """Stand-in returned when no trace is active; every operation does nothing"""
+
+    __slots__ = ()
+
+    def set(self, **attrs: Any):
+        pass
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NOOP = _NoopSpan()
+_current_span: ContextVar[Optional[Span]] = ContextVar("trace_span", default=None)
+_current_trace: ContextVar[Optional["Trace"]] = ContextVar("trace", default=None)
+
+
+def span(name: str, **attrs: Any):
+    """
+    Context manager timing an operation as a child of the current span.
+    Outside a traced request this is a shared no-op, so call sites cost one
+    context variable lookup.
+    """
+    parent = _current_span.get()
+    if parent is None:
+        return _NOOP
+    child = Span(name, attrs)
+    parent.children.append(child)
+    return child
+
+
+def current_span() -> Optional[Span]:
+    """The innermost open span, or None outside a traced request"""
+    return _current_span.get()
+
+
+def graft_span(raw: Dict[str, Any]):
+    """Attach a span tree recorded in a worker process under the current span"""
+    parent = _current_span.get()
+    if parent is not None:
+        parent.children.append(Span.from_raw(raw))
+
+
+def _start_profiler() -> Optional[cProfile.Profile]:
+    """An enabled profiler, or None if another one is already running here"""
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError:
+        # Python 3.12+ allows a single active profiler per process
+        return None
+    return profiler
+
+
+@contextmanager
+def capture_spans(name: str, enabled: bool = True, profile_path: Optional[str] = None):
+    """
+    Record spans under a fresh root where there is no request context (a
+    parse worker process), optionally profiling into profile_path. Yields
+    the root span, or None when not enabled; send root.to_raw() back to the
+    parent and graft it there.
+    """
+    if not enabled:
+        yield None
+        return
+    root = Span(name, {"pid": os.getpid()})
+    profiler = _start_profiler() if profile_path else None
+    try:
+        with root:
+            yield root
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            os.makedirs(os.path.dirname(profile_path) or ".", exist_ok=True)
+            profiler.dump_stats(profile_path)
+
+
+class Trace:
+    """
+    Everything captured for one traced request: the span tree and, when
+    requested, a cProfile of the event loop thread.
+
+    The profiler sees all work on the loop while it is enabled, including
+    other requests served concurrently; profile on a quiet worker for a
+    clean picture. Only one request per process is profiled at a time, a
+    second one gets spans only. Parse workers profile themselves and their
+    stats are merged in when the trace is saved.
+    """
+
+    _profiling = False
+
+    def __init__(self, request_id: str, name: str, profile: bool = False, **attrs: Any):
+        self.request_id = request_id
+        self.root = Span(name, attrs)
+        self.want_profile = profile
+        self.profiler: Optional[cProfile.Profile] = None
+        self.worker_profiles: List[str] = []
+        self._trace_token = None
+
+    def __enter__(self) -> "Trace":
+        self._trace_token = _current_trace.set(self)
+        self.root.__enter__()
+        if self.want_profile:
+            if Trace._profiling:
+                self.root.set(profile_skipped="another request is being profiled")
+            else:
+                self.profiler = _start_profiler()
+                Trace._profiling = self.profiler is not None
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self.profiler is not None:
+            self.profiler.disable()
+            Trace._profiling = False
+        self.root.__exit__(exc_type, exc, tb)
+        _current_trace.reset(self._trace_token)
+        return False
+
+    def worker_profile_path(self) -> Optional[str]:
+        """A fresh file for a parse worker to dump its profile to, if profiling"""
+        if self.profiler is None:
+            return None
+        path = os.path.join(TRACE_DIR, f"{self.request_id}.worker{len(self.worker_profiles)}.prof")
+        self.worker_profiles.append(path)
+        return path
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "request_id": self.request_id,
+            "profile": self.profiler is not None,
+            "spans": self.root.to_dict(self.root.start)
+        }
+
+
+def current_trace() -> Optional[Trace]:
+    """The trace of the current request, or None when it is not traced"""
+    return _current_trace.get()
+
+
+def is_admin(token: Optional[str]) -> bool:
+    """Whether a request presented the admin token (never true when none is configured)"""
+    return bool(ADMIN_TOKEN) and token is not None and hmac.compare_digest(token, ADMIN_TOKEN)
+
+
+class TraceStore:
+    """
+    Traces saved as files in TRACE_DIR, so any worker can serve them:
+    {request_id}.json for the span tree and {request_id}.prof for pstats.
+    Only the newest `max_stored` traces are kept.
+    """
+
+    def __init__(self, directory: str, max_stored: int):
+        self.directory = directory
+        self.max_stored = max_stored
+
+    def _path(self, request_id: str, suffix: str) -> str:
+        return os.path.join(self.directory, f"{os.path.basename(request_id)}{suffix}")
+
+    def save(self, trace: Trace):
+        """Write a finished trace and its merged profile. Blocking; call from a thread."""
+        os.makedirs(self.directory, exist_ok=True)
+        if trace.profiler is not None:
+            stats = pstats.Stats(trace.profiler)
+            for path in trace.worker_profiles:
+                if os.path.exists(path):
+                    stats.add(path)
+                    os.remove(path)
+            stats.dump_stats(self._path(trace.request_id, ".prof"))
+
+        path = self._path(trace.request_id, ".json")
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(trace.to_dict(), f, default=str)
+        os.replace(tmp_path, path)
+        self.prune()
+
+    def load(self, request_id: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._path(request_id, ".json"), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def profile_path(self, request_id: str) -> Optional[str]:
+        path = self._path(request_id, ".prof")
+        return path if os.path.exists(path) else None
+
+    def prune(self):
+        """Delete the oldest traces beyond max_stored"""
+        try:
+            names = [name for name in os.listdir(self.directory) if name.endswith(".json")]
+        except OSError:
+            return
+        if len(names) <= self.max_stored:
+            return
+        paths = sorted(
+            (os.path.join(self.directory, name) for name in names),
+            key=lambda p: os.path.getmtime(p) if os.path.exists(p) else 0
+        )
+        for path in paths[:len(paths) - self.max_stored]:
+            for stale in (path, path[:-len(".json")] + ".prof"):
+                try:
+                    os.remove(stale)
+                except OSError:
+                    pass
+
+
+_store = TraceStore(TRACE_DIR, TRACE_MAX_STORED)
+
+
+def get_trace_store() -> TraceStore:
+    """Get the trace store"""
+    return _store
+
+
+def profile_summary(path: str, limit: int = 40, sort: str = "cumulative") -> str:
+    """Top functions of a saved profile as pstats text"""
+    import io
+
+    output = io.StringIO()
+    stats = pstats.Stats(path, stream=output)
+    stats.sort_stats(sort).print_stats(limit)
+    return output.getvalue()
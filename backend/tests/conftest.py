@@ -0,0 +1,8 @@
+"""
+Resume Reactor - Test Configuration
+Makes the backend modules importable when pytest runs from backend/
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
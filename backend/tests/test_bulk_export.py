@@ -0,0 +1,118 @@
+"""
+Resume Reactor - Bulk Export Tests
+Job progress shared through the store, ZIP assembly and cleanup
+"""
+import asyncio
+import io
+import json
+import os
+import zipfile
+
+import pytest
+
+from services import bulk_export, resume_store
+from services.bulk_export import BulkExportManager, stream_zip
+from services.resume_store import SQLiteResumeStore
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    instance = SQLiteResumeStore(str(tmp_path / "store.sqlite3"))
+    monkeypatch.setattr(bulk_export, "get_resume_store", lambda: instance)
+    for index, name in enumerate(["Ann Lee.pdf", "bob.docx"]):
+        instance.put_upload(f"hash{index}", name, {"text": name})
+        instance.create_resume(f"resume-{index}", name, name, f"hash{index}")
+    yield instance
+    instance.close()
+
+
+@pytest.fixture
+def renders(monkeypatch):
+    """Fake renderer: later items finish first, and "docx" fails"""
+    calls = []
+
+    async def fake_export(resume_data, fmt):
+        calls.append((resume_data["filename"], fmt))
+        if fmt == "docx":
+            raise ValueError("renderer unavailable")
+        await asyncio.sleep(0.05 if resume_data["filename"] == "Ann Lee.pdf" else 0)
+        return "ignored", f"{resume_data['parsed']['text']} as {fmt}".encode()
+
+    monkeypatch.setattr(bulk_export, "export_resume", fake_export)
+    return calls
+
+
+def run_job(manager: BulkExportManager, resume_ids, formats):
+    async def scenario():
+        job = await manager.submit(resume_ids, formats)
+        await job.task
+        return job.job_id
+    return asyncio.run(scenario())
+
+
+def test_job_is_visible_to_other_workers_and_zips_in_submitted_order(store, renders, tmp_path):
+    manager = BulkExportManager(concurrency=4, directory=str(tmp_path / "exports"))
+    job_id = run_job(manager, ["resume-0", "resume-1", "missing", "resume-0"], ["pdf", "docx"])
+
+    other_worker = BulkExportManager(concurrency=4, directory=str(tmp_path / "exports"))
+    job = asyncio.run(other_worker.get(job_id))
+    progress = job.progress()
+    assert progress["status"] == "done"
+    assert (progress["total"], progress["completed"], progress["failed"]) == (6, 2, 4)
+
+    archive = zipfile.ZipFile(io.BytesIO(b"".join(stream_zip(job, chunk_size=4))))
+    assert archive.testzip() is None
+    assert archive.namelist() == [
+        "Ann_Lee_resume-0_optimized.pdf", "bob_resume-1_optimized.pdf", "errors.json"
+    ]
+    assert archive.read("Ann_Lee_resume-0_optimized.pdf") == b"Ann Lee.pdf as pdf"
+    errors = json.loads(archive.read("errors.json"))
+    assert {"resume_id": "missing", "format": "pdf", "error": "Resume not found"} in errors
+    assert {"resume_id": "resume-1", "format": "docx", "error": "renderer unavailable"} in errors
+
+
+def test_job_with_no_output_fails(store, renders, tmp_path):
+    manager = BulkExportManager(concurrency=2, directory=str(tmp_path / "exports"))
+    job_id = run_job(manager, ["resume-0"], ["docx"])
+    assert asyncio.run(manager.get(job_id)).status == "failed"
+
+
+def test_missing_files_are_reported(store, renders, tmp_path):
+    manager = BulkExportManager(concurrency=2, directory=str(tmp_path / "exports"))
+    job = asyncio.run(manager.get(run_job(manager, ["resume-0", "resume-1"], ["pdf"])))
+    assert job.missing_files() == []
+
+    os.remove(job.files[0]["path"])
+    assert job.missing_files() == [job.files[0]["path"]]
+
+
+def test_expired_jobs_are_pruned_with_their_files(store, renders, tmp_path, monkeypatch):
+    monkeypatch.setattr(resume_store, "BULK_EXPORT_JOB_TTL_SECONDS", -1)
+    manager = BulkExportManager(concurrency=2, directory=str(tmp_path / "exports"))
+    job_id = run_job(manager, ["resume-0"], ["pdf"])
+    assert os.listdir(tmp_path / "exports")
+
+    assert asyncio.run(manager.get(job_id)) is None
+    assert os.listdir(tmp_path / "exports") == []
+
+
+def test_closing_cancels_running_jobs_and_removes_their_files(store, tmp_path, monkeypatch):
+    async def slow_export(resume_data, fmt):
+        if resume_data["filename"] == "bob.docx":
+            await asyncio.sleep(60)
+        return "ignored", b"content"
+
+    monkeypatch.setattr(bulk_export, "export_resume", slow_export)
+    manager = BulkExportManager(concurrency=2, directory=str(tmp_path / "exports"))
+
+    async def scenario():
+        job = await manager.submit(["resume-0", "resume-1"], ["pdf"])
+        while not job.files:
+            await asyncio.sleep(0.01)
+        await manager.close()
+        return job
+
+    job = asyncio.run(scenario())
+    assert job.status == "cancelled"
+    assert os.listdir(tmp_path / "exports") == []
+    assert store.get_export_job(job.job_id)["status"] == "cancelled"
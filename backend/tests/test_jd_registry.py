@@ -0,0 +1,55 @@
+"""
+Resume Reactor - Job Description Registry Tests
+IDs, keyword normalization and the per-worker matcher cache
+"""
+import asyncio
+from collections import OrderedDict
+
+import pytest
+
+from services import jd_registry
+from services.jd_registry import get_job_description, make_jd_id, normalize_keywords
+from services.resume_store import MemoryResumeStore
+
+
+@pytest.fixture
+def store(monkeypatch):
+    instance = MemoryResumeStore()
+    monkeypatch.setattr(jd_registry, "get_resume_store", lambda: instance)
+    monkeypatch.setattr(jd_registry, "_matchers", OrderedDict())
+    monkeypatch.setattr(jd_registry, "JD_MATCHER_CACHE_SIZE", 2)
+    for jd_id in ["jd1", "jd2", "jd3"]:
+        instance.put_job_description(jd_id, {"jd_id": jd_id, "job_description": "", "keywords": ["Python"]})
+    return instance
+
+
+def get(jd_id):
+    return asyncio.run(get_job_description(jd_id))
+
+
+def test_reformatted_postings_share_an_id():
+    assert make_jd_id("Python  engineer\n\nRemote") == make_jd_id(" Python engineer Remote ")
+    assert make_jd_id("Python engineer") != make_jd_id("Rust engineer")
+
+
+def test_keywords_are_tidied_and_deduplicated():
+    assert normalize_keywords(["  Machine\nLearning. ", "machine learning", "- SQL;", "x", "•"]) == [
+        "Machine Learning", "SQL"
+    ]
+
+
+def test_matchers_are_reused(store):
+    assert get("jd1")["matcher"] is get("jd1")["matcher"]
+    assert get("missing") is None
+
+
+def test_matcher_cache_keeps_recently_used_postings(store):
+    first = get("jd1")["matcher"]
+    get("jd2")
+    get("jd1")
+    get("jd3")
+
+    assert list(jd_registry._matchers) == ["jd1", "jd3"]
+    assert get("jd1")["matcher"] is first
+    assert get("jd2")["matcher"] is not None
+    assert len(jd_registry._matchers) == 2
@@ -0,0 +1,56 @@
+"""
+Resume Reactor - Keyword Matcher Tests
+Token boundaries, synonyms, whitespace and offsets
+"""
+from services.keyword_matcher import SYNONYM_GROUPS, KeywordMatcher, get_keyword_matcher
+
+
+def test_matches_only_on_token_boundaries():
+    matcher = KeywordMatcher(["Go", "R", "Java"])
+    matched, missing = matcher.match("Worked at Google on JavaScript tooling, wrote R scripts")
+    assert matched == ["R"]
+    assert missing == ["Go", "Java"]
+
+
+def test_symbol_terms_match_next_to_punctuation():
+    matcher = KeywordMatcher(["C++", "C#", "Node.js"])
+    matched, _ = matcher.match("Skills: C++, C#; backend in Node.js.")
+    assert matched == ["C++", "C#", "Node.js"]
+
+
+def test_synonyms_satisfy_the_keyword_both_ways():
+    matcher = KeywordMatcher(["Kubernetes", "ML", "JavaScript"])
+    matched, missing = matcher.match("Ran k8s clusters and shipped machine learning models")
+    assert matched == ["Kubernetes", "ML"]
+    assert missing == ["JavaScript"]
+
+
+def test_default_synonym_groups_can_be_replaced():
+    assert ["kubernetes", "k8s"] in SYNONYM_GROUPS
+    matcher = KeywordMatcher(["Kubernetes"], synonym_groups=[])
+    assert matcher.match("k8s")[0] == []
+
+
+def test_case_and_whitespace_insensitive_with_original_offsets():
+    text = "Built  MACHINE\n\tLEARNING pipelines"
+    spans = KeywordMatcher(["machine learning"]).scan(text)["machine learning"]
+    assert len(spans) == 1
+    start, end = spans[0]
+    assert text[start:end] == "MACHINE\n\tLEARNING"
+
+
+def test_counts_every_occurrence():
+    counts = KeywordMatcher(["python", "sql"]).counts("Python, python and more PYTHON; no databases")
+    assert counts == {"python": 3}
+
+
+def test_overlapping_terms_are_all_found():
+    matcher = KeywordMatcher(["machine learning", "learning", "deep learning"])
+    matched, missing = matcher.match("deep learning and machine learning")
+    assert matched == ["machine learning", "learning", "deep learning"]
+    assert missing == []
+
+
+def test_matchers_are_reused_per_keyword_list():
+    assert get_keyword_matcher(["a", "b"]) is get_keyword_matcher(["a", "b"])
+    assert get_keyword_matcher(["a", "b"]) is not get_keyword_matcher(["b", "a"])
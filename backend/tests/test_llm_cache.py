@@ -0,0 +1,106 @@
+"""
+Resume Reactor - LLM Cache Tests
+Two-tier lookups, TTL, LRU eviction and disk byte accounting
+"""
+import time
+
+import pytest
+
+from services.llm_cache import LLMCache
+
+
+@pytest.fixture
+def make_cache(tmp_path):
+    caches = []
+
+    def make(**kwargs) -> LLMCache:
+        cache = LLMCache(str(tmp_path / "llm.sqlite3"), **kwargs)
+        caches.append(cache)
+        return cache
+
+    yield make
+    for cache in caches:
+        cache.close()
+
+
+def test_key_covers_every_request_field():
+    base = LLMCache.make_key("m", "p", "s", 100, 0.3)
+    assert base == LLMCache.make_key("m", "p", "s", 100, 0.3)
+    assert len({
+        base,
+        LLMCache.make_key("m2", "p", "s", 100, 0.3),
+        LLMCache.make_key("m", "p2", "s", 100, 0.3),
+        LLMCache.make_key("m", "p", "s2", 100, 0.3),
+        LLMCache.make_key("m", "p", "s", 200, 0.3),
+        LLMCache.make_key("m", "p", "s", 100, 0.7),
+    }) == 6
+
+
+def test_memory_tier_evicts_least_recently_used(make_cache):
+    cache = make_cache(memory_entries=2)
+    cache.set("a", "1")
+    cache.set("b", "2")
+    cache.get("a")
+    cache.set("c", "3")
+    assert list(cache._memory) == ["a", "c"]
+
+    # "b" left memory but is still on disk, and comes back as a disk hit
+    assert cache.get("b") == "2"
+    stats = cache.stats()
+    assert stats["memory_hits"] == 1
+    assert stats["disk_hits"] == 1
+
+
+def test_disk_tier_survives_a_new_process(make_cache):
+    make_cache().set("k", "value")
+    fresh = make_cache()
+    assert fresh.get("k") == "value"
+    assert fresh.stats()["disk_hits"] == 1
+
+
+def test_expired_entries_are_misses(make_cache):
+    cache = make_cache(ttl_seconds=1)
+    cache.set("k", "v")
+    cache._memory["k"] = (time.time() - 1, "v")
+    cache._db().execute("UPDATE llm_cache SET expires_at = ?", (time.time() - 1,))
+    assert cache.get("k") is None
+    assert cache.stats()["misses"] == 1
+    assert cache._db().execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0] == 0
+
+
+def test_zero_ttl_never_expires(make_cache):
+    cache = make_cache(ttl_seconds=0)
+    cache.set("k", "v")
+    assert cache._memory["k"][0] == 0.0
+    assert cache.get("k") == "v"
+
+
+def test_disk_bytes_track_replaced_entries(make_cache):
+    cache = make_cache()
+    cache.set("k", "x" * 100)
+    cache.set("k", "y" * 40)
+    cache.set("other", "zz")
+    assert cache.stats()["disk_bytes"] == 42
+
+
+def test_disk_eviction_drops_least_recently_accessed(make_cache):
+    cache = make_cache(memory_entries=1, disk_max_bytes=350)
+    for index, key in enumerate(["a", "b", "c"]):
+        cache.set(key, key * 100)
+        # accessed_at has float precision, but keep the order unambiguous
+        cache._db().execute("UPDATE llm_cache SET accessed_at = ? WHERE key = ?", (index, key))
+    # Touch "a" on disk (it is not in memory), so "b" is now the oldest
+    assert cache.get("a") == "a" * 100
+    cache.set("d", "d" * 100)
+
+    keys = {row[0] for row in cache._db().execute("SELECT key FROM llm_cache")}
+    assert keys == {"a", "c", "d"}
+    assert cache.stats()["disk_bytes"] == 300
+
+
+def test_clear_empties_both_tiers(make_cache):
+    cache = make_cache()
+    cache.set("k", "v")
+    cache.clear()
+    assert cache.get("k") is None
+    assert cache.stats()["disk_bytes"] == 0
@@ -0,0 +1,132 @@
+"""
+Resume Reactor - NIM Resilience Tests
+Circuit breaker transitions and hedged requests
+"""
+import asyncio
+import time
+
+import pytest
+
+from services import nim_resilience
+from services.nim_resilience import CircuitBreaker, NimUnavailable, NimUpstreamError
+from services.nim_scheduler import NimScheduler
+
+
+def test_breaker_opens_half_opens_and_closes():
+    breaker = CircuitBreaker(failure_threshold=2, reset_seconds=0.05)
+
+    breaker.before_call()
+    breaker.record_failure()
+    assert breaker.state == "closed"
+    breaker.before_call()
+    breaker.record_failure()
+    assert breaker.state == "open"
+
+    with pytest.raises(NimUnavailable):
+        breaker.before_call()
+
+    time.sleep(0.06)
+    breaker.before_call()
+    assert breaker.state == "half_open"
+    # Only one probe goes out while half-open
+    with pytest.raises(NimUnavailable):
+        breaker.before_call()
+
+    breaker.record_success()
+    assert breaker.state == "closed"
+    assert breaker.failures == 0
+    breaker.before_call()
+    assert breaker.stats()["opened"] == 1
+
+
+def test_failed_probe_reopens_the_breaker():
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=0.05)
+    breaker.record_failure()
+    time.sleep(0.06)
+
+    breaker.before_call()
+    assert breaker.state == "half_open"
+    breaker.record_failure()
+    assert breaker.state == "open"
+    with pytest.raises(NimUnavailable):
+        breaker.before_call()
+
+
+def test_abandoned_probe_lets_the_next_call_probe():
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=0.05)
+    breaker.record_failure()
+    time.sleep(0.06)
+
+    breaker.before_call()
+    breaker.record_abandoned()
+    breaker.before_call()
+    assert breaker.state == "half_open"
+
+
+def test_disabled_breaker_never_opens():
+    breaker = CircuitBreaker(failure_threshold=0, reset_seconds=30)
+    for _ in range(10):
+        breaker.before_call()
+        breaker.record_failure()
+    breaker.before_call()
+
+
+@pytest.fixture
+def idle_scheduler(monkeypatch):
+    scheduler = NimScheduler(rpm=0, tpm=0, max_concurrency=4, max_queue=4, queue_timeout=1)
+    monkeypatch.setattr(nim_resilience, "get_nim_scheduler", lambda: scheduler)
+    return scheduler
+
+
+def test_losing_hedge_is_cancelled(idle_scheduler):
+    async def scenario():
+        started = []
+        cancelled = []
+
+        async def attempt(timeout: float) -> str:
+            number = len(started)
+            started.append(number)
+            try:
+                # The first attempt stalls; the hedge answers quickly
+                await asyncio.sleep(5 if number == 0 else 0.01)
+            except asyncio.CancelledError:
+                cancelled.append(number)
+                raise
+            return f"attempt-{number}"
+
+        result = await nim_resilience._hedged(attempt, timeout=10, hedge_after=0.02)
+        # Let the cancellation reach the losing task
+        await asyncio.sleep(0)
+        return result, started, cancelled
+
+    result, started, cancelled = asyncio.run(scenario())
+    assert result == "attempt-1"
+    assert started == [0, 1]
+    assert cancelled == [0]
+
+
+def test_hedge_is_skipped_when_the_first_attempt_is_fast(idle_scheduler):
+    async def scenario():
+        calls = []
+
+        async def attempt(timeout: float) -> str:
+            calls.append(timeout)
+            return "fast"
+
+        return await nim_resilience._hedged(attempt, timeout=10, hedge_after=0.5), calls
+
+    result, calls = asyncio.run(scenario())
+    assert result == "fast"
+    assert len(calls) == 1
+
+
+def test_hedge_reports_the_real_failure_when_both_fail(idle_scheduler):
+    async def scenario():
+        async def attempt(timeout: float) -> str:
+            await asyncio.sleep(0.03)
+            raise NimUpstreamError("NIM returned 503")
+
+        await nim_resilience._hedged(attempt, timeout=10, hedge_after=0.01)
+
+    with pytest.raises(NimUpstreamError):
+        asyncio.run(scenario())
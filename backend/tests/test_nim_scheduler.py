@@ -0,0 +1,108 @@
+"""
+Resume Reactor - NIM Scheduler Tests
+Priority ordering, displacement and queue timeouts
+"""
+import asyncio
+
+import pytest
+
+from services.nim_scheduler import (
+    NimScheduler, SchedulerBusy, SchedulerTimeout,
+    PRIORITY_INTERACTIVE, PRIORITY_STANDARD, PRIORITY_BULK
+)
+
+
+def make_scheduler(max_queue: int = 8, queue_timeout: float = 5.0) -> NimScheduler:
+    # One slot and no rate limits, so only queue order decides who runs next
+    return NimScheduler(rpm=0, tpm=0, max_concurrency=1, max_queue=max_queue, queue_timeout=queue_timeout)
+
+
+def test_waiters_are_served_by_priority_then_arrival():
+    async def scenario():
+        scheduler = make_scheduler()
+        holder = await scheduler.acquire(0, PRIORITY_STANDARD)
+        order = []
+
+        async def request(name: str, priority: int):
+            async with scheduler.slot(0, priority):
+                order.append(name)
+
+        tasks = []
+        for name, priority in [
+            ("bulk", PRIORITY_BULK),
+            ("standard-1", PRIORITY_STANDARD),
+            ("interactive", PRIORITY_INTERACTIVE),
+            ("standard-2", PRIORITY_STANDARD),
+        ]:
+            tasks.append(asyncio.create_task(request(name, priority)))
+            await asyncio.sleep(0)
+        assert scheduler.stats()["queued"] == 4
+
+        scheduler._release(holder)
+        await asyncio.gather(*tasks)
+        return order
+
+    assert asyncio.run(scenario()) == ["interactive", "standard-1", "standard-2", "bulk"]
+
+
+def test_full_queue_displaces_lower_priority_and_refuses_equal():
+    async def scenario():
+        scheduler = make_scheduler(max_queue=1)
+        holder = await scheduler.acquire(0, PRIORITY_STANDARD)
+        bulk = asyncio.create_task(scheduler.acquire(0, PRIORITY_BULK))
+        await asyncio.sleep(0)
+
+        interactive = asyncio.create_task(scheduler.acquire(0, PRIORITY_INTERACTIVE))
+        await asyncio.sleep(0)
+        with pytest.raises(SchedulerBusy):
+            await bulk
+
+        with pytest.raises(SchedulerBusy):
+            await scheduler.acquire(0, PRIORITY_INTERACTIVE)
+
+        scheduler._release(holder)
+        waiter = await interactive
+        assert waiter.priority == PRIORITY_INTERACTIVE
+        return scheduler.stats()["priorities"]
+
+    priorities = asyncio.run(scenario())
+    assert priorities["bulk"]["rejected"] == 1
+    assert priorities["interactive"]["rejected"] == 1
+
+
+def test_queue_timeout_refuses_and_leaves_the_queue():
+    async def scenario():
+        scheduler = make_scheduler(queue_timeout=0.05)
+        holder = await scheduler.acquire(0, PRIORITY_STANDARD)
+        with pytest.raises(SchedulerTimeout) as refused:
+            await scheduler.acquire(0, PRIORITY_BULK)
+        stats = scheduler.stats()
+
+        # The slot is still usable once the holder lets go
+        scheduler._release(holder)
+        await scheduler.acquire(0, PRIORITY_BULK)
+        return refused.value, stats
+
+    error, stats = asyncio.run(scenario())
+    assert error.status_code == 503 and error.retry_after >= 1
+    assert stats["queued"] == 0
+    assert stats["active"] == 1
+    assert stats["priorities"]["bulk"]["timed_out"] == 1
+
+
+def test_cancelled_waiter_does_not_take_a_slot():
+    async def scenario():
+        scheduler = make_scheduler()
+        holder = await scheduler.acquire(0, PRIORITY_STANDARD)
+        waiting = asyncio.create_task(scheduler.acquire(0, PRIORITY_INTERACTIVE))
+        await asyncio.sleep(0)
+        waiting.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiting
+
+        scheduler._release(holder)
+        return scheduler.stats()
+
+    stats = asyncio.run(scenario())
+    assert stats["queued"] == 0
+    assert stats["active"] == 0
@@ -0,0 +1,152 @@
+"""
+Resume Reactor - Parse Pool Tests
+Queue bounds, timeouts and recovery from hung or crashed workers
+"""
+import asyncio
+import os
+import time
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+from prometheus_client import REGISTRY
+
+from services import parse_pool
+from services.metrics import observe_stage, record_cache
+from services.parse_pool import ParsePool, ParsePoolBusy, ParseTimeout
+
+
+# Workers are forked, so they run these in place of the real parser
+
+
+def fake_parse_document(source, file_ext):
+    if source == "hang":
+        time.sleep(60)
+    if source == "crash":
+        os._exit(1)
+    observe_stage("test_worker_stage", 0.25)
+    record_cache("test_worker_cache", True)
+    return {"text": source}
+
+
+@pytest.fixture
+def fake_parser(monkeypatch):
+    monkeypatch.setattr(parse_pool, "parse_document", fake_parse_document)
+
+
+def make_pool(max_workers=1, max_queue=0, timeout=5.0) -> ParsePool:
+    pool = ParsePool(max_workers=max_workers, max_queue=max_queue, timeout=timeout, max_tasks_per_child=0)
+    pool.start()
+    return pool
+
+
+async def settled(pool: ParsePool, timeout: float = 5.0):
+    """Wait for finished jobs' callbacks to release their slots"""
+    deadline = time.monotonic() + timeout
+    while pool.pending and time.monotonic() < deadline:
+        await asyncio.sleep(0.01)
+
+
+def test_parses_in_a_worker(fake_parser):
+    pool = make_pool()
+
+    async def scenario():
+        parsed = await pool.parse("hello", ".pdf")
+        await settled(pool)
+        return parsed
+
+    try:
+        assert asyncio.run(scenario()) == {"text": "hello"}
+        assert pool.pending == 0
+    finally:
+        pool.shutdown()
+
+
+def test_worker_metrics_are_recorded_by_the_parent(fake_parser):
+    def sample(name, labels):
+        return REGISTRY.get_sample_value(name, labels) or 0
+
+    stage = {"stage": "test_worker_stage"}
+    cache = {"cache": "test_worker_cache", "result": "hit"}
+    before = sample("resume_reactor_stage_seconds_count", stage), sample("resume_reactor_cache_requests_total", cache)
+    pool = make_pool()
+    try:
+        asyncio.run(pool.parse("hello", ".pdf"))
+    finally:
+        pool.shutdown()
+    after = sample("resume_reactor_stage_seconds_count", stage), sample("resume_reactor_cache_requests_total", cache)
+    assert (after[0] - before[0], after[1] - before[1]) == (1, 1)
+
+
+def test_hung_parse_is_killed_and_the_pool_recovers(fake_parser):
+    pool = make_pool(timeout=0.5)
+
+    async def scenario():
+        await pool.parse("warm", ".pdf")
+        await settled(pool)
+        stuck_workers = list(pool._executor._processes.values())
+        with pytest.raises(ParseTimeout):
+            await pool.parse("hang", ".pdf")
+        # The killed job fails with BrokenProcessPool and gives its slot back
+        await settled(pool)
+        parsed = await pool.parse("after", ".pdf")
+        await settled(pool)
+        return stuck_workers, parsed
+
+    try:
+        stuck_workers, parsed = asyncio.run(scenario())
+        assert parsed == {"text": "after"}
+        for process in stuck_workers:
+            process.join(timeout=5)
+            assert not process.is_alive()
+        assert pool._abandoned == 0
+        assert pool.pending == 0
+    finally:
+        pool.shutdown()
+
+
+def test_crashed_worker_restarts_the_pool(fake_parser):
+    pool = make_pool()
+
+    async def scenario():
+        with pytest.raises(BrokenProcessPool):
+            await pool.parse("crash", ".pdf")
+        await settled(pool)
+        return await pool.parse("after", ".pdf")
+
+    try:
+        assert asyncio.run(scenario()) == {"text": "after"}
+    finally:
+        pool.shutdown()
+
+
+def test_full_queue_is_rejected(fake_parser):
+    pool = make_pool(timeout=0.5)
+
+    async def scenario():
+        first = asyncio.ensure_future(pool.parse("hang", ".pdf"))
+        await asyncio.sleep(0.1)
+        with pytest.raises(ParsePoolBusy):
+            await pool.parse("second", ".pdf")
+        with pytest.raises(ParseTimeout):
+            await first
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        pool.shutdown()
+
+
+def test_thread_mode_timeout_holds_its_slot(fake_parser, monkeypatch):
+    monkeypatch.setattr(parse_pool, "parse_document", lambda source, ext: time.sleep(0.3) or {"text": source})
+    pool = make_pool(max_workers=0, timeout=0.05)
+
+    async def scenario():
+        with pytest.raises(ParseTimeout):
+            await pool.parse("slow", ".pdf")
+        assert pool.pending == 1
+        with pytest.raises(ParsePoolBusy):
+            await pool.parse("next", ".pdf")
+        await asyncio.sleep(0.4)
+        assert pool.pending == 0
+
+    asyncio.run(scenario())
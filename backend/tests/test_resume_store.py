@@ -0,0 +1,135 @@
+"""
+Resume Reactor - Resume Store Tests
+The same contract for the memory, SQLite and cached stores
+"""
+import asyncio
+
+import pytest
+
+from services import resume_store
+from services.resume_store import CachedResumeStore, MemoryResumeStore, SQLiteResumeStore
+
+
+@pytest.fixture(params=["memory", "sqlite", "cached"])
+def store(request, tmp_path):
+    if request.param == "memory":
+        instance = MemoryResumeStore()
+    elif request.param == "sqlite":
+        instance = SQLiteResumeStore(str(tmp_path / "store.sqlite3"))
+    else:
+        instance = CachedResumeStore(SQLiteResumeStore(str(tmp_path / "store.sqlite3")), max_entries=2)
+    yield instance
+    instance.close()
+
+
+def test_resume_reads_parsed_from_its_upload_until_edited(store):
+    store.put_upload("hash1", "temp_uploads/a.pdf", {"text": "original"})
+    store.create_resume("r1", "temp_uploads/a.pdf", "a.pdf", "hash1")
+    store.create_resume("r2", "temp_uploads/a.pdf", "a.pdf", "hash1")
+
+    resume = store.get_resume("r1")
+    assert resume["parsed"] == {"text": "original"}
+    assert resume["filename"] == "a.pdf" and resume["version"] == 1
+
+    assert store.update_parsed("r1", {"text": "edited"})
+    assert store.get_resume("r1")["parsed"] == {"text": "edited"}
+    assert store.get_resume("r1")["version"] == 2
+    # Copy-on-write: the other resume and the upload are untouched
+    assert store.get_resume("r2")["parsed"] == {"text": "original"}
+    assert store.get_upload("hash1")["parsed"] == {"text": "original"}
+
+
+def test_unknown_records(store):
+    assert store.get_resume("missing") is None
+    assert store.get_resume_version("missing") is None
+    assert store.update_parsed("missing", {}) is False
+    assert store.get_upload("missing") is None
+    assert store.get_job_description("missing") is None
+    assert store.get_suggestions("missing") is None
+    assert store.get_export_job("missing") is None
+
+
+def test_job_descriptions_round_trip(store):
+    store.put_job_description("jd1", {"text": "Python", "keywords": ["Python"]})
+    assert store.get_job_description("jd1") == {"text": "Python", "keywords": ["Python"]}
+
+
+def test_suggestions_expire(store, monkeypatch):
+    store.put_suggestions("a1", {"status": "pending"})
+    assert store.get_suggestions("a1") == {"status": "pending"}
+    store.put_suggestions("a1", {"status": "done"})
+    assert store.get_suggestions("a1") == {"status": "done"}
+
+    monkeypatch.setattr(resume_store, "PENDING_SUGGESTIONS_TTL_SECONDS", -1)
+    store.put_suggestions("a2", {"status": "pending"})
+    assert store.get_suggestions("a2") is None
+
+
+def test_export_jobs_expire_and_are_popped_once(store, monkeypatch):
+    store.put_export_job("live", {"files": ["a"]})
+    monkeypatch.setattr(resume_store, "BULK_EXPORT_JOB_TTL_SECONDS", -1)
+    store.put_export_job("old", {"files": ["b"]})
+
+    assert store.get_export_job("live") == {"files": ["a"]}
+    assert store.get_export_job("old") is None
+    assert store.pop_expired_export_jobs() == [{"files": ["b"]}]
+    assert store.pop_expired_export_jobs() == []
+
+
+def test_async_wrappers_match_sync_methods(store):
+    async def scenario():
+        await store.aput_upload("hash1", "a.pdf", {"text": "t"})
+        await store.acreate_resume("r1", "a.pdf", "a.pdf", "hash1")
+        await store.aupdate_parsed("r1", {"text": "edited"})
+        return await store.aget_resume("r1"), await store.aget_upload("hash1")
+
+    resume, upload = asyncio.run(scenario())
+    assert resume["parsed"] == {"text": "edited"}
+    assert upload["parsed"] == {"text": "t"}
+
+
+def test_sqlite_store_is_shared_between_instances(tmp_path):
+    path = str(tmp_path / "shared.sqlite3")
+    first, second = SQLiteResumeStore(path), SQLiteResumeStore(path)
+    first.put_upload("hash1", "a.pdf", {"text": "t"})
+    first.create_resume("r1", "a.pdf", "a.pdf", "hash1")
+    assert second.get_resume("r1")["parsed"] == {"text": "t"}
+    first.close()
+    second.close()
+
+
+def test_cached_store_sees_edits_made_by_another_worker(tmp_path):
+    path = str(tmp_path / "shared.sqlite3")
+    cached = CachedResumeStore(SQLiteResumeStore(path))
+    other_worker = SQLiteResumeStore(path)
+    cached.put_upload("hash1", "a.pdf", {"text": "t"})
+    cached.create_resume("r1", "a.pdf", "a.pdf", "hash1")
+
+    assert cached.get_resume("r1")["parsed"] == {"text": "t"}
+    assert cached.get_resume("r1")["parsed"] == {"text": "t"}
+    assert (cached.hits, cached.misses) == (1, 1)
+
+    other_worker.update_parsed("r1", {"text": "edited elsewhere"})
+    assert cached.get_resume("r1")["parsed"] == {"text": "edited elsewhere"}
+    assert cached.misses == 2
+    cached.close()
+    other_worker.close()
+
+
+def test_cached_store_is_bounded(tmp_path):
+    cached = CachedResumeStore(MemoryResumeStore(), max_entries=2)
+    for index in range(3):
+        cached.put_job_description(f"jd{index}", {"index": index})
+        cached.get_job_description(f"jd{index}")
+    assert list(cached._immutable) == ["jd:jd1", "jd:jd2"]
+
+
+def test_upload_file_can_be_cleared_and_repointed(store):
+    store.put_upload("hash1", "temp_uploads/a.pdf", {"text": "t"})
+    store.get_upload("hash1")
+
+    store.forget_upload_file("temp_uploads/a.pdf")
+    assert store.get_upload("hash1") == {"file_path": "", "parsed": {"text": "t"}}
+
+    asyncio.run(store.aset_upload_file("hash1", "temp_uploads/b.pdf"))
+    assert store.get_upload("hash1") == {"file_path": "temp_uploads/b.pdf", "parsed": {"text": "t"}}
@@ -0,0 +1,77 @@
+"""
+Resume Reactor - Section Suggestion Cache Tests
+Per-section reuse in the edit-analyze loop
+"""
+import asyncio
+
+import pytest
+
+from services import ats_analyzer
+
+
+class FakeCache:
+    def __init__(self):
+        self.values = {}
+
+    async def aget(self, key):
+        return self.values.get(key)
+
+    async def aset(self, key, value):
+        self.values[key] = value
+
+
+@pytest.fixture
+def llm(monkeypatch):
+    calls = []
+
+    async def generate_suggestions(resume_text, job_description, missing_keywords, sections):
+        calls.append(sorted(sections))
+        suggestions = []
+        if "skills" in sections and missing_keywords:
+            suggestions.append({"section": "Skills", "suggested": "Add Go and Kubernetes", "impact_score": 0.9})
+        if "experience" in sections:
+            suggestions.append({"section": "Experience", "suggested": "Led 5 engineers", "impact_score": 0.8})
+        return suggestions
+
+    monkeypatch.setattr(ats_analyzer, "get_llm_cache", lambda: FakeCache.shared)
+    monkeypatch.setattr(ats_analyzer, "generate_suggestions", generate_suggestions)
+    FakeCache.shared = FakeCache()
+    return calls
+
+
+def suggest(sections, missing):
+    return asyncio.run(ats_analyzer.generate_section_suggestions("", "Go Kubernetes", missing, sections))
+
+
+def test_applied_keyword_does_not_regenerate_other_sections(llm):
+    sections = {"skills": "Python", "experience": "Worked on stuff", "contact": "a@b.c"}
+    first = suggest(sections, ["Go", "Kubernetes"])
+    assert [s["suggested"] for s in first] == ["Add Go and Kubernetes", "Led 5 engineers"]
+
+    # Applying the skills suggestion changes both the section and the missing keywords
+    edited = {**sections, "skills": "Python, Go, Kubernetes"}
+    second = suggest(edited, [])
+    assert llm == [["contact", "experience", "skills"], ["skills"]]
+    assert [s["suggested"] for s in second] == ["Led 5 engineers"]
+    assert all("keywords" not in s for s in second)
+
+
+def test_cached_keyword_suggestion_dropped_once_keyword_is_present(llm):
+    sections = {"skills": "Python", "experience": "Worked on stuff"}
+    suggest(sections, ["Go", "Kubernetes"])
+
+    # Same content, but the keywords were added elsewhere: no LLM call, stale advice hidden
+    reused = suggest(sections, [])
+    assert len(llm) == 1
+    assert [s["suggested"] for s in reused] == ["Led 5 engineers"]
+
+    still_missing = suggest(sections, ["Kubernetes"])
+    assert len(llm) == 1
+    assert [s["suggested"] for s in still_missing] == ["Add Go and Kubernetes", "Led 5 engineers"]
+
+
+def test_contact_edit_reuses_everything(llm):
+    sections = {"skills": "Python", "experience": "Worked on stuff", "contact": "a@b.c"}
+    suggest(sections, ["Go"])
+    suggest({**sections, "contact": "new@b.c"}, ["Go"])
+    assert len(llm) == 1
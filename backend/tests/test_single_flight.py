@@ -0,0 +1,98 @@
+"""
+Resume Reactor - Single-Flight Tests
+Concurrent identical NIM calls share one upstream request
+"""
+import asyncio
+
+import pytest
+
+from services import nvidia_client
+from services.nvidia_client import _single_flight
+
+
+def test_concurrent_callers_share_one_call():
+    async def scenario():
+        calls = []
+        release = asyncio.Event()
+
+        async def call() -> str:
+            calls.append(1)
+            await release.wait()
+            return "shared"
+
+        callers = [asyncio.create_task(_single_flight("share", call)) for _ in range(3)]
+        await asyncio.sleep(0)
+        release.set()
+        return await asyncio.gather(*callers), calls
+
+    results, calls = asyncio.run(scenario())
+    assert results == ["shared"] * 3
+    assert len(calls) == 1
+    assert "share" not in nvidia_client._flights
+
+
+def test_cancelled_waiter_does_not_cancel_the_shared_call():
+    async def scenario():
+        release = asyncio.Event()
+        cancelled = []
+
+        async def call() -> str:
+            try:
+                await release.wait()
+            except asyncio.CancelledError:
+                cancelled.append(1)
+                raise
+            return "shared"
+
+        leaving = asyncio.create_task(_single_flight("cancel-one", call))
+        staying = asyncio.create_task(_single_flight("cancel-one", call))
+        await asyncio.sleep(0)
+
+        leaving.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leaving
+        assert "cancel-one" in nvidia_client._flights
+
+        release.set()
+        return await staying, cancelled
+
+    result, cancelled = asyncio.run(scenario())
+    assert result == "shared"
+    assert cancelled == []
+
+
+def test_last_waiter_leaving_cancels_the_call():
+    async def scenario():
+        cancelled = []
+
+        async def call() -> str:
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                cancelled.append(1)
+                raise
+            return "unused"
+
+        caller = asyncio.create_task(_single_flight("cancel-all", call))
+        await asyncio.sleep(0)
+        caller.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await caller
+        await asyncio.sleep(0)
+        return cancelled
+
+    assert asyncio.run(scenario()) == [1]
+    assert "cancel-all" not in nvidia_client._flights
+
+
+def test_call_failure_reaches_every_waiter():
+    async def scenario():
+        async def call() -> str:
+            await asyncio.sleep(0.01)
+            raise RuntimeError("upstream failed")
+
+        callers = [asyncio.create_task(_single_flight("fail", call)) for _ in range(2)]
+        return await asyncio.gather(*callers, return_exceptions=True)
+
+    results = asyncio.run(scenario())
+    assert [str(r) for r in results] == ["upstream failed"] * 2
@@ -0,0 +1,32 @@
+"""
+Resume Reactor - spaCy Keyword Extraction Tests
+Gazetteer matching, run on a blank pipeline so no model download is needed
+"""
+import pytest
+
+from services.spacy_keywords import SpacyKeywordExtractor, load_skills
+
+
+@pytest.fixture(scope="module")
+def extractor():
+    return SpacyKeywordExtractor(model="not-an-installed-model", skills=load_skills())
+
+
+def test_short_skills_match_as_written_in_lowercase(extractor):
+    keywords = extractor.extract("Deployed services on k8s and wrote js and ml pipelines; also K8S and JS.")
+    assert {k.lower() for k in keywords} == {"k8s", "js", "ml"}
+
+
+def test_short_skills_that_are_common_words_stay_case_sensitive(extractor):
+    assert extractor.extract("We go fast and ship often") == []
+    assert extractor.extract("Services written in Go and R") == ["Go", "R"]
+
+
+def test_longer_skills_match_case_insensitively(extractor):
+    keywords = extractor.extract("Strong python and Machine learning, some KUBERNETES")
+    assert {k.lower() for k in keywords} == {"python", "machine learning", "kubernetes"}
+
+
+def test_batch_matches_single_extraction(extractor):
+    texts = ["Python and SQL", "Docker on AWS"]
+    assert extractor.extract_batch(texts) == [extractor.extract(text) for text in texts]
@@ -0,0 +1,108 @@
+"""
+Resume Reactor - Temp Sweeper Tests
+TTL and quota passes, and files that must survive them
+"""
+import os
+import time
+
+from services.resume_store import MemoryResumeStore
+from services.temp_sweeper import TempSweeper
+
+
+def make_file(directory, name: str, size: int, age: float) -> str:
+    path = str(directory / name)
+    with open(path, "wb") as f:
+        f.write(b"x" * size)
+    mtime = time.time() - age
+    os.utime(path, (mtime, mtime))
+    return path
+
+
+def make_sweeper(directory, ttl=3600, max_bytes=10_000, min_age=60, on_delete=None) -> TempSweeper:
+    return TempSweeper(
+        directory=str(directory),
+        ttl_seconds=ttl,
+        max_bytes=max_bytes,
+        interval_seconds=60,
+        min_age_seconds=min_age,
+        on_delete=on_delete
+    )
+
+
+def test_ttl_pass_deletes_expired_files(tmp_path):
+    expired = make_file(tmp_path, "old.pdf", 100, age=7200)
+    fresh = make_file(tmp_path, "new.pdf", 100, age=120)
+
+    stats = make_sweeper(tmp_path).sweep()
+
+    assert not os.path.exists(expired)
+    assert os.path.exists(fresh)
+    assert stats["files_deleted"] == 1
+    assert stats["bytes_reclaimed"] == 100
+    assert (stats["current_files"], stats["current_bytes"]) == (1, 100)
+
+
+def test_quota_pass_evicts_oldest_first(tmp_path):
+    oldest = make_file(tmp_path, "a.pdf", 400, age=300)
+    middle = make_file(tmp_path, "b.pdf", 400, age=200)
+    newest = make_file(tmp_path, "c.pdf", 400, age=100)
+
+    stats = make_sweeper(tmp_path, max_bytes=900).sweep()
+
+    assert not os.path.exists(oldest)
+    assert os.path.exists(middle) and os.path.exists(newest)
+    assert stats["current_bytes"] == 800
+
+
+def test_files_younger_than_min_age_survive_the_quota(tmp_path):
+    young = make_file(tmp_path, "young.pdf", 1000, age=5)
+
+    stats = make_sweeper(tmp_path, max_bytes=10).sweep()
+
+    assert os.path.exists(young)
+    assert stats["current_bytes"] == 1000
+
+
+def test_held_files_are_skipped(tmp_path):
+    held = make_file(tmp_path, "queued.pdf", 1000, age=7200)
+    sweeper = make_sweeper(tmp_path, max_bytes=10)
+
+    with sweeper.hold(held):
+        sweeper.sweep()
+        assert os.path.exists(held)
+    sweeper.sweep()
+    assert not os.path.exists(held)
+
+
+def test_reused_files_count_as_new(tmp_path):
+    reused = make_file(tmp_path, "a.pdf", 100, age=7200)
+    sweeper = make_sweeper(tmp_path)
+
+    assert sweeper.reuse(reused)
+    sweeper.sweep()
+    assert os.path.exists(reused)
+    assert not sweeper.reuse(str(tmp_path / "missing.pdf"))
+    assert not sweeper.reuse("")
+
+
+def test_deleting_a_file_clears_its_upload_record(tmp_path):
+    store = MemoryResumeStore()
+    path = make_file(tmp_path, "a.pdf", 100, age=7200)
+    store.put_upload("hash1", path, {"text": "t"})
+    store.put_upload("hash2", "elsewhere.pdf", {"text": "u"})
+
+    make_sweeper(tmp_path, on_delete=store.forget_upload_file).sweep()
+
+    assert store.get_upload("hash1") == {"file_path": "", "parsed": {"text": "t"}}
+    assert store.get_upload("hash2")["file_path"] == "elsewhere.pdf"
+
+
+def test_failing_hook_does_not_stop_the_sweep(tmp_path):
+    def broken_hook(path):
+        raise RuntimeError("store unavailable")
+
+    make_file(tmp_path, "a.pdf", 100, age=7200)
+    make_file(tmp_path, "b.pdf", 100, age=7200)
+
+    stats = make_sweeper(tmp_path, on_delete=broken_hook).sweep()
+    assert stats["files_deleted"] == 2
@@ -52,6 +52,74 @@ export async function rewriteSection(resumeId, section, originalText, jobDescrip
     return response.data;
 }
 
+/**
+ * Error for a failed stream, with the HTTP status and Retry-After seconds
+ * (set when the server is busy or its circuit breaker is open)
+ */
+function streamError(status, detail, retryAfter = null) {
+    const error = new Error(`Rewrite failed: ${detail || status}`);
+    error.status = status;
+    error.retryAfter = retryAfter;
+    return error;
+}
+
+/**
+ * Stream an AI rewrite for a section over server-sent events.
+ * Calls onToken(text) as text arrives and resolves with the final result.
+ * Failures before or during the stream reject with the server's detail.
+ */
+export async function rewriteSectionStream(resumeId, section, originalText, jobDescription = null, onToken = () => {}) {
+    const response = await fetch(`${API_BASE_URL}/rewrite/stream`, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({
+            resume_id: resumeId,
+            section,
+            original_text: originalText,
+            job_description: jobDescription,
+        }),
+    });
+
+    if (!response.ok) {
+        const body = await response.json().catch(() => ({}));
+        const retryAfter = response.headers.get('Retry-After');
+        // Validation errors carry a list of problems rather than a message
+        const detail = typeof body.detail === 'string' ? body.detail : null;
+        throw streamError(response.status, detail, retryAfter && Number(retryAfter));
+    }
+
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    let result = null;
+
+    while (true) {
+        const { done, value } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+
+        const events = buffer.split('\n\n');
+        buffer = events.pop();
+        for (const raw of events) {
+            const event = raw.match(/^event: (.*)$/m)?.[1];
+            const data = raw.match(/^data: (.*)$/m)?.[1];
+            if (!data) continue;
+            if (event === 'token') {
+                onToken(JSON.parse(data));
+            } else if (event === 'result') {
+                result = JSON.parse(data);
+            } else if (event === 'error') {
+                // Sent after the headers, so the failure cannot be a status code
+                const { detail, status, retry_after: retryAfter } = JSON.parse(data);
+                await reader.cancel();
+                throw streamError(status, detail, retryAfter);
+            }
+        }
+    }
+
+    return result;
+}
+
 /**
  * Update resume content on the server
  */